@@ -1,17 +1,14 @@
 import argparse
 import os
-from colorama import Fore, init
+import sys
 
-from aspm_cli.commands import command_registry
-from aspm_cli.utils.common import clean_env_vars, print_banner
-from aspm_cli.utils.logger import Logger
-from aspm_cli.utils.version import get_version
+from aspm_cli.utils.daemon import forward_to_daemon
 
-init(autoreset=True)
 
-def main():
-    clean_env_vars()
-    print_banner()
+def build_parser():
+    # Imported here so a command forwarded to the scan daemon never pays for them.
+    from aspm_cli.commands import command_registry
+    from aspm_cli.utils.version import get_version
 
     parser = argparse.ArgumentParser(prog="accuknox-aspm-scanner", description="ASPM CLI Tool")
     parser.add_argument('--version', action='version', version=f"%(prog)s v{get_version()}")
@@ -23,8 +20,22 @@ def main():
         cmd_instance = cmd_class()
         cmd_parser = subparsers.add_parser(cmd_name, help=cmd_instance.help_text)
         cmd_instance.configure_parser(cmd_parser)
+    return parser
+
+
+def run(argv=None, parser=None):
+    """Parse argv and execute the command in this process. Exits like the CLI does."""
+    from colorama import init
+
+    from aspm_cli.utils.common import clean_env_vars, print_banner
+    from aspm_cli.utils.logger import Logger
 
-    args = parser.parse_args()
+    init(autoreset=True)
+    clean_env_vars()
+    print_banner()
+
+    parser = parser or build_parser()
+    args = parser.parse_args(argv)
 
     if hasattr(args, 'func'):
         try:
@@ -40,5 +51,13 @@ def main():
     else:
         parser.print_help()
 
+
+def main():
+    # A running `daemon` executes the command with everything already imported.
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    run()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
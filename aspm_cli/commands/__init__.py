@@ -1,9 +1,15 @@
+from .daemon_command import DaemonCommand
 from .precommit_command import PreCommitCommand
+from .results_command import ResultsCommand
 from .scan_command import ScanCommand
+from .serve_command import ServeCommand
 from .tool_command import ToolCommand
 
 command_registry = {
+    "daemon": DaemonCommand,
     "pre-commit": PreCommitCommand,
+    "results": ResultsCommand,
     "scan": ScanCommand,
+    "serve": ServeCommand,
     "tool": ToolCommand,
 }
\ No newline at end of file
@@ -0,0 +1,50 @@
+import sys
+
+from aspm_cli.commands.base_command import BaseCommand
+from aspm_cli.utils.daemon import ScanDaemon, control, daemon_supported, socket_path
+from aspm_cli.utils.logger import Logger
+
+
+class DaemonCommand(BaseCommand):
+    help_text = "Run a long-lived scan daemon that other CLI invocations forward to"
+
+    def configure_parser(self, parser):
+        subparsers = parser.add_subparsers(dest="daemon_cmd", required=True)
+
+        start_parser = subparsers.add_parser("start", help="Run the daemon in the foreground")
+        start_parser.add_argument(
+            "--socket",
+            help="Unix socket path (default: ACCUKNOX_DAEMON_SOCKET, $XDG_RUNTIME_DIR or the user cache dir)"
+        )
+        start_parser.set_defaults(func=self.execute)
+
+        for name, help_text in (("stop", "Stop a running daemon"), ("status", "Show whether a daemon is running")):
+            sub = subparsers.add_parser(name, help=help_text)
+            sub.add_argument("--socket", help="Unix socket path of the daemon")
+            sub.set_defaults(func=self.execute)
+
+    def execute(self, args):
+        if not daemon_supported():
+            Logger.get_logger().error("The scan daemon needs Unix domain sockets and fork(); it is not available on this platform.")
+            sys.exit(1)
+
+        path = args.socket or socket_path()
+        if args.daemon_cmd == "start":
+            try:
+                ScanDaemon(path).serve()
+            except (RuntimeError, OSError) as e:
+                Logger.get_logger().error(str(e))
+                sys.exit(1)
+            return
+
+        status = control(args.daemon_cmd, path)
+        if status is None:
+            Logger.get_logger().info(f"No scan daemon is running on {path}")
+            sys.exit(1 if args.daemon_cmd == "status" else 0)
+        if args.daemon_cmd == "stop":
+            Logger.get_logger().info(f"Stopping scan daemon (pid {status['pid']})")
+        else:
+            Logger.get_logger().info(
+                f"Scan daemon running: pid {status['pid']}, socket {status['socket']}, "
+                f"uptime {status['uptime']}s, {status['requests']} request(s), {status['running']} running"
+            )
@@ -1,5 +1,25 @@
+import argparse
+import sys
+
 from aspm_cli.commands.base_command import BaseCommand
 from aspm_cli.pre_commit_wrapper.config import handle_pre_commit # Assuming this path is correct
+from aspm_cli.pre_commit_wrapper.hooks import HOOK_SCANNERS, parse_budgets, parse_scanners, run_staged_hooks
+
+
+def _scanners_arg(value):
+    try:
+        return parse_scanners(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _budget_arg(value):
+    try:
+        parse_budgets(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
 
 class PreCommitCommand(BaseCommand):
     help_text = "Manage pre-commit hooks"
@@ -10,6 +30,7 @@ class PreCommitCommand(BaseCommand):
         install_parser = subparsers.add_parser(
             "install", help="Install pre-commit hooks"
         )
+        self._add_hook_arguments(install_parser, default_scanners=None)
         install_parser.set_defaults(func=self.execute) 
 
         uninstall_parser = subparsers.add_parser(
@@ -17,6 +38,33 @@ class PreCommitCommand(BaseCommand):
         )
         uninstall_parser.set_defaults(func=self.execute)
 
+        run_parser = subparsers.add_parser(
+            "run", help="Scan the staged files (invoked by the installed hook)"
+        )
+        self._add_hook_arguments(run_parser, default_scanners=list(HOOK_SCANNERS))
+        run_parser.add_argument(
+            "filenames", nargs="*",
+            help="Staged files to scan, as passed by pre-commit (default: all staged files)",
+        )
+        run_parser.set_defaults(func=self.execute)
+
+    def _add_hook_arguments(self, parser, default_scanners):
+        parser.add_argument(
+            "--scanners",
+            type=_scanners_arg,
+            default=default_scanners,
+            help=f"Comma-separated hook scanners: {', '.join(HOOK_SCANNERS)} (install default: secret only)",
+        )
+        parser.add_argument(
+            "--budget",
+            type=_budget_arg,
+            default=None,
+            help="Seconds each scanner may run before it is skipped: 'sast=30,iac=45' or '30' for all "
+                 "(default: secret=10, sast=60, iac=60)",
+        )
+
     def execute(self, args):
+        if args.precommit_cmd == "run":
+            sys.exit(run_staged_hooks(args.scanners, parse_budgets(args.budget), args.filenames))
         # The original handle_pre_commit already takes 'args' and handles the logic
-        handle_pre_commit(args)
\ No newline at end of file
+        handle_pre_commit(args)
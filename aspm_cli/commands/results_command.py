@@ -0,0 +1,76 @@
+import os
+import sys
+
+from aspm_cli.commands.base_command import BaseCommand
+from aspm_cli.utils.common import handle_failure, upload_results
+from aspm_cli.utils.config import ConfigValidator
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.result_merge import MERGEABLE_SCAN_TYPES, detect_result_format, merge_result_files
+
+# Default merged file per scan type: the scan's own result file name, prefixed.
+MERGED_RESULT_FILES = {
+    "sast": "merged-results.json",
+    "secret": "merged-results.jsonl",
+    "iac": "merged-results_json.json",
+    "ml-scan": "merged-results.json",
+}
+
+
+class ResultsCommand(BaseCommand):
+    help_text = "Work with scan result files (merge the outputs of --shard runs)"
+
+    def configure_parser(self, parser):
+        subparsers = parser.add_subparsers(dest="results_cmd", required=True)
+
+        merge_parser = subparsers.add_parser(
+            "merge",
+            help=f"Merge the per-shard result files of one scan ({', '.join(MERGEABLE_SCAN_TYPES)}) and upload them once",
+        )
+        merge_parser.add_argument("files", nargs="+", help="Result files written by the --shard runs")
+        merge_parser.add_argument(
+            "--output",
+            help="Merged result file (default: merged-<result file name of the scan type>)",
+        )
+        merge_parser.add_argument("--endpoint", help="The URL of the Control Panel to push the scan results to.")
+        merge_parser.add_argument("--label", help="The label created in AccuKnox for associating scan results.")
+        merge_parser.add_argument("--token", help="The token for authenticating with the Control Panel.")
+        merge_parser.add_argument("--tenant", help="Tenant ID [Optional]")
+        merge_parser.add_argument("--skip-upload", action="store_true", help="Only write the merged file")
+        merge_parser.add_argument("--keep-results", action="store_true", help="Keep the merged file after upload")
+        merge_parser.set_defaults(func=self.execute)
+
+    def execute(self, args):
+        from aspm_cli.scanners import scanner_registry
+
+        endpoint = args.endpoint or os.getenv("ACCUKNOX_ENDPOINT")
+        label = args.label or os.getenv("ACCUKNOX_LABEL")
+        token = args.token or os.getenv("ACCUKNOX_TOKEN")
+        tenant = args.tenant or os.getenv("ACCUKNOX_TENANT")
+        try:
+            ConfigValidator(
+                "results",
+                accuknox_endpoint=endpoint,
+                accuknox_label=label,
+                accuknox_token=token,
+                accuknox_tenant=tenant,
+                softfail=False,
+                skip_upload=args.skip_upload,
+            )
+            missing = [path for path in args.files if not os.path.isfile(path)]
+            if missing:
+                raise ValueError(f"Result file(s) not found: {', '.join(missing)}")
+            output = args.output or MERGED_RESULT_FILES[detect_result_format(args.files[0])]
+            scan_type, finding_count = merge_result_files(args.files, output)
+        except (OSError, ValueError) as e:
+            Logger.get_logger().error(f"Could not merge results: {e}")
+            sys.exit(1)
+
+        Logger.get_logger().info(
+            f"Merged {len(args.files)} {scan_type} result file(s) into {output} ({finding_count} finding(s))."
+        )
+
+        if args.skip_upload:
+            return
+        data_type = scanner_registry[scan_type.upper()]().get_data_type_identifier()
+        upload_exit_code = upload_results(output, endpoint, label, token, tenant, data_type, keep_file=args.keep_results)
+        handle_failure(upload_exit_code, softfail=False, allow_softfail=False)
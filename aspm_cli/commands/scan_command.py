@@ -43,6 +43,61 @@ class ScanCommand(BaseCommand):
             scanner_instance.add_arguments(scan_parser)
             scan_parser.set_defaults(func=self.execute, scantype=scan_type) # Set scantype and func for main execute
 
+        batch_parser = subparsers.add_parser("batch", help="Scan many repositories from a manifest in parallel")
+        batch_parser.add_argument("--manifest", required=True, help="YAML or JSON manifest of repositories and scans")
+        batch_parser.add_argument(
+            "--workdir",
+            default="accuknox-batch",
+            help="Directory for repository checkouts and per-repo logs (default: ./accuknox-batch)",
+        )
+        batch_parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Repositories scanned concurrently (default: manifest 'jobs', else available CPUs)",
+        )
+        batch_parser.add_argument("--keep-checkouts", action="store_true", help="Keep checkouts after each repo is scanned")
+        batch_parser.set_defaults(func=self.execute_batch, scantype="BATCH")
+
+    def execute_batch(self, args):
+        from aspm_cli.utils.batch import format_status_table, load_manifest, repo_status, run_batch
+
+        softfail = args.softfail or os.getenv("SOFT_FAIL") == "TRUE"
+        try:
+            validator = ConfigValidator(
+                "batch",
+                accuknox_endpoint=args.endpoint or os.getenv("ACCUKNOX_ENDPOINT"),
+                accuknox_label=args.label or os.getenv("ACCUKNOX_LABEL"),
+                accuknox_token=args.token or os.getenv("ACCUKNOX_TOKEN"),
+                accuknox_tenant=args.tenant or os.getenv("ACCUKNOX_TENANT"),
+                accuknox_project_name=resolve_project_name(args.project_name),
+                softfail=softfail,
+                skip_upload=args.skip_upload,
+            )
+            manifest = validator.validate_batch_manifest(load_manifest(args.manifest), jobs=args.jobs)
+        except (OSError, ValueError) as e:
+            Logger.get_logger().error(f"Invalid batch manifest: {e}")
+            sys.exit(1)
+
+        # Options before the scan type are applied to every repository's scans.
+        options = []
+        for flag, value in (("--endpoint", args.endpoint), ("--label", args.label), ("--token", args.token),
+                            ("--tenant", args.tenant), ("--project-name", args.project_name)):
+            if value:
+                options.extend([flag, value])
+        for flag, enabled in (("--softfail", args.softfail), ("--skip-upload", args.skip_upload),
+                              ("--keep-results", args.keep_results)):
+            if enabled:
+                options.append(flag)
+
+        outcomes = run_batch(manifest, options, os.path.abspath(args.workdir), keep_checkouts=args.keep_checkouts)
+        print(format_status_table(outcomes))
+        failed = [outcome["name"] for outcome in outcomes if repo_status(outcome) != "passed"]
+        if failed:
+            Logger.get_logger().error(f"{len(failed)} of {len(outcomes)} repositories did not pass: {', '.join(failed)}")
+            sys.exit(1)
+        Logger.get_logger().info(f"All {len(outcomes)} repositories passed.")
+
     def execute(self, args):
         try:
             softfail = args.softfail or os.getenv("SOFT_FAIL") == "TRUE"
@@ -80,7 +135,11 @@ class ScanCommand(BaseCommand):
 
             # Upload results and handle failure
             upload_exit_code = 0
-            if result_file and os.path.exists(result_file):
+            artifacts = [
+                (path, data_type) for path, data_type in scanner.get_result_artifacts(result_file)
+                if path and os.path.exists(path)
+            ]
+            if artifacts:
                 # Check if this is SBOM mode (container scan with --generate-sbom)
                 is_sbom_upload = (
                     args.scantype.lower() == "container"
@@ -111,6 +170,12 @@ class ScanCommand(BaseCommand):
                             f"Failed to enrich SBOM results.json: {e}"
                         )
 
+                # In-process callers (e.g. `serve` jobs) take a copy of every artifact before upload/cleanup.
+                result_sink = getattr(args, "result_sink", None)
+                if result_sink:
+                    for artifact_file, _ in artifacts:
+                        result_sink(artifact_file)
+
                 # Upload if not skipping
                 if not skip_upload:
                     if is_sbom_upload:
@@ -137,23 +202,25 @@ class ScanCommand(BaseCommand):
                                 f"Could not read SBOM file for upload validation: {e}"
                             )
 
-                    # Determine data_type: SBOM for SBOM uploads, otherwise use scanner's identifier
-                    data_type = "SBOM" if is_sbom_upload else scanner.get_data_type_identifier()
-                    upload_exit_code = upload_results(
-                        result_file,
-                        accuknox_config["accuknox_endpoint"],
-                        accuknox_config["accuknox_label"],
-                        accuknox_config["accuknox_token"],
-                        accuknox_config["accuknox_tenant"],
-                        data_type,
-                        keep_file=keep_results,
-                    )
+                    # Determine data_type: SBOM for SBOM uploads, otherwise the artifact's identifier
+                    for artifact_file, data_type in artifacts:
+                        artifact_exit_code = upload_results(
+                            artifact_file,
+                            accuknox_config["accuknox_endpoint"],
+                            accuknox_config["accuknox_label"],
+                            accuknox_config["accuknox_token"],
+                            accuknox_config["accuknox_tenant"],
+                            "SBOM" if is_sbom_upload else data_type,
+                            keep_file=keep_results,
+                        )
+                        upload_exit_code = upload_exit_code or artifact_exit_code
                 else:
-                    # Clean up result file when skipping upload (unless --keep-results is set)
-                    if not keep_results:
-                        os.remove(result_file)
-                    else:
-                        Logger.get_logger().info(f"Results file kept at: {result_file}")
+                    # Clean up result files when skipping upload (unless --keep-results is set)
+                    for artifact_file, _ in artifacts:
+                        if not keep_results:
+                            os.remove(artifact_file)
+                        else:
+                            Logger.get_logger().info(f"Results file kept at: {artifact_file}")
             Logger.get_logger().debug(
                 f"Scan exit_code={exit_code}, upload_exit_code={upload_exit_code}, softfail={softfail}, skip_upload={skip_upload}, keep_results={keep_results}"
             )
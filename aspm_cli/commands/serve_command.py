@@ -0,0 +1,77 @@
+import os
+import secrets
+import sys
+
+from aspm_cli.commands.base_command import BaseCommand
+from aspm_cli.utils.job_server import TOKEN_ENV, serve
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.subprocess_utils import default_job_count
+
+
+class ServeCommand(BaseCommand):
+    help_text = "Run a local HTTP API that queues scan jobs and runs them on a worker pool"
+
+    def configure_parser(self, parser):
+        parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+        parser.add_argument("--port", type=int, default=8470, help="Port to listen on (default: 8470)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Maximum scans running at once (default: available CPUs)",
+        )
+        parser.add_argument(
+            "--queue-size",
+            type=int,
+            default=100,
+            help="Maximum queued jobs; further submissions get HTTP 429 (default: 100)",
+        )
+        parser.add_argument(
+            "--state-dir",
+            help="Directory for job logs and results, kept after exit (default: a temporary directory)",
+        )
+        parser.add_argument(
+            "--auth-token",
+            default=os.getenv(TOKEN_ENV),
+            help=f"Bearer token required on every request (default: {TOKEN_ENV}, else a generated token)",
+        )
+        parser.add_argument(
+            "--no-auth",
+            action="store_true",
+            help="Accept requests without a bearer token. Anyone who can reach the API can then run scans",
+        )
+        parser.add_argument(
+            "--allowed-host",
+            action="append",
+            default=[],
+            help="Extra host name clients may use in the Host/Origin headers (repeatable; localhost and --host are always allowed)",
+        )
+        parser.add_argument(
+            "--max-finished-jobs",
+            type=int,
+            default=1000,
+            help="Finished and cancelled jobs kept, with their logs and results; older ones are removed (default: 1000)",
+        )
+        parser.set_defaults(func=self.execute)
+
+    def execute(self, args):
+        workers = args.workers or default_job_count()
+        if workers < 1 or args.queue_size < 1 or args.max_finished_jobs < 1:
+            Logger.get_logger().error("--workers, --queue-size and --max-finished-jobs must be positive integers.")
+            sys.exit(1)
+        auth_token = None if args.no_auth else args.auth_token
+        if args.no_auth:
+            Logger.get_logger().warning("Authentication disabled (--no-auth): anyone who can reach the API can run scans.")
+        elif not auth_token:
+            auth_token = secrets.token_urlsafe(32)
+            Logger.get_logger().info(f"No --auth-token or {TOKEN_ENV} set; clients must send 'Authorization: Bearer {auth_token}'")
+        if args.host in ("0.0.0.0", "::", "") and not args.allowed_host:
+            Logger.get_logger().warning(
+                "Listening on all addresses without --allowed-host: requests are accepted for any Host header."
+            )
+        try:
+            serve(args.host, args.port, workers, args.queue_size, args.state_dir, auth_token,
+                  args.allowed_host, args.max_finished_jobs)
+        except OSError as e:
+            Logger.get_logger().error(f"Could not start the scan job API: {e}")
+            sys.exit(1)
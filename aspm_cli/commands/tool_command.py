@@ -1,12 +1,15 @@
 import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore
 from pydantic import ValidationError
 
 from aspm_cli.commands.base_command import BaseCommand
 from aspm_cli.tool.download import ToolDownloader
+from aspm_cli.tool.sources import create_bundle
 from aspm_cli.utils.logger import Logger
-from aspm_cli.utils.spinner import Spinner
+from aspm_cli.utils.spinner import MultiProgress, Spinner
 from aspm_cli.utils.validation import ALLOWED_TOOL_TYPES, ToolDownloadConfig
 
 class ToolCommand(BaseCommand):
@@ -25,6 +28,21 @@ class ToolCommand(BaseCommand):
         self._add_download_args(tool_update_parser)
         tool_update_parser.set_defaults(func=self.execute, mode="update")
 
+        # tool bundle create
+        bundle_parser = subparsers.add_parser("bundle", help="Package tool artifacts for offline/mirror installs")
+        bundle_subparsers = bundle_parser.add_subparsers(dest="bundlecmd", required=True)
+        bundle_create_parser = bundle_subparsers.add_parser(
+            "create",
+            help="Download every tool artifact for this platform into one bundle tarball",
+        )
+        bundle_create_parser.add_argument(
+            "--output",
+            required=True,
+            help="Bundle file to write (e.g. accuknox-tools.tar)"
+        )
+        self._add_download_args(bundle_create_parser)
+        bundle_create_parser.set_defaults(func=self.create_bundle, mode="bundle")
+
     def _add_download_args(self, subparser):
         group = subparser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -37,6 +55,17 @@ class ToolCommand(BaseCommand):
             choices=ALLOWED_TOOL_TYPES,
             help=f"Tool to install/update (choices: {', '.join(ALLOWED_TOOL_TYPES)})"
         )
+        subparser.add_argument(
+            "--jobs",
+            type=int,
+            default=4,
+            help="Tools downloaded/extracted at once with --all (default: 4)"
+        )
+        subparser.add_argument(
+            "--source",
+            help="Where to fetch tool artifacts from: 'upstream' (default), an http(s):// mirror base URL, "
+                 "a local directory or a bundle file (path or file://). Default: ACCUKNOX_TOOL_SOURCE"
+        )
 
     def execute(self, args):
         try:
@@ -45,18 +74,21 @@ class ToolCommand(BaseCommand):
             Logger.get_logger().error(str(e))
             sys.exit(1)
 
-        downloader = ToolDownloader()
+        try:
+            downloader = ToolDownloader(source=args.source)
+        except (ValueError, OSError) as e:
+            Logger.get_logger().error(str(e))
+            sys.exit(1)
         overwrite = args.mode == "update"
         action_message = {"install": "installed", "update": "updated"}
         action_message_present = {"install": "Installing", "update": "Updating"}
         failures = []
 
         if validated.all:
-            for tool in ALLOWED_TOOL_TYPES:
-                spinner = Spinner(message=f"{action_message_present[args.mode]} tool for: {tool}")
-                spinner.start()
-                downloaded = downloader.download_tool(tool, overwrite)
-                spinner.stop()
+            tools = list(ALLOWED_TOOL_TYPES)
+            outcomes = self._install_parallel(downloader, tools, overwrite, args.mode, args.jobs)
+
+            for tool, downloaded in zip(tools, outcomes):
                 if downloaded:
                     Logger.log_with_color(
                         'INFO',
@@ -65,6 +97,10 @@ class ToolCommand(BaseCommand):
                     )
                 else:
                     failures.append(tool)
+            if failures:
+                Logger.get_logger().error(
+                    f"{len(failures)} of {len(tools)} tool(s) failed: {', '.join(failures)}"
+                )
         else:
             spinner = Spinner(message=f"{action_message_present[args.mode]} tool for: {validated.tooltype}")
             spinner.start()
@@ -81,3 +117,64 @@ class ToolCommand(BaseCommand):
 
         if failures:
             sys.exit(1)
+
+    def create_bundle(self, args):
+        try:
+            validated = ToolDownloadConfig(tooltype=args.type, all=args.all)
+        except ValidationError as e:
+            Logger.get_logger().error(str(e))
+            sys.exit(1)
+
+        tools = list(ALLOWED_TOOL_TYPES) if validated.all else [validated.tooltype]
+        with tempfile.TemporaryDirectory(prefix="accuknox-bundle-") as staging:
+            # Run the real installers into a throwaway directory: that records
+            # exactly the artifacts this platform needs and puts them in the cache.
+            try:
+                downloader = ToolDownloader(install_dir=staging, source=args.source)
+            except (ValueError, OSError) as e:
+                Logger.get_logger().error(str(e))
+                sys.exit(1)
+            outcomes = self._install_parallel(downloader, tools, True, "bundle", args.jobs)
+
+        failures = [tool for tool, ok in zip(tools, outcomes) if not ok]
+        if failures:
+            Logger.get_logger().error(f"Could not fetch: {', '.join(failures)}. Bundle not written.")
+            sys.exit(1)
+
+        urls = sorted({url for tool in tools for url in downloader.fetched_artifacts.get(tool, [])})
+        artifacts = {url: downloader.cache.fetch(url) for url in urls}
+        count = create_bundle(args.output, artifacts, {url: downloader.cache.entry(url) for url in urls})
+        Logger.log_with_color(
+            'INFO',
+            f"Wrote {count} artifact(s) for {', '.join(tools)} to {args.output}. "
+            f"Install with: tool install --all --source {args.output}",
+            Fore.GREEN
+        )
+
+    def _install_parallel(self, downloader, tools, overwrite, mode, jobs):
+        progress = MultiProgress(tools)
+        progress.start()
+        try:
+            # Each tool downloads and extracts in its own worker, so extraction
+            # of one archive overlaps with the downloads of the others.
+            with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(tools)))) as pool:
+                return list(pool.map(
+                    lambda tool: self._install_tool(downloader, tool, overwrite, progress, mode),
+                    tools,
+                ))
+        finally:
+            progress.stop()
+
+    def _install_tool(self, downloader, tool, overwrite, progress, mode):
+        progress.update(tool, {"install": "installing", "update": "updating"}.get(mode, "fetching"))
+        try:
+            downloaded = downloader.download_tool(
+                tool,
+                overwrite,
+                progress=lambda stage, done=0, total=0: progress.update(tool, stage, done, total),
+            )
+        except Exception as e:
+            Logger.get_logger().error(f"Failed to {mode} {tool}: {e}")
+            downloaded = False
+        progress.update(tool, "done" if downloaded else "failed")
+        return downloaded
@@ -9,14 +9,41 @@ PRE_COMMIT_CONTENT = """repos:
     hooks:
       - id: accuknox-secret-scan
         name: AccuKnox Secret Scan
-        entry:  accuknox-aspm-scanner scan --skip-upload secret --command "git file://." --container-mode
+        entry:  accuknox-aspm-scanner scan --skip-upload secret --staged
         language: system
         stages: [pre-commit]
         types: [text]
         pass_filenames: false
 """
 
-# TODO: precommit global support, display the findings, remove results.json file
+# One hook for all selected scanners: pre-commit runs hooks one after another,
+# so the scanners are fanned out concurrently inside a single invocation.
+# require_serial keeps pre-commit from splitting the filenames across processes.
+STAGED_HOOKS_CONTENT = """repos:
+  - repo: local
+    hooks:
+      - id: accuknox-scan
+        name: AccuKnox Scan ({names})
+        entry:  accuknox-aspm-scanner pre-commit run --scanners {scanners}{budget}
+        language: system
+        stages: [pre-commit]
+        types: [text]
+        pass_filenames: true
+        require_serial: true
+"""
+
+
+def pre_commit_content(scanners=None, budget=None):
+    """Hook config for the selected scanners; the secret-only hook by default."""
+    if not scanners or (scanners == ["secret"] and not budget):
+        return PRE_COMMIT_CONTENT
+    return STAGED_HOOKS_CONTENT.format(
+        names=", ".join(scanners),
+        scanners=",".join(scanners),
+        budget=f" --budget {budget}" if budget else "",
+    )
+
+# TODO: precommit global support
 def handle_pre_commit(args):
 
     try:
@@ -25,7 +52,7 @@ def handle_pre_commit(args):
 
         # create .pre-commit-config.yaml
         with open(CONFIG_FILE, "w") as f:
-            f.write(PRE_COMMIT_CONTENT)
+            f.write(pre_commit_content(getattr(args, "scanners", None), getattr(args, "budget", None)))
 
         if args.precommit_cmd == "install":
             exit_code = install(
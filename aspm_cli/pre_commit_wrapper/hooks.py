@@ -0,0 +1,261 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from colorama import Fore
+
+from aspm_cli.scan.iac import CHECKOV_IMAGE, IaCScanner
+from aspm_cli.scan.sast import OPENGREP_IMAGE
+from aspm_cli.scan.secret import TRUFFLEHOG_FOUND_RETURN_CODE, TRUFFLEHOG_IMAGE
+from aspm_cli.tool.manager import ToolManager
+from aspm_cli.utils import config, docker_pull
+from aspm_cli.utils.docker_runtime import build_docker_run_prefix, docker_volume_mount
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.secret_results import parse_trufflehog_output
+from aspm_cli.utils.staged import StagedSnapshot
+from aspm_cli.utils.subprocess_utils import run_scan_subprocess
+
+HOOK_SCANNERS = ("secret", "sast", "iac")
+# Seconds each scanner may take before the hook gives up on it (and lets the commit through).
+DEFAULT_BUDGETS = {"secret": 10, "sast": 60, "iac": 60}
+
+CONTAINER_SOURCE = "/src"
+CONTAINER_REPORTS = "/reports"
+
+# (repo-relative path, line, label)
+Finding = Tuple[str, int, str]
+
+
+def parse_scanners(value: str) -> List[str]:
+    scanners = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = [name for name in scanners if name not in HOOK_SCANNERS]
+    if unknown or not scanners:
+        raise ValueError(f"Unsupported hook scanner(s): {', '.join(unknown) or value!r}. "
+                         f"Choose from: {', '.join(HOOK_SCANNERS)}")
+    return list(dict.fromkeys(scanners))
+
+
+def parse_budgets(value: Optional[str]) -> Dict[str, int]:
+    """``sast=30,iac=45`` (per scanner) or ``30`` (every scanner) -> seconds per scanner."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, seconds = item.rpartition("=")
+        targets = parse_scanners(name) if name else list(HOOK_SCANNERS)
+        try:
+            budget = int(seconds)
+        except ValueError:
+            raise ValueError(f"Invalid hook budget {item!r}: seconds must be an integer")
+        if budget <= 0:
+            raise ValueError(f"Invalid hook budget {item!r}: seconds must be positive")
+        for target in targets:
+            budgets[target] = budget
+    return budgets
+
+
+class HookScan(ABC):
+    """One scanner of the pre-commit hook, run against the shared staged snapshot."""
+
+    name = ""
+    tool = ""
+    found_return_codes = (1,)
+
+    def __init__(self, snapshot: StagedSnapshot, reports_dir: str, budget: int):
+        self.snapshot = snapshot
+        self.reports_dir = reports_dir
+        self.budget = budget
+        self.local_tool = None
+        self.container = False
+        self.container_name = None
+
+    @property
+    @abstractmethod
+    def image(self) -> str:
+        """Scanner image used when the local tool is not installed."""
+        pass
+
+    @abstractmethod
+    def scanner_args(self, source: str, reports: str) -> List[str]:
+        """Scanner arguments for the snapshot at source, writing reports under reports."""
+        pass
+
+    @abstractmethod
+    def findings(self, result: subprocess.CompletedProcess, source: str) -> List[Finding]:
+        """Findings of a finished run, with paths relative to the repository."""
+        pass
+
+    def prepare(self) -> None:
+        """Use the local tool when installed, otherwise the scanner image."""
+        try:
+            self.local_tool = ToolManager.get_path(self.tool)
+        except (ValueError, FileNotFoundError):
+            self.container = True
+            docker_pull(self.image)
+
+    def command(self) -> List[str]:
+        if not self.container:
+            return [self.local_tool, *self.scanner_args(self.snapshot.root, self.reports_dir)]
+        # Named, so the container can be removed if the budget runs out.
+        self.container_name = f"accuknox-hook-{self.name}-{uuid.uuid4().hex[:8]}"
+        cmd = build_docker_run_prefix(workdir=CONTAINER_SOURCE, host_path=self.snapshot.root)
+        cmd.extend(docker_volume_mount(self.reports_dir, CONTAINER_REPORTS))
+        cmd.extend(["--name", self.container_name, self.image])
+        cmd.extend(self.scanner_args(CONTAINER_SOURCE, CONTAINER_REPORTS))
+        return cmd
+
+    def run(self) -> Tuple[int, List[Finding]]:
+        self.prepare()
+        cmd = self.command()
+        Logger.get_logger().debug(f"Pre-commit {self.name} scan ({self.budget}s budget): {' '.join(cmd)}")
+        try:
+            result = run_scan_subprocess(cmd, timeout=self.budget)
+        except subprocess.TimeoutExpired:
+            if self.container_name:
+                subprocess.run(["docker", "rm", "-f", self.container_name], capture_output=True)
+            raise
+        if result.returncode not in (config.PASS_RETURN_CODE, *self.found_return_codes):
+            message = (result.stderr or "").strip() or f"exited with code {result.returncode}"
+            raise RuntimeError(message)
+        source = CONTAINER_SOURCE if self.container else self.snapshot.root
+        return result.returncode, self.findings(result, source)
+
+    def report_path(self, name: str) -> str:
+        return os.path.join(self.reports_dir, name)
+
+
+class SecretHookScan(HookScan):
+    name = "secret"
+    tool = "secret"
+    found_return_codes = (TRUFFLEHOG_FOUND_RETURN_CODE,)
+
+    @property
+    def image(self) -> str:
+        return os.getenv("SCAN_IMAGE", TRUFFLEHOG_IMAGE)
+
+    def scanner_args(self, source, reports):
+        return ["filesystem", source, "--json", "--no-update", "--fail"]
+
+    def findings(self, result, source):
+        return [(self.snapshot.repo_path(path, source), line, label)
+                for path, line, label in parse_trufflehog_output(result.stdout)]
+
+
+class SASTHookScan(HookScan):
+    name = "sast"
+    tool = "sast"
+    report = "sast.json"
+
+    @property
+    def image(self) -> str:
+        return os.getenv("SCAN_IMAGE", OPENGREP_IMAGE)
+
+    def scanner_args(self, source, reports):
+        rules = "/rules/default-rules/" if self.container else ToolManager.get_path("sast-rules")
+        return ["scan", "-f", rules, "--max-target-bytes", "5000000",
+                "--json", "--output", f"{reports}/{self.report}", source]
+
+    def findings(self, result, source):
+        with open(self.report_path(self.report)) as f:
+            data = json.load(f)
+        findings = []
+        for finding in data.get("results", []):
+            impact = (finding.get("extra", {}).get("metadata", {}).get("impact") or "UNKNOWN").upper()
+            findings.append((
+                self.snapshot.repo_path(finding.get("path", ""), source),
+                int((finding.get("start") or {}).get("line") or 0),
+                f"{finding.get('check_id', 'rule')} ({impact})",
+            ))
+        return findings
+
+
+class IaCHookScan(HookScan):
+    name = "iac"
+    tool = "iac"
+
+    @property
+    def image(self) -> str:
+        return os.getenv("SCAN_IMAGE", CHECKOV_IMAGE)
+
+    def scanner_args(self, source, reports):
+        return ["-d", source, "-o", "json", "--output-file-path", reports, "--quiet"]
+
+    def findings(self, result, source):
+        report = self.report_path(os.path.basename(IaCScanner.result_file))
+        if not os.path.exists(report):
+            return []
+        with open(report) as f:
+            data = json.load(f)
+        findings = []
+        for framework in data if isinstance(data, list) else [data]:
+            for check in (framework.get("results") or {}).get("failed_checks", []):
+                lines = check.get("file_line_range") or [0]
+                severity = f" ({check['severity']})" if check.get("severity") else ""
+                findings.append((
+                    (check.get("file_path") or "").lstrip("/"),
+                    int(lines[0] or 0),
+                    f"{check.get('check_id', 'check')}{severity}",
+                ))
+        return findings
+
+
+HOOK_SCANS = {scan.name: scan for scan in (SecretHookScan, SASTHookScan, IaCHookScan)}
+
+
+def run_staged_hooks(scanners: List[str], budgets: Dict[str, int], filenames: Optional[List[str]] = None) -> int:
+    """
+    Scan the staged content of ``filenames`` (all staged files when empty) with
+    each scanner concurrently, from one snapshot of the index. A scanner that
+    exceeds its budget is reported and skipped; findings block the commit.
+    """
+    with StagedSnapshot(paths=filenames or None) as snapshot:
+        if not snapshot.files:
+            Logger.get_logger().info("No staged files to scan.")
+            return config.PASS_RETURN_CODE
+
+        reports_root = tempfile.mkdtemp(prefix="accuknox-hook-reports-")
+        try:
+            scans = []
+            for name in scanners:
+                reports_dir = os.path.join(reports_root, name)
+                os.makedirs(reports_dir)
+                scans.append(HOOK_SCANS[name](snapshot, reports_dir, budgets[name]))
+
+            def _run(scan):
+                try:
+                    return scan.run()
+                except Exception as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=len(scans)) as pool:
+                outcomes = list(pool.map(_run, scans))
+        finally:
+            shutil.rmtree(reports_root, ignore_errors=True)
+
+    exit_code = config.PASS_RETURN_CODE
+    for scan, outcome in zip(scans, outcomes):
+        if isinstance(outcome, subprocess.TimeoutExpired):
+            Logger.log_with_color("WARNING", f"[{scan.name}] skipped: exceeded its {scan.budget}s budget.", Fore.YELLOW)
+            continue
+        if isinstance(outcome, Exception):
+            Logger.get_logger().error(f"[{scan.name}] scan failed: {outcome}")
+            exit_code = config.SOMETHING_WENT_WRONG_RETURN_CODE
+            continue
+        _, findings = outcome
+        for path, line, label in findings:
+            Logger.log_with_color("ERROR", f"[{scan.name}] {path}:{line}: {label}", Fore.RED)
+        if findings:
+            exit_code = exit_code or 1
+        else:
+            Logger.get_logger().info(f"[{scan.name}] no findings.")
+
+    if exit_code == 1:
+        Logger.log_with_color("ERROR", "Findings in staged changes. Fix them before committing.", Fore.RED)
+    return exit_code
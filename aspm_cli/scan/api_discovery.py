@@ -1,5 +1,9 @@
+import json
 import os
+import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from aspm_cli.tool.manager import ToolManager
 from aspm_cli.utils import config, docker_pull
@@ -7,27 +11,38 @@ from aspm_cli.utils.docker_runtime import build_docker_run_prefix
 from aspm_cli.utils.api_discovery import (
     DEFAULT_RESULT_FILE,
     DOCKER_WORKDIR,
+    code2api_paths,
+    merge_code2api_reports,
     normalize_code2api_args,
     normalize_code2api_args_for_docker,
+    with_single_root,
 )
 from aspm_cli.utils.logger import Logger
 from aspm_cli.utils.path_safety import resolve_path_within_root
-from aspm_cli.utils.subprocess_utils import run_scan_subprocess
+from aspm_cli.utils.project_shards import find_service_roots
+from aspm_cli.utils.subprocess_utils import default_job_count, run_scan_subprocess
 from colorama import Fore
 
-CODE2API_IMAGE = os.getenv(
-    "CODE2API_IMAGE",
-    "public.ecr.aws/k9v9d5v2/accuknox/code2api:0.1.0",
-)
+CODE2API_IMAGE = "public.ecr.aws/k9v9d5v2/accuknox/code2api:0.1.0"
+# Per-root code2api outputs of a multi-root scan, merged into the result file.
+ROOTS_DIR = ".accuknox-api-discovery"
 
 
 class APIDiscoveryScanner:
     result_file = DEFAULT_RESULT_FILE
 
-    def __init__(self, command, container_mode=False):
+    def __init__(self, command, container_mode=False, auto_roots=False, jobs=None):
+        """
+        :param command: code2api args; several -path values scan several roots
+        :param auto_roots: Scan each top-level project directory (package.json, go.mod,
+                           pom.xml, ...) under -path as its own root
+        :param jobs: Maximum roots scanned concurrently (default: CPU count)
+        """
         self.command = command
         self.container_mode = container_mode
-        self.scan_image = os.getenv("SCAN_IMAGE", CODE2API_IMAGE)
+        self.auto_roots = auto_roots
+        self.jobs = jobs or default_job_count()
+        self.scan_image = os.getenv("SCAN_IMAGE", os.getenv("CODE2API_IMAGE", CODE2API_IMAGE))
         self.cwd = os.getcwd()
 
     def run(self):
@@ -44,13 +59,16 @@ class APIDiscoveryScanner:
                 return config.PASS_RETURN_CODE, None
 
             try:
-                path_idx = args.index("-path")
-                if path_idx + 1 < len(args):
-                    resolve_path_within_root(args[path_idx + 1], self.cwd)
+                for path in code2api_paths(args):
+                    resolve_path_within_root(path, self.cwd)
             except ValueError as exc:
                 Logger.get_logger().error(str(exc))
                 return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
 
+            roots = self._scan_roots(args)
+            if len(roots) > 1 or self.auto_roots:
+                return self._run_roots(args, roots)
+
             if self.container_mode:
                 args = normalize_code2api_args_for_docker(args, cwd=self.cwd)
 
@@ -83,6 +101,73 @@ class APIDiscoveryScanner:
             Logger.get_logger().error(f"Error during API discovery scan: {e}")
             raise
 
+    def _scan_roots(self, args):
+        paths = code2api_paths(args)
+        if not self.auto_roots:
+            return paths
+        roots = []
+        for path in paths:
+            found = find_service_roots(resolve_path_within_root(path, self.cwd))
+            roots.extend(os.path.relpath(root, self.cwd) for root in found)
+        if not roots:
+            Logger.get_logger().info("No project directories detected; scanning the -path root(s).")
+            return paths
+        return list(dict.fromkeys(roots))
+
+    def _run_roots(self, args, roots):
+        """Run code2api on each root concurrently and merge the outputs into one result file."""
+        output = args[args.index("-output") + 1]
+        jobs = min(self.jobs, len(roots))
+        Logger.get_logger().info(f"API discovery over {len(roots)} source root(s), {jobs} at once.")
+        os.makedirs(ROOTS_DIR, exist_ok=True)
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(
+                    lambda item: self._scan_root(args, item[1], os.path.join(ROOTS_DIR, f"root-{item[0]}.json")),
+                    enumerate(roots, start=1),
+                ))
+            reports = []
+            for root, (_, root_output) in zip(roots, outcomes):
+                if not os.path.exists(root_output) or os.stat(root_output).st_size == 0:
+                    continue
+                try:
+                    with open(root_output, "r", encoding="utf-8") as handle:
+                        reports.append((root, json.load(handle)))
+                except ValueError:
+                    Logger.get_logger().error(f"code2api output for {root} is not valid JSON.")
+        finally:
+            shutil.rmtree(ROOTS_DIR, ignore_errors=True)
+
+        failed = [code for code, _ in outcomes if code != config.PASS_RETURN_CODE]
+        if not reports:
+            if not failed:
+                Logger.get_logger().info(
+                    "API discovery completed with no output file (no APIs found or empty scan)."
+                )
+            return (failed[0] if failed else config.PASS_RETURN_CODE), None
+
+        merged = merge_code2api_reports(reports)
+        with open(output, "w", encoding="utf-8") as handle:
+            json.dump(merged, handle, indent=2)
+        if failed:
+            Logger.get_logger().error(f"API discovery failed for {len(failed)} of {len(roots)} source root(s).")
+            return failed[0], output
+        return config.PASS_RETURN_CODE, output
+
+    def _scan_root(self, args, root, output):
+        root_args = with_single_root(args, root, output)
+        if self.container_mode:
+            root_args = normalize_code2api_args_for_docker(root_args, cwd=self.cwd)
+        cmd = self._build_scan_command(root_args)
+        started = time.monotonic()
+        result = run_scan_subprocess(cmd)
+        Logger.get_logger().debug(
+            f"API discovery of {root}: exit code {result.returncode} in {time.monotonic() - started:.1f}s"
+        )
+        if result.stderr:
+            Logger.get_logger().error(f"{root}: {result.stderr.replace('code2api', '[scanner]')}")
+        return result.returncode, output
+
     def _resolve_local_binary(self) -> str:
         try:
             return ToolManager.get_path("api-discovery")
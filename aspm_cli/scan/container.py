@@ -9,13 +9,14 @@ from aspm_cli.utils import docker_pull
 from aspm_cli.utils import config
 from aspm_cli.utils.sbom import append_sbom_scanner_flags, normalize_sbom_args_for_docker
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix, trivy_scan_needs_docker_socket
+from aspm_cli.scan.trivy_runner import get_trivy_image, shared_cache_args
 from colorama import Fore
 
 class ContainerScanner:
-    ak_container_image = os.getenv("SCAN_IMAGE", "public.ecr.aws/k9v9d5v2/accuknox/trivy:0.69.3")
     result_file = './results.json'
 
     def __init__(self, command, container_mode=False, generate_sbom: bool = False):
+        self.ak_container_image = get_trivy_image()
         self.command = command
         self.container_mode = container_mode
         self.generate_sbom = generate_sbom
@@ -130,6 +131,7 @@ class ContainerScanner:
         return severity_threshold, sanitized_args
     
     def _build_scan_command(self, container_scan_args):
+        cache_mount, cache_flags = shared_cache_args(self.container_mode)
         if not self.container_mode:
             cmd = ([ToolManager.get_path("container")])
         else:
@@ -137,9 +139,11 @@ class ContainerScanner:
                 workdir="/workdir",
                 mount_docker_socket=trivy_scan_needs_docker_socket(container_scan_args),
             )
+            cmd.extend(cache_mount)
             cmd.append(self.ak_container_image)
         
         cmd.extend(container_scan_args)
+        cmd.extend(cache_flags)
         return cmd
 
     def _severity_threshold_met(self, severity_threshold):
@@ -1,30 +1,84 @@
 import subprocess
 import json
 import os
+import re
 import shlex
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from colorama import Fore
 from aspm_cli.utils import config, docker_pull
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix
 from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.subprocess_utils import default_job_count, run_scan_subprocess, scan_timeout_seconds
+from aspm_cli.utils.zap_api import ZapApiError, connect_zap_daemon
 from aspm_cli.tool.manager import ToolManager
 
+# ZAP packaged scans whose report flags the CLI controls.
+ZAP_SCAN_SCRIPTS = ("zap-baseline.py", "zap-full-scan.py")
+# Per-target working directories of a multi-target scan, under the mounted /zap/wrk.
+TARGETS_DIR = ".accuknox-dast"
+# Each target runs its own ZAP JVM, so the default stays well below the CPU count.
+DEFAULT_TARGET_JOBS = 4
+# zap-baseline.py's default spider duration (-m), used by --zap-daemon scans.
+DEFAULT_SPIDER_MINUTES = 1
+ZAP_IMAGE = "public.ecr.aws/k9v9d5v2/zaproxy/zap-stable:2.16.1"
+
+
+def load_targets(targets=None, targets_file=None):
+    """
+    Target URLs from a comma-separated list and/or a file with one URL per line
+    (blank lines and # comments ignored), de-duplicated in order.
+    """
+    urls = [url.strip() for url in (targets or "").split(",")]
+    if targets_file:
+        try:
+            with open(targets_file, "r", encoding="utf-8") as handle:
+                urls.extend(line.split("#", 1)[0].strip() for line in handle)
+        except OSError as e:
+            raise ValueError(f"Cannot read targets file {targets_file}: {e.strerror}")
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def target_slug(url):
+    """File-name-safe form of a target URL: host plus path."""
+    parsed = urlparse(url)
+    slug = re.sub(r"[^A-Za-z0-9.-]+", "_", f"{parsed.netloc}{parsed.path}").strip("_.")
+    return slug[:80] or "target"
+
+
 class DASTScanner:
-    zap_image = os.getenv("SCAN_IMAGE", "public.ecr.aws/k9v9d5v2/zaproxy/zap-stable:2.16.1")
     result_file = "results.json"
 
-    def __init__(self, command="", severity_threshold=None, container_mode=True):
+    def __init__(self, command="", severity_threshold=None, container_mode=True, targets=None, jobs=None,
+                 zap_daemon=False):
         """
         :param command: Raw CLI args string for zap scripts
                         Example: "zap-baseline.py -t https://example.com -J results.json -I"
         :param severity_threshold: Minimum severity to fail on ("High", "Medium", "Low", "Informational")
         :param container_mode: Currently only container mode is supported
+        :param targets: Target URLs; the command is run once per target (its -t is replaced)
+        :param jobs: Maximum targets scanned concurrently (default: 4, or fewer CPUs)
+        :param zap_daemon: Drive a long-lived ZAP daemon through its REST API instead of
+                           starting a ZAP container per scan
         """
+        self.zap_image = os.getenv("SCAN_IMAGE", ZAP_IMAGE)
         self.command = command
         self.severity_threshold = severity_threshold
         self.container_mode = container_mode
+        self.targets = list(targets or [])
+        self.jobs = jobs or min(DEFAULT_TARGET_JOBS, default_job_count())
+        self.zap_daemon = zap_daemon
+        # Per-target report files of a multi-target scan, uploaded one by one.
+        self.result_files = []
 
     def run(self):
+        if self.zap_daemon:
+            return self._run_zap_daemon()
+        if self.targets:
+            return self._run_targets()
         try:
             if self.container_mode:
                 docker_pull(self.zap_image)
@@ -61,10 +115,84 @@ class DASTScanner:
             Logger.get_logger().error(f"Error during DAST scan: {e}")
             raise
 
-    def _build_dast_args(self):
+    def _run_zap_daemon(self):
+        """Scan through the ZAP daemon's API: no container or JVM start per scan."""
+        try:
+            api = connect_zap_daemon(self.zap_image)
+        except ZapApiError as e:
+            Logger.get_logger().error(str(e))
+            return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+        if self.targets:
+            return self._run_targets(lambda index, url: self._scan_target_api(api, url, f"results-{index}-{target_slug(url)}.json"))
+
+        args = shlex.split(self.command)
+        url = args[args.index("-t") + 1]
+        return self._scan_target_api(api, url, self.result_file)
+
+    def _scan_target_api(self, api, url, result_file):
+        args = shlex.split(self.command)
+        minutes = float(args[args.index("-m") + 1]) if "-m" in args[:-1] else DEFAULT_SPIDER_MINUTES
+        active = "zap-full-scan.py" in args
+        Logger.get_logger().debug(f"ZAP daemon {'full' if active else 'baseline'} scan of {url}")
+        started = time.monotonic()
+        try:
+            report = api.scan(url, active=active, spider_minutes=minutes, timeout=scan_timeout_seconds())
+        except ZapApiError as e:
+            Logger.get_logger().error(f"DAST scan of {url} failed: {e}")
+            return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+        with open(result_file, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        Logger.get_logger().debug(f"ZAP daemon scan of {url} took {time.monotonic() - started:.1f}s")
+        return self.evaluate_results(result_file, label=url if self.targets else None), result_file
+
+    def _run_targets(self, scan_target=None):
+        """Scan each target in its own ZAP container (or via scan_target), at most self.jobs at once."""
+        if scan_target is None:
+            docker_pull(self.zap_image)
+            scan_target = self._scan_target
+        jobs = min(self.jobs, len(self.targets))
+        Logger.get_logger().info(f"DAST scan of {len(self.targets)} target(s), {jobs} at once.")
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(lambda item: scan_target(*item), enumerate(self.targets, start=1)))
+        finally:
+            shutil.rmtree(TARGETS_DIR, ignore_errors=True)
+
+        self.result_files = [result_file for _, result_file in outcomes if result_file]
+        for url, (exit_code, result_file) in zip(self.targets, outcomes):
+            status = "error" if result_file is None else ("failed" if exit_code else "passed")
+            Logger.get_logger().info(f"  {status:<7} {url}" + (f" -> {result_file}" if result_file else ""))
+
+        exit_code = max(exit_code for exit_code, _ in outcomes)
+        return exit_code, self.result_files[0] if self.result_files else None
+
+    def _scan_target(self, index, url):
+        work_dir = os.path.join(TARGETS_DIR, f"{index}-{target_slug(url)}")
+        os.makedirs(work_dir, exist_ok=True)
+        # The ZAP image runs as its own user; it must be able to write the report.
+        os.chmod(work_dir, 0o777)
+        report = f"{work_dir}/{os.path.basename(self.result_file)}".replace(os.sep, "/")
+
+        cmd, env = self._build_dast_command(self._build_dast_args(target=url, report=report))
+        Logger.get_logger().debug(f"DAST scan of {url}: {' '.join(cmd)}")
+        result = run_scan_subprocess(cmd, env=env)
+        if result.stdout:
+            Logger.get_logger().debug(f"{url}: {result.stdout}")
+        if not os.path.exists(report):
+            Logger.get_logger().error(
+                f"DAST scan of {url} wrote no report (exit code {result.returncode}): {(result.stderr or '').strip()}"
+            )
+            return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+
+        result_file = f"results-{index}-{target_slug(url)}.json"
+        os.replace(report, result_file)
+        return self.evaluate_results(result_file, label=url), result_file
+
+    def _build_dast_args(self, target=None, report=None):
         """
         Sanitize the raw command, remove conflicting report flags,
-        and enforce JSON output.
+        and enforce JSON output. With target, the command's -t is replaced by it
+        and the JSON report goes to report (relative to /zap/wrk).
         """
         args = shlex.split(self.command)
 
@@ -77,6 +205,8 @@ class DASTScanner:
         forbidden_flags = []
         if "zap-baseline.py" in shlex.join(args) or "zap-full-scan.py" in shlex.join(args):
             forbidden_flags = {"-r", "-w", "-x", "-J"}
+            if target:
+                forbidden_flags.add("-t")
 
         sanitized_args = []
         i = 0
@@ -90,8 +220,10 @@ class DASTScanner:
 
         if "zap-baseline.py" in shlex.join(args) or "zap-full-scan.py" in shlex.join(args):
             # Always enforce JSON report at results.json
+            if target:
+                sanitized_args.extend(["-t", target])
             sanitized_args.extend([
-                "-J", os.path.basename(self.result_file)
+                "-J", report or os.path.basename(self.result_file)
             ])
 
         return sanitized_args
@@ -114,16 +246,18 @@ class DASTScanner:
             cmd.extend(args)
         return cmd, env
 
-    def evaluate_results(self):
+    def evaluate_results(self, result_file=None, label=None):
         """
         Parse ZAP JSON report and check alerts against severity threshold.
         """
+        result_file = result_file or self.result_file
+        prefix = f"{label}: " if label else ""
         risk_map = {"INFORMATIONAL": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3}
         threshold = self.severity_threshold.strip().upper()
         risk_code = risk_map.get(threshold)
 
         try:
-            with open(self.result_file, "r") as f:
+            with open(result_file, "r") as f:
                 zap_results = json.load(f)
 
             alerts = [
@@ -134,15 +268,15 @@ class DASTScanner:
 
             if alerts:
                 Logger.get_logger().error(
-                    f"Found vulnerabilities with severity {threshold} or higher."
+                    f"{prefix}Found vulnerabilities with severity {threshold} or higher."
                 )
                 return 1
             else:
                 Logger.get_logger().info(
-                    f"No vulnerabilities with severity {threshold} or higher found."
+                    f"{prefix}No vulnerabilities with severity {threshold} or higher found."
                 )
                 return 0
 
         except Exception as e:
-            Logger.get_logger().error(f"Error evaluating DAST results: {e}")
+            Logger.get_logger().error(f"{prefix}Error evaluating DAST results: {e}")
             return 1
@@ -1,54 +1,78 @@
 import subprocess
 import json
 import os
+import re
 import shlex
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from aspm_cli.tool.manager import ToolManager
 from aspm_cli.utils import docker_pull
+from aspm_cli.utils.cache import read_json, write_json_atomic
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix
+from aspm_cli.utils.iac_cache import (
+    IaCInventory, IaCResultCache, build_checkov_output, merge_unit_results, split_reports_by_unit,
+)
 from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.project_shards import find_iac_project_roots, plan_shards
+from aspm_cli.utils.sharding import select_shard
+from aspm_cli.utils.subprocess_utils import default_job_count
 from colorama import Fore
 from aspm_cli.utils import config
 
+INCREMENTAL_DIR = ".accuknox-iac-incremental"
+SHARDS_DIR = ".accuknox-iac-shards"
+# Upper bound on files passed to a single Checkov invocation via repeated -f.
+MAX_FILES_PER_RUN = 200
+CHECKOV_IMAGE = "public.ecr.aws/k9v9d5v2/bridgecrew/checkov:3.2.458"
+
+
 class IaCScanner:
-    ak_iac_image = os.getenv("SCAN_IMAGE", "public.ecr.aws/k9v9d5v2/bridgecrew/checkov:3.2.458")
     output_format = 'json'
     output_file_path = '.'
     result_file = os.path.join(output_file_path, 'results_json.json')
 
-    def __init__(self, command, container_mode=False, repo_url=None, repo_branch=None, severity=None):
+    def __init__(self, command, container_mode=False, repo_url=None, repo_branch=None, severity=None,
+                 incremental=False, jobs=None, shard_projects=False, shard=None):
         """
         :param command: Raw command string passed by the user (e.g., "-d .")
         :param container_mode: If True, run ak_iac locally instead of in Docker
         :param severity: Comma-separated severities that should fail the scan
+        :param incremental: Re-scan only IaC files/directories whose fingerprint changed
+                            since the last run and reuse cached results for the rest
+        :param jobs: Maximum concurrent Checkov runs in incremental or sharded mode (default: CPU count)
+        :param shard_projects: Run Checkov per Terraform root / Helm chart in parallel and merge the reports
+        :param shard: (i, N) to scan only slice i of N of the IaC units of the -d target
         """
+        self.ak_iac_image = os.getenv("SCAN_IMAGE", CHECKOV_IMAGE)
         self.command = command
         self.container_mode = container_mode
         self.repo_url = repo_url
         self.repo_branch = repo_branch
         self.severity = [s.strip().upper() for s in (severity or "INFO,LOW,MEDIUM,HIGH,CRITICAL").split(',')]
+        self.incremental = incremental
+        self.jobs = jobs or default_job_count()
+        self.shard_projects = shard_projects
+        self.shard = shard
 
     def run(self):
         try:
             if self.container_mode:
                 docker_pull(self.ak_iac_image)
 
-            sanitized_args = self._build_iac_args()
-            iac_cmd = self._build_iac_command(sanitized_args)
-
-            Logger.get_logger().debug(f"Executing command: {' '.join(iac_cmd)}")
-            result = subprocess.run(iac_cmd, capture_output=True, text=True)
+            returncode = None
+            if self.incremental and "--help" not in self.command:
+                returncode = self._run_incremental()
+            elif self.shard_projects and "--help" not in self.command:
+                returncode = self._run_sharded()
+            elif self.shard and "--help" not in self.command:
+                returncode = self._run_partition()
 
-            if result.stdout:
-                sanitized_stdout = result.stdout.replace("checkov", "[scanner]")
-                Logger.get_logger().debug(sanitized_stdout)
-                if("--help" in self.command):
-                    Logger.log_with_color('INFO', sanitized_stdout, Fore.WHITE)
+            if returncode is None:
+                result = self._run_checkov(self._build_iac_args())
+                if result is None:
                     return config.PASS_RETURN_CODE, None
-            if result.stderr:
-                sanitized_stderr = result.stderr.replace("checkov", "[scanner]")
-                Logger.get_logger().error(sanitized_stderr)
-
-            self._fix_file_permissions_if_docker()
+                self._fix_file_permissions_if_docker()
+                returncode = result.returncode
 
             if not os.path.exists(self.result_file):
                 return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
@@ -57,8 +81,8 @@ class IaCScanner:
             # Any other code is a runtime error even if a (partial) result
             # file was written, so surface it instead of letting the severity
             # check below silently pass the pipeline.
-            if result.returncode not in (0, 1):
-                Logger.get_logger().error(f"IaC scanner exited with error code {result.returncode}.")
+            if returncode not in (0, 1):
+                Logger.get_logger().error(f"IaC scanner exited with error code {returncode}.")
                 return config.SOMETHING_WENT_WRONG_RETURN_CODE, self.result_file
 
             self.process_result_file()
@@ -72,11 +96,257 @@ class IaCScanner:
             Logger.get_logger().error(f"Error during IaC scan: {e}")
             raise
 
-    def _build_iac_args(self):
+    def _run_checkov(self, args, label=None):
+        """Run Checkov with prepared args. Returns None when --help output was shown."""
+        iac_cmd = self._build_iac_command(args)
+
+        Logger.get_logger().debug(f"Executing command: {' '.join(iac_cmd)}")
+        result = subprocess.run(iac_cmd, capture_output=True, text=True)
+
+        if result.stdout:
+            sanitized_stdout = result.stdout.replace("checkov", "[scanner]")
+            Logger.get_logger().debug(sanitized_stdout)
+            if("--help" in self.command):
+                Logger.log_with_color('INFO', sanitized_stdout, Fore.WHITE)
+                return None
+        if result.stderr:
+            sanitized_stderr = result.stderr.replace("checkov", "[scanner]")
+            if label:
+                sanitized_stderr = f"{label}: {sanitized_stderr}"
+            Logger.get_logger().error(sanitized_stderr)
+        return result
+
+    def _run_incremental(self):
         """
-        Sanitize the raw command and enforce output flags.
+        Re-run Checkov only on units (Terraform directories, Helm charts, single files)
+        whose fingerprint changed, and rebuild the result file from the per-unit cache.
+        Returns the Checkov-style exit code, or None to fall back to a full scan.
+        """
+        target = self._single_target("Incremental")
+        if target is None:
+            return None
+
+        # The previous run's result file sits in the target; it is not IaC input.
+        inventory = IaCInventory(target, exclude=[self.result_file])
+        base_args = self._strip_target_args(shlex.split(self.command))
+        cache = IaCResultCache(
+            "iac", self.repo_url, self.repo_branch, inventory.target, " ".join(base_args),
+            self.container_mode, self._scanner_identity(),
+        )
+        cwd = os.getcwd()
+        changed = cache.changed_units(inventory)
+
+        os.makedirs(INCREMENTAL_DIR, exist_ok=True)
+        try:
+            if not cache.units:
+                Logger.get_logger().info("No IaC result cache found; running a full scan to seed it.")
+                plans = [(self._build_iac_args(quiet=False, output_dir=os.path.join(INCREMENTAL_DIR, "0")),
+                          inventory.target, None)]
+                changed = sorted(inventory.units)
+            else:
+                Logger.get_logger().info(
+                    f"Incremental IaC scan: {len(changed)} of {len(inventory.units)} unit(s) changed."
+                )
+                plans = self._incremental_plans(inventory, changed, base_args, cwd)
+
+            unit_results, report_meta, returncode = {}, {}, 0
+            if plans:
+                with ThreadPoolExecutor(max_workers=min(self.jobs, len(plans))) as pool:
+                    outcomes = list(pool.map(
+                        lambda plan: self._run_plan(plan, inventory, cwd),
+                        plans,
+                    ))
+                for code, results, meta in outcomes:
+                    if code not in (0, 1):
+                        returncode = code
+                        continue
+                    unit_results.update(results)
+                    for check_type, values in meta.items():
+                        report_meta.setdefault(check_type, values)
+
+            if returncode not in (0, 1):
+                Logger.get_logger().warning("IaC scan did not complete; result cache not updated.")
+                return returncode
+
+            cache.update(inventory, changed, unit_results, report_meta)
+            cache.save()
+        finally:
+            shutil.rmtree(INCREMENTAL_DIR, ignore_errors=True)
+
+        output = build_checkov_output(cache.results(), cache.report_meta, cache.check_type_order, quiet=True)
+        write_json_atomic(self.result_file, output, indent=2)
+        has_failures = any(
+            report.get("results", {}).get("failed_checks")
+            for report in (output if isinstance(output, list) else [output])
+        )
+        return 1 if has_failures else 0
+
+    def _run_sharded(self):
+        """
+        Run Checkov once per project shard (Terraform root, Helm chart, and the rest of
+        the target), concurrently, and merge the reports into the result file.
+        Returns the Checkov-style exit code, or None to fall back to a full scan.
+        """
+        target = self._single_target("Sharded")
+        if target is None:
+            return None
+
+        inventory = IaCInventory(target, exclude=[self.result_file], fingerprint=False)
+        roots = find_iac_project_roots(inventory)
+        if not roots:
+            Logger.get_logger().info("No Terraform roots or Helm charts to shard by; running a full scan.")
+            return None
+        files = [path for unit in inventory.units.values() for path in unit.files]
+        shards = plan_shards(inventory.target, roots, files)
+        base_args = self._strip_target_args(shlex.split(self.command))
+        cwd = os.getcwd()
+        Logger.get_logger().info(f"Scanning {len(shards)} IaC project shard(s) with up to {self.jobs} concurrent run(s).")
+
+        plans = []
+        for index, (directory, nested) in enumerate(shards):
+            target_args = ["-d", os.path.relpath(directory, cwd)]
+            for path in nested:
+                target_args.extend(["--skip-path", f"(^|/){re.escape(os.path.relpath(path, cwd))}(/|$)"])
+            args = self._build_iac_args(raw_args=[*base_args, *target_args], quiet=False,
+                                        output_dir=os.path.join(SHARDS_DIR, str(index)))
+            plans.append((args, directory, None))
+        return self._run_plans_into_result(plans, inventory, cwd)
+
+    def _run_partition(self):
+        """
+        Scan only this node's --shard slice of the units (Terraform directories, Helm
+        charts, single files) of the -d target. Returns the Checkov-style exit code,
+        or None to fall back to a full scan.
         """
+        target = self._single_target("Partitioned")
+        if target is None:
+            return None
+
+        inventory = IaCInventory(target, exclude=[self.result_file], fingerprint=False)
+        selected = select_shard(sorted(inventory.units), self.shard)
+        Logger.get_logger().info(
+            f"IaC shard {self.shard[0]}/{self.shard[1]}: {len(selected)} of {len(inventory.units)} unit(s)."
+        )
+        base_args = self._strip_target_args(shlex.split(self.command))
+        cwd = os.getcwd()
+        plans = self._incremental_plans(inventory, selected, base_args, cwd, output_root=SHARDS_DIR)
+        return self._run_plans_into_result(plans, inventory, cwd)
+
+    def _run_plans_into_result(self, plans, inventory, cwd):
+        """Run Checkov plans concurrently and write their merged report to the result file."""
+        os.makedirs(SHARDS_DIR, exist_ok=True)
+        try:
+            outcomes = []
+            if plans:
+                with ThreadPoolExecutor(max_workers=min(self.jobs, len(plans))) as pool:
+                    outcomes = list(pool.map(lambda plan: self._run_plan(plan, inventory, cwd), plans))
+        finally:
+            shutil.rmtree(SHARDS_DIR, ignore_errors=True)
+
+        unit_results, report_meta, check_type_order = {}, {}, []
+        for code, results, meta in outcomes:
+            if code not in (0, 1):
+                return code
+            merge_unit_results(unit_results, results)
+            for check_type, values in meta.items():
+                report_meta.setdefault(check_type, values)
+                if check_type not in check_type_order:
+                    check_type_order.append(check_type)
+
+        output = build_checkov_output(unit_results, report_meta, check_type_order, quiet=True)
+        write_json_atomic(self.result_file, output, indent=2)
+        return 1 if any(
+            report.get("results", {}).get("failed_checks")
+            for report in (output if isinstance(output, list) else [output])
+        ) else 0
+
+    def _single_target(self, mode):
         args = shlex.split(self.command)
+        directories = [args[i + 1] for i, arg in enumerate(args[:-1]) if arg in ("-d", "--directory")]
+        if len(directories) != 1 or any(arg in ("-f", "--file") for arg in args):
+            Logger.get_logger().warning(f"{mode} IaC mode needs exactly one -d target and no -f; running a full scan.")
+            return None
+        target = os.path.realpath(directories[0])
+        cwd = os.path.realpath(os.getcwd())
+        if not os.path.isdir(target):
+            return None
+        if self.container_mode and target != cwd and not target.startswith(cwd + os.sep):
+            Logger.get_logger().warning(f"{mode} IaC mode in a container needs a target inside the working directory; running a full scan.")
+            return None
+        return target
+
+    @staticmethod
+    def _strip_target_args(args):
+        stripped = []
+        i = 0
+        while i < len(args):
+            if args[i] in ("-d", "--directory", "-o", "--output", "--output-file-path"):
+                i += 2
+                continue
+            if args[i] == "--quiet":
+                i += 1
+                continue
+            stripped.append(args[i])
+            i += 1
+        return stripped
+
+    def _scanner_identity(self):
+        if self.container_mode:
+            return self.ak_iac_image
+        try:
+            tool_path = ToolManager.get_path("iac")
+            return f"{tool_path}:{os.stat(tool_path).st_mtime_ns}"
+        except Exception:
+            return "iac"
+
+    def _incremental_plans(self, inventory, changed, base_args, cwd, output_root=INCREMENTAL_DIR):
+        """One Checkov run per changed directory unit plus chunked -f runs for changed files."""
+        plans = []
+        changed_files = []
+        for unit_id in changed:
+            unit = inventory.units[unit_id]
+            if unit.is_directory:
+                plans.append((["-d", os.path.relpath(unit.path, cwd)], unit.path, {unit_id}))
+            else:
+                changed_files.append(unit)
+
+        if changed_files:
+            chunk_size = max(1, min(MAX_FILES_PER_RUN, -(-len(changed_files) // self.jobs)))
+            for start in range(0, len(changed_files), chunk_size):
+                chunk = changed_files[start:start + chunk_size]
+                file_args = []
+                for unit in chunk:
+                    file_args.extend(["-f", os.path.relpath(unit.path, cwd)])
+                plans.append((file_args, cwd, {unit.unit_id for unit in chunk}))
+
+        return [
+            (self._build_iac_args(
+                raw_args=[*base_args, *target_args], quiet=False,
+                output_dir=os.path.join(output_root, str(index)),
+            ), scan_root, keep_units)
+            for index, (target_args, scan_root, keep_units) in enumerate(plans)
+        ]
+
+    def _run_plan(self, plan, inventory, cwd):
+        args, scan_root, keep_units = plan
+        output_dir = args[args.index("--output-file-path") + 1]
+        result = self._run_checkov(args, label=output_dir)
+        self._fix_file_permissions_if_docker(output_dir)
+        data = read_json(os.path.join(output_dir, os.path.basename(self.result_file)))
+        if result.returncode not in (0, 1):
+            return result.returncode, {}, {}
+        if data is None:
+            return config.SOMETHING_WENT_WRONG_RETURN_CODE, {}, {}
+        unit_results, report_meta = split_reports_by_unit(
+            data, inventory, scan_root, cwd, self.container_mode, keep_units,
+        )
+        return result.returncode, unit_results, report_meta
+
+    def _build_iac_args(self, raw_args=None, quiet=True, output_dir=None):
+        """
+        Sanitize the raw command and enforce output flags.
+        """
+        args = shlex.split(self.command) if raw_args is None else list(raw_args)
         # Remove conflicting output flags if present
         forbidden_flags = {"-o", "--output-file-path"}
         sanitized_args = []
@@ -90,9 +360,13 @@ class IaCScanner:
 
         sanitized_args.extend([
             "-o", self.output_format,
-            "--output-file-path", self.output_file_path,
-            "--quiet"
+            "--output-file-path", output_dir or self.output_file_path,
         ])
+        # Incremental runs keep passed checks so cached units rebuild the full summary.
+        if quiet and "--quiet" not in sanitized_args:
+            sanitized_args.append("--quiet")
+        elif not quiet:
+            sanitized_args = [arg for arg in sanitized_args if arg != "--quiet"]
 
         return sanitized_args
 
@@ -105,14 +379,14 @@ class IaCScanner:
         cmd.extend(args)
         return cmd
 
-    def _fix_file_permissions_if_docker(self):
+    def _fix_file_permissions_if_docker(self, path=None):
         if self.container_mode:
             try:
                 chmod_cmd = [
                     *build_docker_run_prefix(workdir="/workdir"),
                     "--entrypoint", "bash",
                     self.ak_iac_image,
-                    "-c", f"chmod 777 {self.result_file}"
+                    "-c", f"chmod -R 777 {shlex.quote(path)}" if path else f"chmod 777 {self.result_file}"
                 ]
                 subprocess.run(chmod_cmd, capture_output=True, text=True)
             except Exception as e:
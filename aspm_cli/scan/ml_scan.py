@@ -1,26 +1,31 @@
-import json
 import os
 import shlex
+import shutil
 import subprocess
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from aspm_cli.tool.manager import ToolManager
 from aspm_cli.utils import config, docker_pull
+from aspm_cli.utils.docker_pull import docker_image_id
 from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.model_discovery import MODEL_EXTENSIONS, discover_model_files, model_stage_extension
+from aspm_cli.utils.ml_cache import MLScanCache, from_cache_entry, to_cache_entry
 from aspm_cli.utils.ml_scan import (
     build_model_path,
-    build_ondemand_modelscan_payload,
-    count_issues,
+    ModelScanPayloadWriter,
     derive_model_metadata,
-    discover_model_files,
     load_modelscan_output,
     merge_modelscan_result,
     normalize_modelscan_cli_args,
     parse_scan_path_from_command,
+    split_modelscan_output,
+    stage_file,
 )
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix
 from aspm_cli.utils.path_safety import resolve_path_within_root
-from aspm_cli.utils.subprocess_utils import run_scan_subprocess
+from aspm_cli.utils.sharding import select_shard
+from aspm_cli.utils.subprocess_utils import default_job_count, run_scan_subprocess
 from colorama import Fore
 
 DEFAULT_ML_SCAN_IMAGE = (
@@ -65,7 +70,21 @@ class MLScanScanner:
         commit_ref=None,
         model_name=None,
         source_type="github",
+        jobs=None,
+        batch_size=1,
+        no_cache=False,
+        resume=False,
+        shard=None,
     ):
+        """
+        :param jobs: Maximum modelscan runs at once (default: CPU count)
+        :param batch_size: Model files passed to one modelscan run (container start-up
+                           is paid once per batch instead of once per file)
+        :param no_cache: Skip the content-addressed result cache (always re-scan every file)
+        :param resume: Keep results already streamed to the result file by an interrupted
+                       run and scan only the remaining model files
+        :param shard: (i, N) to scan only slice i of N of the discovered model files
+        """
         self.command = command
         self.container_mode = container_mode
         self.scan_image = os.getenv("SCAN_IMAGE", default_ml_scan_image())
@@ -74,6 +93,12 @@ class MLScanScanner:
         self.model_name = model_name
         self.source_type = source_type or "github"
         self.cwd = os.getcwd()
+        self.jobs = jobs or default_job_count()
+        self.batch_size = max(1, batch_size or 1)
+        self.no_cache = no_cache
+        self.resume = resume
+        self.shard = shard
+        self._digests = {}
 
     def run(self):
         temp_files = []
@@ -97,96 +122,59 @@ class MLScanScanner:
                 Logger.get_logger().error(str(exc))
                 return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
 
-            model_files = discover_model_files(scan_root, cwd=self.cwd)
+            model_files = discover_model_files(scan_root, cwd=self.cwd, jobs=self.jobs)
 
             if not model_files:
                 Logger.get_logger().info(
                     "No model files found to scan. "
-                    f"Looked under '{scan_root}' for extensions: .pkl, .pt, .pth, .h5, .keras, .pb, .ckpt, .npy"
+                    f"Looked under '{scan_root}' for extensions: {', '.join(sorted(MODEL_EXTENSIONS))} "
+                    "and for pickle/HDF5/PyTorch/SavedModel headers in .bin, .dat, .safetensors and extensionless files"
                 )
-                self._write_payload([], scan_root)
+                with ModelScanPayloadWriter(self.result_file, self._metadata()):
+                    pass
                 return config.PASS_RETURN_CODE, self.result_file
 
-            metadata = derive_model_metadata(
-                self.repo_url,
-                self.commit_ref,
-                model_name=self.model_name,
-                source_type=self.source_type,
-            )
-            os.makedirs(TEMP_SCAN_DIR, exist_ok=True)
-
-            modelscan_results = []
-            scan_failures = 0
-
-            for index, model_file in enumerate(model_files, start=1):
-                rel_model_file = os.path.relpath(model_file, self.cwd)
+            if self.shard:
+                by_key = {os.path.relpath(f, self.cwd).replace(os.sep, "/"): f for f in model_files}
+                selected = set(select_shard(by_key, self.shard))
                 Logger.get_logger().info(
-                    f"Scanning model file {index}/{len(model_files)}: {rel_model_file}"
-                )
-                temp_output = os.path.join(
-                    TEMP_SCAN_DIR,
-                    f"{uuid.uuid4().hex}.json",
+                    f"ML shard {self.shard[0]}/{self.shard[1]}: {len(selected)} of {len(model_files)} model file(s)."
                 )
-                temp_files.append(temp_output)
-                scan_args = normalize_modelscan_cli_args(
-                    f"scan -p {shlex.quote(rel_model_file)} -r json",
-                    temp_output,
-                )
-                cmd = self._build_scan_command(scan_args, rel_model_file)
-
-                Logger.get_logger().debug(f"Running ML scan: {' '.join(cmd)}")
-                result = run_scan_subprocess(cmd)
+                model_files = [f for key, f in by_key.items() if key in selected]
 
-                if result.stdout:
-                    Logger.get_logger().debug(
-                        result.stdout.replace("modelscan", "[scanner]")
-                    )
-                if result.stderr:
-                    Logger.get_logger().error(
-                        result.stderr.replace("modelscan", "[scanner]")
-                    )
+            metadata = self._metadata()
+            os.makedirs(TEMP_SCAN_DIR, exist_ok=True)
 
-                # ModelScan exits 0 (clean) or 1 (issues found), same as Checkov/Trivy.
-                # Other codes are runtime errors even if a partial output file exists.
-                if not os.path.exists(temp_output):
-                    scan_failures += 1
-                    Logger.get_logger().error(
-                        f"ModelScan failed for {rel_model_file} "
-                        f"(exit {result.returncode}, no output file)"
+            with ModelScanPayloadWriter(self.result_file, metadata, resume=self.resume) as writer:
+                model_paths = {
+                    model_file: build_model_path(
+                        metadata["model_id"],
+                        metadata["commit_ref"],
+                        model_file,
+                        scan_root,
+                        cwd=self.cwd,
                     )
-                    continue
-
-                if result.returncode not in (0, 1):
-                    scan_failures += 1
-                    Logger.get_logger().error(
-                        f"ModelScan failed for {rel_model_file} (exit {result.returncode})"
+                    for model_file in model_files
+                }
+                if writer.completed:
+                    model_files = [f for f in model_files if model_paths[f] not in writer.completed]
+                    Logger.get_logger().info(
+                        f"Resuming ML scan: {writer.result_count} model file(s) already in {self.result_file}, "
+                        f"{len(model_files)} remaining."
                     )
-                    continue
+                scan_failures = self._scan_into(writer, model_files, model_paths, temp_files)
 
-                raw = load_modelscan_output(temp_output)
-                model_path = build_model_path(
-                    metadata["model_id"],
-                    metadata["commit_ref"],
-                    model_file,
-                    scan_root,
-                    cwd=self.cwd,
-                )
-                modelscan_results.append(merge_modelscan_result(raw, model_path))
-
-            self._write_payload(modelscan_results, scan_root, metadata)
-
-            if scan_failures and not modelscan_results:
+            if scan_failures and not writer.result_count:
                 return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
 
-            issue_count = count_issues(modelscan_results)
-            if issue_count > 0:
+            if writer.issue_count > 0:
                 Logger.get_logger().error(
-                    f"ModelScan found {issue_count} issue(s) across {len(modelscan_results)} model file(s)."
+                    f"ModelScan found {writer.issue_count} issue(s) across {writer.result_count} model file(s)."
                 )
                 return 1, self.result_file
 
             Logger.get_logger().info(
-                f"ModelScan completed for {len(modelscan_results)} model file(s) with no issues."
+                f"ModelScan completed for {writer.result_count} model file(s) with no issues."
             )
             return 0, self.result_file
         except subprocess.TimeoutExpired:
@@ -198,21 +186,250 @@ class MLScanScanner:
         finally:
             for temp_file in temp_files:
                 try:
-                    if os.path.exists(temp_file):
+                    if os.path.isdir(temp_file):
+                        shutil.rmtree(temp_file, ignore_errors=True)
+                    elif os.path.exists(temp_file):
                         os.remove(temp_file)
                 except OSError:
                     pass
 
-    def _write_payload(self, modelscan_results, scan_root, metadata=None):
-        metadata = metadata or derive_model_metadata(
+    def _scan_into(self, writer, model_files, model_paths, temp_files):
+        """
+        Scan model_files and stream each result to writer in discovery order.
+        Returns the number of files that could not be scanned.
+        """
+        cache = None if self.no_cache else MLScanCache(self._scanner_identity())
+        reports = {}
+        cached = set()
+        duplicate_of = {}
+        to_scan = model_files
+        if cache is not None and model_files:
+            to_scan = self._resolve_cached(cache, model_files, cached, duplicate_of)
+        # Representatives whose report is reused by identical files later in the list.
+        keep = set(duplicate_of.values())
+
+        total = len(to_scan)
+        indexed_files = list(enumerate(to_scan, start=1))
+        batches = [
+            indexed_files[start:start + self.batch_size]
+            for start in range(0, total, self.batch_size)
+        ]
+        workers = max(1, min(self.jobs, len(batches) or 1))
+        if workers > 1 or len(batches) < total:
+            Logger.get_logger().info(
+                f"Scanning {total} model file(s) in {len(batches)} run(s) with {workers} worker(s)."
+            )
+
+        scan_failures = 0
+        pending = set(to_scan)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() yields batches in submission (discovery) order as they finish,
+            # so results are written in a deterministic order while later batches still run.
+            batch_results = zip(batches, pool.map(
+                lambda batch: self._scan_model_batch(batch, total, temp_files),
+                batches,
+            ))
+            for model_file in model_files:
+                while model_file in pending:
+                    batch, batch_reports = next(batch_results)
+                    for (_, scanned_file), raw in zip(batch, batch_reports):
+                        pending.discard(scanned_file)
+                        reports[scanned_file] = raw
+                        if cache is not None and raw is not None:
+                            cache.put(
+                                self._digests[scanned_file],
+                                to_cache_entry(raw, self._report_paths(scanned_file)[0]),
+                            )
+
+                if model_file in cached:
+                    # Read when its turn comes: cache hits are streamed, never all held in memory.
+                    entry = cache.get(self._digests[model_file])
+                    raw = from_cache_entry(entry, *self._report_paths(model_file)) if entry is not None else None
+                else:
+                    raw = reports.get(model_file)
+                    source_file = duplicate_of.get(model_file)
+                    if raw is None and source_file and reports.get(source_file) is not None:
+                        raw = from_cache_entry(
+                            to_cache_entry(reports[source_file], self._report_paths(source_file)[0]),
+                            *self._report_paths(model_file),
+                        )
+                    if model_file not in keep:
+                        reports.pop(model_file, None)
+                if raw is None:
+                    scan_failures += 1
+                    continue
+                writer.write(merge_modelscan_result(raw, model_paths[model_file]))
+
+        if cache is not None:
+            cache.save()
+        return scan_failures
+
+    def _resolve_cached(self, cache, model_files, cached, duplicate_of):
+        """
+        Add the files with a cached report to `cached` and map identical files onto
+        one representative. Returns the files that still need a modelscan run.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(model_files)))) as pool:
+            self._digests = dict(zip(model_files, pool.map(cache.digest, model_files)))
+
+        to_scan = []
+        first_with_digest = {}
+        for model_file in model_files:
+            digest = self._digests[model_file]
+            if cache.has(digest):
+                cached.add(model_file)
+            elif digest in first_with_digest:
+                duplicate_of[model_file] = first_with_digest[digest]
+            else:
+                first_with_digest[digest] = model_file
+                to_scan.append(model_file)
+
+        Logger.get_logger().info(
+            f"ModelScan cache: {len(cached)} hit(s), {len(duplicate_of)} duplicate file(s), "
+            f"{len(to_scan)} file(s) to scan."
+        )
+        return to_scan
+
+    def _scanner_identity(self) -> str:
+        """Cache identity of the scanner: image ID in container mode, binary path and stat locally."""
+        if self.container_mode:
+            return docker_image_id(self.scan_image) or self.scan_image
+        binary = self._resolve_local_binary()
+        resolved = shutil.which(binary) or binary
+        try:
+            stat = os.stat(resolved)
+            return f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            return resolved
+
+    def _report_paths(self, model_file):
+        """(input_path, absolute_path) that a single-file modelscan run reports for model_file."""
+        rel_model_file = os.path.relpath(model_file, self.cwd)
+        if self.container_mode:
+            docker_path = self._docker_path(rel_model_file)
+            return docker_path, docker_path
+        return rel_model_file, os.path.abspath(model_file)
+
+    def _scan_model_batch(self, batch, total, temp_files):
+        """
+        Scan several model files with one modelscan run over a staging directory
+        of links, then split the report back into per-file results. Falls back
+        to per-file runs if the batch run fails.
+        """
+        if len(batch) == 1:
+            index, model_file = batch[0]
+            return [self._scan_model_file(index, total, model_file, temp_files)]
+
+        first, last = batch[0][0], batch[-1][0]
+        batch_dir = os.path.join(TEMP_SCAN_DIR, f"batch-{uuid.uuid4().hex}")
+        temp_output = os.path.join(TEMP_SCAN_DIR, f"{uuid.uuid4().hex}.json")
+        temp_files.extend([batch_dir, temp_output])
+        os.makedirs(batch_dir)
+
+        targets = {}
+        staged = []
+        for index, model_file in batch:
+            # Unique names with an extension modelscan recognises (it picks scanners by extension).
+            token = f"{index:06d}-{os.path.basename(model_file)}{model_stage_extension(model_file) or ''}"
+            stage_file(model_file, os.path.join(batch_dir, token))
+            targets[token] = self._report_paths(model_file)
+            staged.append(token)
+
+        Logger.get_logger().info(
+            f"Scanning model files {first}-{last}/{total} in one run ({len(batch)} files)"
+        )
+        scan_args = normalize_modelscan_cli_args(
+            f"scan -p {shlex.quote(batch_dir)} -r json",
+            temp_output,
+        )
+        cmd = self._build_scan_command(scan_args, batch_dir)
+        Logger.get_logger().debug(f"Running ML scan: {' '.join(cmd)}")
+        result = run_scan_subprocess(cmd)
+
+        if result.stdout:
+            Logger.get_logger().debug(result.stdout.replace("modelscan", "[scanner]"))
+        if result.stderr:
+            Logger.get_logger().debug(result.stderr.replace("modelscan", "[scanner]"))
+
+        if not os.path.exists(temp_output) or result.returncode not in (0, 1):
+            Logger.get_logger().warning(
+                f"ModelScan batch {first}-{last} failed (exit {result.returncode}); "
+                "scanning its files one by one."
+            )
+            return [
+                self._scan_model_file(index, total, model_file, temp_files)
+                for index, model_file in batch
+            ]
+
+        per_file = split_modelscan_output(load_modelscan_output(temp_output), targets)
+        Logger.get_logger().debug(f"Finished model files {first}-{last}/{total}")
+        return [per_file[token] for token in staged]
+
+    def _scan_model_file(self, index, total, model_file, temp_files):
+        """Run modelscan on one file; returns its report or None on failure."""
+        rel_model_file = os.path.relpath(model_file, self.cwd)
+        Logger.get_logger().info(
+            f"Scanning model file {index}/{total}: {rel_model_file}"
+        )
+        temp_output = os.path.join(
+            TEMP_SCAN_DIR,
+            f"{uuid.uuid4().hex}.json",
+        )
+        temp_files.append(temp_output)
+        scan_path = rel_model_file
+        stage_extension = model_stage_extension(model_file)
+        if stage_extension:
+            # Renamed/extensionless models: expose them under the extension of the sniffed format.
+            scan_path = os.path.join(TEMP_SCAN_DIR, f"{uuid.uuid4().hex}-{os.path.basename(model_file)}{stage_extension}")
+            stage_file(model_file, scan_path)
+            temp_files.append(scan_path)
+        scan_args = normalize_modelscan_cli_args(
+            f"scan -p {shlex.quote(scan_path)} -r json",
+            temp_output,
+        )
+        cmd = self._build_scan_command(scan_args, scan_path)
+
+        Logger.get_logger().debug(f"Running ML scan: {' '.join(cmd)}")
+        result = run_scan_subprocess(cmd)
+
+        if result.stdout:
+            Logger.get_logger().debug(
+                result.stdout.replace("modelscan", "[scanner]")
+            )
+        if result.stderr:
+            Logger.get_logger().error(
+                result.stderr.replace("modelscan", "[scanner]")
+            )
+
+        # ModelScan exits 0 (clean) or 1 (issues found), same as Checkov/Trivy.
+        # Other codes are runtime errors even if a partial output file exists.
+        if not os.path.exists(temp_output):
+            Logger.get_logger().error(
+                f"ModelScan failed for {rel_model_file} "
+                f"(exit {result.returncode}, no output file)"
+            )
+            return None
+
+        if result.returncode not in (0, 1):
+            Logger.get_logger().error(
+                f"ModelScan failed for {rel_model_file} (exit {result.returncode})"
+            )
+            return None
+
+        Logger.get_logger().debug(f"Finished model file {index}/{total}: {rel_model_file}")
+        raw = load_modelscan_output(temp_output)
+        if stage_extension:
+            token = os.path.basename(scan_path)
+            raw = split_modelscan_output(raw, {token: self._report_paths(model_file)})[token]
+        return raw
+
+    def _metadata(self):
+        return derive_model_metadata(
             self.repo_url,
             self.commit_ref,
             model_name=self.model_name,
             source_type=self.source_type,
         )
-        payload = build_ondemand_modelscan_payload(modelscan_results, metadata)
-        with open(self.result_file, "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
 
     def _resolve_local_binary(self) -> str:
         try:
@@ -8,19 +8,24 @@ from aspm_cli.tool.manager import ToolManager
 from aspm_cli.utils import docker_pull
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix, docker_volume_mount
 from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.result_merge import merge_opengrep_reports
+from aspm_cli.utils.sharding import chunk_paths, list_files, select_shard
 from colorama import Fore
 from aspm_cli.utils import config
 from urllib.parse import urlparse
 import re
 
+OPENGREP_IMAGE = "public.ecr.aws/k9v9d5v2/accuknox/opengrepjob:0.1.0"
+CODEASSURE_IMAGE = "public.ecr.aws/k9v9d5v2/accuknox/ai-sast-codeassure-cli:0.1.1"
+
+
 class SASTScanner:
-    opengrep_image = os.getenv("SCAN_IMAGE", "public.ecr.aws/k9v9d5v2/accuknox/opengrepjob:0.1.0")
-    codeassure_image = os.getenv("CODEASSURE_IMAGE", "public.ecr.aws/k9v9d5v2/accuknox/ai-sast-codeassure-cli:0.1.1")
     result_file = "results.json"
 
     def __init__(self, command=None, container_mode=True, severity = None,
                  repo_url=None, commit_ref=None, commit_sha=None,
-                 pipeline_id=None, job_url=None, ai_analysis=True, codeassure_config=None,aiscan_severity=None):
+                 pipeline_id=None, job_url=None, ai_analysis=True, codeassure_config=None,aiscan_severity=None,
+                 shard=None):
         """
         :param command: Raw OpenGrep CLI args (string)
         :param container_mode: Run in Docker if True, else use local binary
@@ -30,7 +35,10 @@ class SASTScanner:
         :param pipeline_id: CI pipeline ID
         :param job_url: CI job URL
         :param ai_analysis: Enable AI analysis of results
+        :param shard: (i, N) to scan only slice i of N of the target files
         """
+        self.opengrep_image = os.getenv("SCAN_IMAGE", OPENGREP_IMAGE)
+        self.codeassure_image = os.getenv("CODEASSURE_IMAGE", CODEASSURE_IMAGE)
         self.command = command
         self.container_mode = container_mode
         self.severity = [
@@ -45,6 +53,7 @@ class SASTScanner:
         self.job_url = job_url
         self.ai_analysis = ai_analysis
         self.codeassure_config = codeassure_config
+        self.shard = shard
 
     def run(self):
         try:
@@ -53,27 +62,31 @@ class SASTScanner:
             if self.container_mode:
                 docker_pull(self.opengrep_image)
 
-            args = self._build_sast_args()
-            cmd = self._build_sast_command(args)
+            if self.shard and "--help" not in (self.command or ""):
+                if not self._scan_shard():
+                    return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+            else:
+                args = self._build_sast_args()
+                cmd = self._build_sast_command(args)
 
-            Logger.get_logger().debug(f"Running SAST scan: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+                Logger.get_logger().debug(f"Running SAST scan: {' '.join(cmd)}")
+                result = subprocess.run(cmd, capture_output=True, text=True, check=False)
 
-            # Log outputs
-            if result.stdout:
-                sanitized_stdout = re.sub(r"opengrep", "[scanner]", result.stdout, flags=re.IGNORECASE)
-                Logger.get_logger().debug(sanitized_stdout)
-                if "--help" in (self.command or ""):
-                    Logger.log_with_color("INFO", sanitized_stdout, Fore.WHITE)
-                    return config.PASS_RETURN_CODE, None
+                # Log outputs
+                if result.stdout:
+                    sanitized_stdout = re.sub(r"opengrep", "[scanner]", result.stdout, flags=re.IGNORECASE)
+                    Logger.get_logger().debug(sanitized_stdout)
+                    if "--help" in (self.command or ""):
+                        Logger.log_with_color("INFO", sanitized_stdout, Fore.WHITE)
+                        return config.PASS_RETURN_CODE, None
 
-            if result.stderr:
-                sanitized_stderr = re.sub(r"opengrep", "[scanner]", result.stderr, flags=re.IGNORECASE)
-                if "--help" in (self.command or "") and result.returncode == 0:
-                    Logger.log_with_color("INFO", sanitized_stderr, Fore.WHITE)
-                    return config.PASS_RETURN_CODE, None
-                else:
-                    Logger.get_logger().error(sanitized_stderr)
+                if result.stderr:
+                    sanitized_stderr = re.sub(r"opengrep", "[scanner]", result.stderr, flags=re.IGNORECASE)
+                    if "--help" in (self.command or "") and result.returncode == 0:
+                        Logger.log_with_color("INFO", sanitized_stderr, Fore.WHITE)
+                        return config.PASS_RETURN_CODE, None
+                    else:
+                        Logger.get_logger().error(sanitized_stderr)
 
 
             if os.path.exists(self.result_file) and os.stat(self.result_file).st_size > 0:
@@ -102,6 +115,38 @@ class SASTScanner:
             raise
 
 
+    def _scan_shard(self):
+        """
+        Scan this node's slice of the target files into the result file, in runs
+        small enough for the command line. Returns False if a run failed.
+        """
+        args = self._build_sast_args()
+        output_end = args.index("--output") + 2
+        options, targets = args[:output_end], args[output_end:]
+        files = list_files(targets)
+        selected = select_shard(files, self.shard)
+        Logger.get_logger().info(f"SAST shard {self.shard[0]}/{self.shard[1]}: {len(selected)} of {len(files)} file(s).")
+
+        reports = []
+        for chunk in chunk_paths(selected):
+            if os.path.exists(self.result_file):
+                os.remove(self.result_file)
+            cmd = self._build_sast_command([*options, *chunk])
+            Logger.get_logger().debug(f"Running SAST scan of {len(chunk)} file(s): {' '.join(cmd[:len(cmd) - len(chunk)])} ...")
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+            if result.stderr:
+                Logger.get_logger().error(re.sub(r"opengrep", "[scanner]", result.stderr, flags=re.IGNORECASE))
+            if not os.path.exists(self.result_file) or os.stat(self.result_file).st_size == 0:
+                return False
+            self._fix_file_permissions_if_docker()
+            with open(self.result_file, "r") as f:
+                reports.append(json.load(f))
+
+        merged = merge_opengrep_reports(reports) if reports else {"results": [], "errors": [], "paths": {"scanned": []}}
+        with open(self.result_file, "w") as f:
+            json.dump(merged, f, indent=2)
+        return True
+
     def _run_ai_analysis(self):
         """
         Runs AI analysis on the results. If any error occurs, the original results are preserved.
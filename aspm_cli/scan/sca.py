@@ -1,4 +1,10 @@
-from aspm_cli.scan.trivy_runner import run_trivy_vuln_scan, validate_sca_command
+import os
+
+from aspm_cli.scan.trivy_runner import run_sharded_sca_scan, run_trivy_vuln_scan, validate_sca_command
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.project_shards import find_sca_project_roots, plan_shards
+from aspm_cli.utils.sbom import FILESYSTEM_SUBCOMMANDS, parse_trivy_subcommand, scan_target_from_command
+from aspm_cli.utils.subprocess_utils import default_job_count
 
 
 class SCAScanner:
@@ -11,14 +17,36 @@ class SCAScanner:
         severity=None,
         repo_url=None,
         repo_branch=None,
+        shard_projects=False,
+        jobs=None,
     ):
+        """
+        :param shard_projects: Scan each detected sub-project (package.json, go.mod, pom.xml, ...)
+                               with its own Trivy run and merge the reports
+        :param jobs: Maximum concurrent Trivy runs when sharding (default: CPU count)
+        """
         self.command = command
         self.container_mode = container_mode
         self.severity = severity
         self.repo_url = repo_url
         self.repo_branch = repo_branch
+        self.shard_projects = shard_projects
+        self.jobs = jobs or default_job_count()
 
     def run(self):
+        shards = self._project_shards() if self.shard_projects and "--help" not in self.command else None
+        if shards:
+            Logger.get_logger().info(f"Scanning {len(shards)} project shard(s) with up to {self.jobs} concurrent run(s).")
+            return run_sharded_sca_scan(
+                self.command,
+                self.container_mode,
+                shards,
+                self.result_file,
+                cli_severity=self.severity,
+                repo_url=self.repo_url,
+                repo_branch=self.repo_branch,
+                jobs=self.jobs,
+            )
         return run_trivy_vuln_scan(
             self.command,
             self.container_mode,
@@ -29,3 +57,27 @@ class SCAScanner:
             repo_url=self.repo_url,
             repo_branch=self.repo_branch,
         )
+
+    def _project_shards(self):
+        """Shards (relative to the working directory) of the fs target, or None to scan it whole."""
+        validate_sca_command(self.command)
+        target = scan_target_from_command(self.command)
+        if parse_trivy_subcommand(self.command) not in FILESYSTEM_SUBCOMMANDS or not target or target.startswith("-"):
+            Logger.get_logger().warning("Project sharding needs a 'fs <directory>' command; running a single scan.")
+            return None
+        target = os.path.realpath(target)
+        cwd = os.path.realpath(os.getcwd())
+        if not os.path.isdir(target):
+            return None
+        if self.container_mode and target != cwd and not target.startswith(cwd + os.sep):
+            Logger.get_logger().warning("Project sharding in a container needs a target inside the working directory; running a single scan.")
+            return None
+
+        roots = find_sca_project_roots(target)
+        if not roots:
+            Logger.get_logger().info("No sub-projects detected; running a single scan.")
+            return None
+        return [
+            (os.path.relpath(directory, cwd), [os.path.relpath(path, cwd) for path in nested])
+            for directory, nested in plan_shards(target, roots)
+        ]
@@ -1,22 +1,170 @@
+import json
 import os
 import shlex
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 from aspm_cli.tool.manager import ToolManager
 from aspm_cli.utils import config, docker_pull
+from aspm_cli.utils.cache import write_json_atomic
 from aspm_cli.utils.docker_runtime import build_docker_run_prefix
+from aspm_cli.utils.git_info import GitInfo
 from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.secret_results import (
+    collapse_findings,
+    dedupe_trufflehog_findings,
+    gitleaks_finding_key,
+    gitleaks_finding_location,
+    gitleaks_findings,
+    is_sarif,
+    load_baseline,
+    load_json_report,
+    load_jsonl,
+    merge_gitleaks_reports,
+    normalize_secret_finding,
+    overlap_key,
+    parse_trufflehog_output,
+    replace_gitleaks_findings,
+    secret_fingerprint,
+    trufflehog_finding_key,
+    update_baseline,
+    write_jsonl,
+)
+from aspm_cli.utils.secret_state import SecretWatermark
+from aspm_cli.utils.sharding import chunk_paths, list_files, select_shard
+from aspm_cli.utils.staged import StagedSnapshot
+from aspm_cli.utils.subprocess_utils import default_job_count, run_scan_subprocess
 from colorama import Fore
 
 TRUFFLEHOG_IMAGE = "public.ecr.aws/k9v9d5v2/trufflesecurity/trufflehog:3.90.3"
 GITLEAKS_IMAGE = "ghcr.io/gitleaks/gitleaks:v8.24.2"
 
+# Exit codes that mean "scan completed" (with or without findings). Gitleaks also
+# exits 1 on fatal errors, so it runs with a dedicated --exit-code; SecretScanner.run
+# maps that back to the user's --exit-code (Gitleaks' default: 1).
+TRUFFLEHOG_FOUND_RETURN_CODE = 183
+GITLEAKS_FOUND_RETURN_CODE = 42
+GITLEAKS_DEFAULT_EXIT_CODE = 1
+GITLEAKS_SCAN_COMMANDS = ("detect", "protect", "git", "dir", "stdin")
+
+SHARD_DIR = ".accuknox-secret-shards"
+STAGED_CONTAINER_ROOT = "/app"
+# Written inside the staged snapshot after the scan, so it is never scanned itself.
+STAGED_GITLEAKS_REPORT = ".accuknox-gitleaks-report.json"
+RANGE_FLAGS = ("--since-commit", "--branch", "--log-opts")
+# Report options added to a Gitleaks command derived for --engine both.
+GITLEAKS_REPORT_ARGS = ["--report-format", "sarif", "--report-path", "results.json", "--no-banner"]
+
+
+def split_commit_ranges(commits, shards, base=None):
+    """
+    Split an oldest-first first-parent commit list into at most `shards`
+    contiguous (since, until) ranges. `since` is exclusive (None = root).
+    Merge commits pull their side branches into the range that contains them.
+    """
+    if not commits:
+        return []
+    shards = max(1, min(shards, len(commits)))
+    ranges = []
+    since = base
+    for k in range(1, shards + 1):
+        until = commits[round(k * len(commits) / shards) - 1]
+        if until == since:
+            continue
+        ranges.append((since, until))
+        since = until
+    return ranges
+
+
+def _strip_flags(args, flags):
+    sanitized = []
+    i = 0
+    while i < len(args):
+        if args[i] in flags:
+            i += 2
+            continue
+        if any(args[i].startswith(f"{flag}=") for flag in flags):
+            i += 1
+            continue
+        sanitized.append(args[i])
+        i += 1
+    return sanitized
+
+
+def derive_gitleaks_command(command):
+    """
+    Gitleaks command scanning the same target as a TruffleHog command, for --engine both:
+    'filesystem <path>' -> 'dir <path>', 'git file://<path>' -> 'git <path>'.
+    Raises ValueError for other sources.
+    """
+    args = shlex.split(command or "")
+    positional = [arg for arg in args if not arg.startswith("-")]
+    if positional[:1] == ["filesystem"]:
+        position = args.index("filesystem") + 1
+        paths = []
+        while position < len(args) and not args[position].startswith("-"):
+            paths.append(args[position])
+            position += 1
+        if len(paths) == 1:
+            return shlex.join(["dir", paths[0], *GITLEAKS_REPORT_ARGS])
+    elif positional[:1] == ["git"] and len(positional) > 1 and positional[1].startswith("file://"):
+        return shlex.join(["git", positional[1][len("file://"):] or ".", *GITLEAKS_REPORT_ARGS])
+    raise ValueError(
+        "--engine both derives the Gitleaks command from TruffleHog 'filesystem <path>' or "
+        "'git file://<path>'; pass --gitleaks-command for other sources."
+    )
+
+
+def _flag_value(args, flags, default=None):
+    for i, arg in enumerate(args):
+        if arg in flags and i + 1 < len(args):
+            return args[i + 1]
+        for flag in flags:
+            if arg.startswith(f"{flag}="):
+                return arg.split("=", 1)[1]
+    return default
+
 
 class SecretScanner:
-    def __init__(self, command, container_mode=False, engine="trufflehog"):
+    def __init__(self, command, container_mode=False, engine="trufflehog",
+                 incremental=False, repo_url=None, repo_branch=None, shards=1, jobs=None, staged=False,
+                 shard=None, dedupe=False, baseline=None, update_baseline=False, gitleaks_command=None):
+        """
+        :param incremental: Scan only commits after the last recorded watermark
+                            (git history scans only) and merge with stored findings
+        :param repo_url: Repository identity for the incremental state
+        :param repo_branch: Branch identity for the incremental state
+        :param shards: Split the git history into this many commit ranges
+        :param jobs: Maximum shards scanned concurrently (default: CPU count)
+        :param staged: Scan only the files staged for commit (pre-commit hook); findings
+                       are printed and no result file is written
+        :param shard: (i, N) to scan only slice i of N of the files (TruffleHog filesystem scans)
+        :param dedupe: Collapse findings of the same secret in the same file into one, with an
+                       occurrence count
+        :param baseline: Baseline file; findings whose fingerprint it lists are dropped before upload
+        :param update_baseline: Add this scan's findings to the baseline file first
+        :param gitleaks_command: Gitleaks command for engine "both" (default: derived from command)
+        """
         self.command = command
         self.container_mode = container_mode
         self.engine = engine.lower()
+        self.incremental = incremental
+        self.shards = max(1, shards or 1)
+        self.jobs = jobs or default_job_count()
+        self.repo_url = repo_url
+        self.repo_branch = repo_branch
+        self.staged = staged
+        self.shard = shard
+        self.dedupe = dedupe
+        self.baseline = baseline
+        self.update_baseline = update_baseline
+        self.gitleaks_command = gitleaks_command
+        self.shard_dir = SHARD_DIR
+        # Engine -> result file of an engine "both" run, for per-engine upload.
+        self.result_files = {}
+        self._watermark = None
+        self._head_commit = None
 
     @property
     def result_file(self):
@@ -31,25 +179,515 @@ class SecretScanner:
     def run(self):
         try:
             Logger.get_logger().debug(f"Starting secret scan using {self.engine}...")
-            if self.container_mode:
-                docker_pull(self.scan_image)
-
-            if self.engine == "gitleaks":
-                return self._run_gitleaks()
-            return self._run_trufflehog()
+            if self.staged:
+                returncode, result_file = self._run_staged()
+            elif self.engine == "both":
+                returncode, result_file = self._run_both()
+            else:
+                returncode, result_file = self._filter_findings(*self._run_engine())
+            if self.engine == "gitleaks" and returncode == GITLEAKS_FOUND_RETURN_CODE:
+                returncode = self._gitleaks_exit_code()
+            return returncode, result_file
         except subprocess.CalledProcessError as e:
             Logger.get_logger().error(f"Error during Secret scan: {e}")
             raise
 
+    def _run_engine(self):
+        if self.container_mode:
+            docker_pull(self.scan_image)
+        if self.engine == "gitleaks":
+            return self._run_gitleaks()
+        return self._run_trufflehog()
+
+    def _run_both(self):
+        """
+        Run TruffleHog and Gitleaks concurrently over the same target. Each keeps its own
+        result file (uploaded under its own data type); Gitleaks findings that TruffleHog
+        also reported are dropped from the Gitleaks report.
+        """
+        options = dict(
+            container_mode=self.container_mode, incremental=self.incremental, repo_url=self.repo_url,
+            repo_branch=self.repo_branch, shards=self.shards, jobs=self.jobs, dedupe=self.dedupe,
+            baseline=self.baseline, update_baseline=self.update_baseline,
+        )
+        scanners = [
+            SecretScanner(self.command, engine="trufflehog", **options),
+            SecretScanner(self.gitleaks_command or derive_gitleaks_command(self.command), engine="gitleaks", **options),
+        ]
+        for scanner in scanners:
+            scanner.shard_dir = os.path.join(SHARD_DIR, scanner.engine)
+        try:
+            with ThreadPoolExecutor(max_workers=len(scanners)) as pool:
+                outcomes = list(pool.map(lambda scanner: scanner._run_engine(), scanners))
+        finally:
+            shutil.rmtree(SHARD_DIR, ignore_errors=True)
+        # Sequentially, as both engines may update the same baseline file.
+        outcomes = [scanner._filter_findings(*outcome) for scanner, outcome in zip(scanners, outcomes)]
+
+        failed = []
+        for scanner, (returncode, _) in zip(scanners, outcomes):
+            if returncode not in (config.PASS_RETURN_CODE, scanner._found_return_code()):
+                Logger.get_logger().error(f"{scanner.engine} secret scan failed with exit code {returncode}.")
+                failed.append(returncode)
+        self.result_files = {
+            scanner.engine: result_file for scanner, (_, result_file) in zip(scanners, outcomes)
+            if result_file and os.path.exists(result_file)
+        }
+
+        trufflehog_findings = load_jsonl(self.result_files["trufflehog"]) if "trufflehog" in self.result_files else []
+        seen = {overlap_key(normalize_secret_finding(finding, "trufflehog")) for finding in trufflehog_findings}
+        gitleaks_count = overlapping = 0
+        gitleaks_found = False
+        if "gitleaks" in self.result_files:
+            try:
+                report = load_json_report(self.result_files["gitleaks"])
+            except ValueError:
+                report = None
+            if isinstance(report, list) or is_sarif(report):
+                findings = gitleaks_findings(report)
+                unique = [finding for finding in findings
+                          if overlap_key(normalize_secret_finding(finding, "gitleaks")) not in seen]
+                overlapping = len(findings) - len(unique)
+                gitleaks_count = len(unique)
+                gitleaks_found = bool(unique)
+                if overlapping:
+                    write_json_atomic(self.result_files["gitleaks"], replace_gitleaks_findings(report, unique), indent=2)
+            else:
+                Logger.get_logger().warning("Gitleaks report is not JSON or SARIF; overlapping findings are kept.")
+                # Without a readable report, Gitleaks' exit code says whether it found anything.
+                gitleaks_found = outcomes[1][0] == GITLEAKS_FOUND_RETURN_CODE
+
+        Logger.get_logger().info(
+            f"Secret scan with both engines: {len(trufflehog_findings)} TruffleHog finding(s), "
+            f"{gitleaks_count} more from Gitleaks ({overlapping} also found by TruffleHog dropped)."
+        )
+        result_file = self.result_files.get("trufflehog") or self.result_files.get("gitleaks")
+        if failed:
+            return failed[0], result_file
+        if trufflehog_findings or gitleaks_found:
+            return self._found_return_code(), result_file
+        return config.PASS_RETURN_CODE, result_file
+
     def _run_trufflehog(self):
         args = self._build_trufflehog_args()
+        if self.shard and "--help" not in args:
+            return self._run_file_shard(args)
+        since_commit = self._incremental_base(args)
+        if since_commit == self._head_commit and since_commit:
+            return self._restore_stored_findings()
+        if self._use_shards(args):
+            return self._finish_incremental(*self._run_sharded(args, since_commit, brand="TruffleHog"))
+        if since_commit:
+            args.extend(["--since-commit", since_commit])
         cmd = self._build_scan_command(args, tool_name="secret")
-        return self._execute_scan(cmd, brand="TruffleHog", write_stdout=True)
+        return self._finish_incremental(*self._execute_scan(cmd, brand="TruffleHog", write_stdout=True))
 
     def _run_gitleaks(self):
         args = self._build_gitleaks_args()
+        since_commit = self._incremental_base(args)
+        if since_commit == self._head_commit and since_commit:
+            return self._restore_stored_findings()
+        if self._use_shards(args):
+            return self._finish_incremental(*self._run_sharded(args, since_commit, brand="Gitleaks"))
+        if since_commit:
+            args.extend(["--log-opts", f"{since_commit}..{self._head_commit}"])
         cmd = self._build_scan_command(args, tool_name="gitleaks", entrypoint_gitleaks=True)
-        return self._execute_scan(cmd, brand="Gitleaks", write_stdout=False)
+        return self._finish_incremental(*self._execute_scan(cmd, brand="Gitleaks", write_stdout=False))
+
+    def _run_staged(self):
+        """Scan the staged blobs of the pending commit and print findings inline."""
+        tool_name = "gitleaks" if self.engine == "gitleaks" else "secret"
+        container = self.container_mode
+        if not container:
+            try:
+                local_tool = ToolManager.get_path(tool_name)
+            except (ValueError, FileNotFoundError):
+                Logger.get_logger().info(f"Local {tool_name} tool not installed; scanning staged files in a container.")
+                container = True
+        if container:
+            docker_pull(self.scan_image)
+
+        with StagedSnapshot() as snapshot:
+            if not snapshot.files:
+                Logger.get_logger().info("No staged files to scan.")
+                return config.PASS_RETURN_CODE, None
+
+            root = STAGED_CONTAINER_ROOT if container else snapshot.root
+            extra_args = shlex.split(self.command or "")
+            if self.engine == "gitleaks":
+                report = f"{root}/{STAGED_GITLEAKS_REPORT}"
+                args = ["dir", root, "--report-format", "json", "--report-path", report,
+                        "--no-banner", "--exit-code", str(GITLEAKS_FOUND_RETURN_CODE),
+                        *_strip_flags(extra_args, ("--exit-code",))]
+            else:
+                args = ["filesystem", root, "--json", "--no-update", "--fail", *extra_args]
+
+            if container:
+                cmd = build_docker_run_prefix(workdir=STAGED_CONTAINER_ROOT, host_path=snapshot.root)
+                if self.engine == "gitleaks":
+                    cmd.extend(["--entrypoint", "gitleaks"])
+                cmd.extend([self.scan_image, *args])
+            else:
+                cmd = [local_tool, *args]
+
+            Logger.get_logger().debug(f"Staged secret scan of {len(snapshot.files)} file(s): {' '.join(cmd)}")
+            result = run_scan_subprocess(cmd)
+            if result.returncode not in (config.PASS_RETURN_CODE, self._found_return_code()):
+                Logger.get_logger().error((result.stderr or "").strip() or f"Secret scan failed with exit code {result.returncode}.")
+                return result.returncode, None
+
+            if self.engine == "gitleaks":
+                report_path = os.path.join(snapshot.root, STAGED_GITLEAKS_REPORT)
+                report = gitleaks_findings(load_json_report(report_path)) if os.path.exists(report_path) else []
+                findings = [(*gitleaks_finding_location(finding), finding.get("RuleID") or "secret")
+                            for finding in report]
+            else:
+                findings = parse_trufflehog_output(result.stdout)
+
+            for path, line, label in findings:
+                location = snapshot.repo_path(path, root) if path else "<unknown>"
+                Logger.log_with_color("ERROR", f"{location}:{line}: {label}", Fore.RED)
+
+        if findings:
+            Logger.log_with_color(
+                "ERROR",
+                f"{len(findings)} secret(s) found in staged changes. Remove them before committing.",
+                Fore.RED,
+            )
+            return self._found_return_code(), None
+        Logger.get_logger().info(f"No secrets found in {len(snapshot.files)} staged file(s).")
+        return config.PASS_RETURN_CODE, None
+
+    def _use_shards(self, args) -> bool:
+        if self.shards <= 1 or "--help" in args:
+            return False
+        if not self._is_git_history_scan(args):
+            Logger.get_logger().warning("Sharded mode applies to git history scans only; running a single scan.")
+            return False
+        if _flag_value(args, RANGE_FLAGS) is not None:
+            Logger.get_logger().warning("Commit range already set in --command; running a single scan.")
+            return False
+        return True
+
+    def _run_sharded(self, args, since_commit, brand: str):
+        """Scan the history as parallel commit-range shards and merge into one result file."""
+        head = self._head_commit or GitInfo.get_commit_sha()
+        commits = GitInfo.list_first_parent_commits(head, since_commit) if head else []
+        ranges = split_commit_ranges(commits, self.shards, since_commit)
+        if not ranges:
+            Logger.get_logger().warning("Could not list commits to shard; running a single scan.")
+            if since_commit:
+                args = [*args, *self._range_args(since_commit, head)]
+            tool_name = "gitleaks" if self.engine == "gitleaks" else "secret"
+            cmd = self._build_scan_command(args, tool_name=tool_name, entrypoint_gitleaks=self.engine == "gitleaks")
+            return self._execute_scan(cmd, brand=brand, write_stdout=self.engine != "gitleaks")
+
+        Logger.get_logger().info(
+            f"Sharded secret scan: {len(commits)} commit(s) in {len(ranges)} range(s), {min(self.jobs, len(ranges))} worker(s)."
+        )
+        os.makedirs(self.shard_dir, exist_ok=True)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(ranges))) as pool:
+                outcomes = list(pool.map(
+                    lambda item: self._run_shard(item[0], item[1], args, brand),
+                    enumerate(ranges, start=1),
+                ))
+            return self._merge_shards(outcomes)
+        finally:
+            shutil.rmtree(self.shard_dir, ignore_errors=True)
+
+    def _run_file_shard(self, args):
+        """Scan this node's slice of the filesystem targets, in parallel runs of bounded size."""
+        position = args.index("filesystem") + 1
+        end = position
+        while end < len(args) and not args[end].startswith("-"):
+            end += 1
+        files = list_files(args[position:end])
+        selected = select_shard(files, self.shard)
+        Logger.get_logger().info(f"Secret shard {self.shard[0]}/{self.shard[1]}: {len(selected)} of {len(files)} file(s).")
+        if not selected:
+            Logger.get_logger().info("No secrets found. Skipping upload.")
+            return config.PASS_RETURN_CODE, None
+
+        chunks = chunk_paths(selected)
+        base_args = [*args[:position], *args[end:]]
+        os.makedirs(self.shard_dir, exist_ok=True)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(chunks))) as pool:
+                outcomes = list(pool.map(
+                    lambda item: self._run_file_chunk(item[0], item[1], base_args, position),
+                    enumerate(chunks, start=1),
+                ))
+            return self._merge_shards(outcomes)
+        finally:
+            shutil.rmtree(self.shard_dir, ignore_errors=True)
+
+    def _run_file_chunk(self, index, paths, args, position):
+        shard_file = os.path.join(self.shard_dir, f"files-{index}.jsonl")
+        cmd = self._build_scan_command([*args[:position], *paths, *args[position:]], tool_name="secret")
+        Logger.get_logger().debug(f"Secret scan of {len(paths)} file(s) (run {index}).")
+        result = run_scan_subprocess(cmd)
+        if result.stderr:
+            Logger.get_logger().debug(f"Secret run {index}: {result.stderr.replace('TruffleHog', '[scanner]')}")
+        with open(shard_file, "w", encoding="utf-8") as handle:
+            handle.write(result.stdout or "")
+        return result.returncode, shard_file
+
+    def _range_args(self, since, until):
+        if self.engine == "gitleaks":
+            return ["--log-opts", f"{since}..{until}" if since else until]
+        range_args = ["--branch", until]
+        if since:
+            range_args.extend(["--since-commit", since])
+        return range_args
+
+    def _run_shard(self, index, commit_range, args, brand: str):
+        since, until = commit_range
+        if self.engine == "gitleaks":
+            report_format = _flag_value(args, ("-f", "--report-format"), "sarif")
+            if report_format not in ("json", "sarif"):
+                report_format = "sarif"
+            shard_file = os.path.join(self.shard_dir, f"shard-{index}.{report_format}")
+            shard_args = _strip_flags(args, ("-f", "--report-format", "-r", "--report-path"))
+            shard_args.extend(["--report-format", report_format, "--report-path", shard_file])
+            shard_args.extend(self._range_args(since, until))
+            cmd = self._build_scan_command(shard_args, tool_name="gitleaks", entrypoint_gitleaks=True)
+        else:
+            shard_file = os.path.join(self.shard_dir, f"shard-{index}.jsonl")
+            cmd = self._build_scan_command([*args, *self._range_args(since, until)], tool_name="secret")
+
+        label = f"{since[:12]}..{until[:12]}" if since else f"..{until[:12]}"
+        Logger.get_logger().debug(f"Secret shard {index} ({label}): {' '.join(cmd)}")
+        result = run_scan_subprocess(cmd)
+        if result.stderr:
+            Logger.get_logger().debug(f"Secret shard {index}: {result.stderr.replace(brand, '[scanner]')}")
+        if self.engine != "gitleaks":
+            with open(shard_file, "w", encoding="utf-8") as handle:
+                handle.write(result.stdout or "")
+        Logger.get_logger().info(f"Secret shard {index} ({label}) finished with exit code {result.returncode}.")
+        return result.returncode, shard_file
+
+    def _merge_shards(self, outcomes):
+        failed = [code for code, _ in outcomes if code not in (config.PASS_RETURN_CODE, self._found_return_code())]
+        shard_files = [path for _, path in outcomes if os.path.exists(path)]
+
+        if self.engine == "gitleaks":
+            merged = self._merge_gitleaks(*shard_files)
+            if merged is None:
+                Logger.get_logger().error("Could not merge Gitleaks shard reports.")
+                return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+            write_json_atomic(self.result_file, merged, indent=2)
+            finding_count = len(gitleaks_findings(merged))
+        else:
+            findings = []
+            for path in shard_files:
+                findings.extend(load_jsonl(path))
+            finding_count = write_jsonl(self.result_file, dedupe_trufflehog_findings(findings))
+
+        Logger.get_logger().debug(f"Merged {len(shard_files)} shard result(s) into {finding_count} unique finding(s).")
+        if failed:
+            Logger.get_logger().error(f"{len(failed)} secret scan shard(s) failed.")
+            return failed[0], self.result_file
+        if finding_count == 0 and self.engine != "gitleaks":
+            os.remove(self.result_file)
+            Logger.get_logger().info("No secrets found. Skipping upload.")
+            return config.PASS_RETURN_CODE, None
+        return (self._found_return_code() if finding_count else config.PASS_RETURN_CODE), self.result_file
+
+    def _is_git_history_scan(self, args) -> bool:
+        positional = [arg for arg in args if not arg.startswith("-")]
+        if not positional:
+            return False
+        if self.engine == "gitleaks":
+            return positional[0] in ("detect", "git") and "--no-git" not in args
+        return positional[0] == "git"
+
+    def _incremental_base(self, args):
+        """
+        Prepare incremental state and return the watermark commit to scan from.
+        Returns None for a full scan (first run, rewritten history, or not applicable).
+        """
+        if not self.incremental:
+            return None
+        if "--help" in args or not self._is_git_history_scan(args):
+            Logger.get_logger().warning("Incremental mode applies to git history scans only; running a full scan.")
+            return None
+        if any(flag in args for flag in ("--since-commit", "--log-opts")):
+            Logger.get_logger().warning("Commit range already set in --command; incremental watermark ignored.")
+            return None
+
+        self._head_commit = GitInfo.get_commit_sha()
+        if not self._head_commit:
+            Logger.get_logger().warning("Could not resolve HEAD; running a full secret scan.")
+            return None
+
+        self._watermark = SecretWatermark(self.engine, self.repo_url, self.repo_branch, scan_args=args)
+        since_commit = self._watermark.commit
+        if not since_commit:
+            Logger.get_logger().info("No secret scan watermark found; running a full history scan.")
+            return None
+        if not GitInfo.resolve_commit(since_commit) or not GitInfo.is_ancestor(since_commit, self._head_commit):
+            Logger.get_logger().info(
+                f"Watermark commit {since_commit[:12]} is not in the current history; running a full history scan."
+            )
+            self._watermark.reset()
+            return None
+
+        Logger.get_logger().info(f"Incremental secret scan: commits after {since_commit[:12]}.")
+        return since_commit
+
+    def _found_return_code(self):
+        return GITLEAKS_FOUND_RETURN_CODE if self.engine == "gitleaks" else TRUFFLEHOG_FOUND_RETURN_CODE
+
+    def _gitleaks_exit_code(self):
+        """Exit code for Gitleaks findings: the --exit-code in --command, else Gitleaks' default."""
+        value = _flag_value(shlex.split(self.command or ""), ("--exit-code",))
+        try:
+            return int(value) if value is not None else GITLEAKS_DEFAULT_EXIT_CODE
+        except ValueError:
+            return GITLEAKS_DEFAULT_EXIT_CODE
+
+    def _restore_stored_findings(self):
+        Logger.get_logger().info("No new commits since the last secret scan; reusing stored findings.")
+        return self._finish_incremental(config.PASS_RETURN_CODE, None, new_findings_scanned=False)
+
+    def _finish_incremental(self, returncode, result_file, new_findings_scanned=True):
+        """Merge this run's findings with the stored ones and advance the watermark."""
+        if self._watermark is None or not self._head_commit:
+            return returncode, result_file
+        if returncode not in (config.PASS_RETURN_CODE, self._found_return_code()):
+            Logger.get_logger().warning("Secret scan did not complete; watermark not advanced.")
+            return returncode, result_file
+
+        stored_state = self._watermark.load()
+        stored_file = self._watermark.findings_file if stored_state else None
+        new_file = self.result_file if new_findings_scanned and os.path.exists(self.result_file) else None
+
+        if self.engine == "gitleaks":
+            # Gitleaks writes its report on every completed run, findings or not.
+            if new_findings_scanned and not self._readable_report(new_file):
+                Logger.get_logger().warning("Gitleaks wrote no readable report; watermark not advanced.")
+                return returncode, result_file
+            merged = self._merge_gitleaks(stored_file, new_file)
+            if merged is None:
+                Logger.get_logger().warning("Gitleaks report format cannot be merged; watermark not advanced.")
+                return returncode, result_file
+            write_json_atomic(self.result_file, merged, indent=2)
+            finding_count = len(gitleaks_findings(merged))
+        else:
+            findings = []
+            for path in (stored_file, new_file):
+                if path and os.path.exists(path):
+                    findings.extend(load_jsonl(path))
+            finding_count = write_jsonl(self.result_file, dedupe_trufflehog_findings(findings))
+
+        self._watermark.save(self._head_commit, self.result_file)
+        Logger.get_logger().debug(
+            f"Secret scan watermark advanced to {self._head_commit[:12]} ({finding_count} finding(s) stored)."
+        )
+
+        if finding_count == 0:
+            if os.path.exists(self.result_file) and self.engine != "gitleaks":
+                os.remove(self.result_file)
+                Logger.get_logger().info("No secrets found. Skipping upload.")
+                return config.PASS_RETURN_CODE, None
+            return config.PASS_RETURN_CODE, self.result_file
+        return self._found_return_code(), self.result_file
+
+    def _filter_findings(self, returncode, result_file):
+        """Apply --baseline and --dedupe to the result file before it is uploaded."""
+        if not (self.dedupe or self.baseline) or not result_file or not os.path.exists(result_file):
+            return returncode, result_file
+        if returncode not in (config.PASS_RETURN_CODE, self._found_return_code()):
+            return returncode, result_file
+
+        if self.engine == "gitleaks":
+            try:
+                report = load_json_report(result_file)
+            except ValueError:
+                report = None
+            if not (isinstance(report, list) or is_sarif(report)):
+                Logger.get_logger().warning(
+                    "Gitleaks report is not JSON or SARIF; findings are not de-duplicated or baselined."
+                )
+                return returncode, result_file
+            findings, key = gitleaks_findings(report), gitleaks_finding_key
+        else:
+            findings, key = load_jsonl(result_file), trufflehog_finding_key
+        reported = len(findings)
+
+        suppressed = 0
+        if self.baseline:
+            if self.update_baseline:
+                added = update_baseline(self.baseline, findings, key)
+                Logger.get_logger().info(f"Added {added} finding(s) to the secret baseline {self.baseline}.")
+            elif not os.path.exists(self.baseline):
+                Logger.get_logger().error(
+                    f"Secret baseline {self.baseline} not found (create it with --update-baseline)."
+                )
+                return config.SOMETHING_WENT_WRONG_RETURN_CODE, result_file
+            try:
+                known = load_baseline(self.baseline)
+            except ValueError as e:
+                Logger.get_logger().error(str(e))
+                return config.SOMETHING_WENT_WRONG_RETURN_CODE, result_file
+            findings = [finding for finding in findings if secret_fingerprint(key(finding)) not in known]
+            suppressed = reported - len(findings)
+
+        if self.dedupe:
+            findings = [self._with_occurrence_count(finding, count)
+                        for finding, count in collapse_findings(findings, key)]
+
+        if self.engine == "gitleaks":
+            write_json_atomic(result_file, replace_gitleaks_findings(report, findings), indent=2)
+        else:
+            write_jsonl(result_file, findings)
+        Logger.get_logger().info(
+            f"Secret findings: {reported} reported, {suppressed} suppressed by baseline, {len(findings)} kept."
+        )
+
+        if findings:
+            return self._found_return_code(), result_file
+        if self.engine != "gitleaks":
+            os.remove(result_file)
+            Logger.get_logger().info("No secrets found. Skipping upload.")
+            return config.PASS_RETURN_CODE, None
+        return config.PASS_RETURN_CODE, result_file
+
+    @staticmethod
+    def _with_occurrence_count(finding, count):
+        # SARIF results carry extra data in a property bag; JSON findings at the top level.
+        if "ruleId" in finding or "locations" in finding:
+            return {**finding, "properties": {**(finding.get("properties") or {}), "occurrenceCount": count}}
+        return {**finding, "OccurrenceCount": count}
+
+    @staticmethod
+    def _readable_report(path):
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            return load_json_report(path) is not None
+        except ValueError:
+            return False
+
+    def _merge_gitleaks(self, *paths):
+        reports = []
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    report = load_json_report(path)
+                except ValueError:
+                    return None
+                if report is not None:
+                    reports.append(report)
+        if not reports:
+            return []
+        merged = reports[0]
+        for report in reports[1:]:
+            merged = merge_gitleaks_reports(merged, report)
+            if merged is None:
+                return None
+        return merged
 
     def _execute_scan(self, cmd, brand: str, write_stdout: bool):
         Logger.get_logger().debug(f"Running command: {' '.join(cmd)}")
@@ -87,16 +725,22 @@ class SecretScanner:
         return sanitized_args
 
     def _build_gitleaks_args(self):
-        if self.command and self.command.strip():
-            return shlex.split(self.command)
-
-        return [
-            "detect",
-            "--source", ".",
-            "--report-format", "sarif",
-            "--report-path", self.result_file,
-            "--no-banner",
-        ]
+        if not (self.command and self.command.strip()):
+            return [
+                "detect",
+                "--source", ".",
+                "--report-format", "sarif",
+                "--report-path", self.result_file,
+                "--no-banner",
+                "--exit-code", str(GITLEAKS_FOUND_RETURN_CODE),
+            ]
+
+        args = shlex.split(self.command)
+        positional = [arg for arg in args if not arg.startswith("-")]
+        if positional[:1] and positional[0] in GITLEAKS_SCAN_COMMANDS:
+            args = _strip_flags(args, ("--exit-code",))
+            args.extend(["--exit-code", str(GITLEAKS_FOUND_RETURN_CODE)])
+        return args
 
     def _build_scan_command(self, args, tool_name: str, entrypoint_gitleaks: bool = False):
         if not self.container_mode:
@@ -9,8 +9,10 @@ from aspm_cli.utils.docker_runtime import build_docker_run_prefix
 from aspm_cli.utils.logger import Logger
 from accuknox_sq_sast.sonarqube_fetcher import SonarQubeFetcher
 
+SONAR_SCANNER_IMAGE = "public.ecr.aws/k9v9d5v2/sonarsource/sonar-scanner-cli:11.4"
+
+
 class SQSASTScanner:
-    sast_image = os.getenv("SCAN_IMAGE", "public.ecr.aws/k9v9d5v2/sonarsource/sonar-scanner-cli:11.4")
     DEFAULT_SEVERITY = "INFO,MINOR,MAJOR,CRITICAL,BLOCKER,LOW,MEDIUM,HIGH"
 
     def __init__(self, skip_sonar_scan, command, container_mode=False, repo_url=None, branch=None,
@@ -24,6 +26,7 @@ class SQSASTScanner:
         :param pipeline_url: CI/CD pipeline URL
         :param severity: Comma-separated severities that fail the scan
         """
+        self.sast_image = os.getenv("SCAN_IMAGE", SONAR_SCANNER_IMAGE)
         self.skip_sonar_scan = skip_sonar_scan
         self.command = command
         self.container_mode = container_mode
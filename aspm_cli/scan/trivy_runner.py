@@ -1,8 +1,11 @@
+import contextlib
 import json
 import os
 import re
 import shlex
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 from aspm_cli.tool.manager import ToolManager
@@ -12,17 +15,28 @@ from aspm_cli.utils.subprocess_utils import run_scan_subprocess
 from aspm_cli.utils.sca_prepare import append_skip_git_dir, prepare_sca_report
 from aspm_cli.utils.docker_runtime import (
     build_docker_run_prefix,
+    docker_volume_mount,
     trivy_scan_needs_docker_socket,
 )
 from aspm_cli.utils.sbom import (
     FILESYSTEM_SUBCOMMANDS,
     normalize_filesystem_args_for_docker,
     parse_trivy_subcommand,
+    scan_target_from_command,
 )
 
 DEFAULT_TRIVY_IMAGE = "public.ecr.aws/k9v9d5v2/accuknox/trivy:0.69.3"
 SCA_ALLOWED_SUBCOMMANDS = frozenset({"filesystem", "fs", "rootfs"})
 
+# Host directory shared by every Trivy run (vulnerability DB, Java DB). Scans use
+# the in-memory scan cache, so concurrent runs never contend for its lock.
+SHARED_CACHE_ENV = "ACCUKNOX_TRIVY_CACHE_DIR"
+# Set by shared_trivy_cache() once the shared cache holds fresh DBs: runs skip the update.
+SHARED_DB_READY_ENV = "ACCUKNOX_TRIVY_DB_READY"
+CONTAINER_CACHE_DIR = "/trivy-cache"
+# Per-shard reports of a --shard-projects scan, next to the result file.
+SCA_SHARDS_DIR = ".accuknox-sca-shards"
+
 
 def get_trivy_image() -> str:
     return os.getenv("SCAN_IMAGE", DEFAULT_TRIVY_IMAGE)
@@ -73,24 +87,91 @@ def normalize_sca_args_for_docker(command: str, sanitized_args: List[str]) -> Li
     return sanitized_args
 
 
+def shared_cache_args(container_mode: bool) -> Tuple[List[str], List[str]]:
+    """(docker run mount args, Trivy flags) for the shared cache in ACCUKNOX_TRIVY_CACHE_DIR, if set."""
+    cache = os.getenv(SHARED_CACHE_ENV, "").strip()
+    if not cache:
+        return [], []
+    os.makedirs(cache, exist_ok=True)
+    mount = docker_volume_mount(cache, CONTAINER_CACHE_DIR) if container_mode else []
+    flags = ["--cache-dir", CONTAINER_CACHE_DIR if container_mode else cache, "--cache-backend", "memory"]
+    if os.getenv(SHARED_DB_READY_ENV, "").upper() == "TRUE":
+        flags.extend(["--skip-db-update", "--skip-java-db-update"])
+    return mount, flags
+
+
 def build_trivy_scan_command(
     container_mode: bool,
     scan_args: List[str],
     image: Optional[str] = None,
 ) -> List[str]:
     image = image or get_trivy_image()
+    cache_mount, cache_flags = shared_cache_args(container_mode)
     if not container_mode:
-        return [ToolManager.get_path("container"), *scan_args]
+        return [ToolManager.get_path("container"), *scan_args, *cache_flags]
 
     cmd = build_docker_run_prefix(
         workdir="/workdir",
         mount_docker_socket=trivy_scan_needs_docker_socket(scan_args),
     )
+    cmd.extend(cache_mount)
     cmd.append(image)
     cmd.extend(scan_args)
+    cmd.extend(cache_flags)
     return cmd
 
 
+def warm_trivy_db(container_mode: bool) -> bool:
+    """
+    Download the vulnerability and Java DBs into the shared cache once, so that
+    parallel scans (scan batch) can all skip the update. Returns False when the
+    shared cache is not configured or the download failed.
+    """
+    if not os.getenv(SHARED_CACHE_ENV, "").strip():
+        return False
+    if container_mode:
+        docker_pull(get_trivy_image())
+    for only in ("--download-db-only", "--download-java-db-only"):
+        cmd = build_trivy_scan_command(container_mode, ["image", only])
+        Logger.get_logger().debug(f"Warming Trivy cache: {' '.join(cmd)}")
+        try:
+            result = run_scan_subprocess(cmd)
+        except subprocess.TimeoutExpired:
+            Logger.get_logger().warning("Timed out downloading the vulnerability DB; scans will update it themselves.")
+            return False
+        if result.returncode != 0:
+            Logger.get_logger().warning(
+                f"Could not download the vulnerability DB: {sanitize_trivy_log(result.stderr or '').strip()}"
+            )
+            return False
+    return True
+
+
+@contextlib.contextmanager
+def shared_trivy_cache(container_mode: bool):
+    """
+    Point the Trivy runs inside the block, in this process and in workers it starts,
+    at one shared cache (ACCUKNOX_TRIVY_CACHE_DIR, default under the user cache) whose
+    DBs are downloaded once up front. Both variables are restored on exit, so a
+    long-lived process (daemon, serve, batch worker) updates the DB again next time.
+    """
+    from aspm_cli.utils.cache import cache_dir
+
+    saved = {name: os.environ.get(name) for name in (SHARED_CACHE_ENV, SHARED_DB_READY_ENV)}
+    try:
+        if not os.getenv(SHARED_CACHE_ENV, "").strip():
+            os.environ[SHARED_CACHE_ENV] = str(cache_dir("trivy"))
+        if os.getenv(SHARED_DB_READY_ENV, "").upper() != "TRUE" and warm_trivy_db(container_mode):
+            os.environ[SHARED_DB_READY_ENV] = "TRUE"
+        yield os.environ[SHARED_CACHE_ENV]
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
 def _fix_result_file_permissions_if_docker(container_mode: bool, result_file: str) -> None:
     """chmod the root-owned Trivy output so the host can rewrite it in place.
 
@@ -129,22 +210,18 @@ def severity_threshold_met(result_file: str, severity_threshold: List[str]) -> b
     return False
 
 
-def run_trivy_vuln_scan(
+def _execute_trivy_vuln_scan(
     command: str,
     container_mode: bool,
-    result_file: str = "./results.json",
-    validate_command=None,
+    result_file: str,
     cli_severity: Optional[str] = None,
     sca_mode: bool = False,
-    repo_url: Optional[str] = None,
-    repo_branch: Optional[str] = None,
-) -> Tuple[int, Optional[str]]:
-    if validate_command:
-        validate_command(command)
-
-    if container_mode:
-        docker_pull(get_trivy_image())
-
+    label: Optional[str] = None,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Run one Trivy vulnerability scan into result_file.
+    Returns (exit code, severity threshold); the exit code is None when --help output was shown.
+    """
     severity_threshold, sanitized_args = build_trivy_vuln_args(
         command, result_file, cli_severity=cli_severity
     )
@@ -161,17 +238,55 @@ def run_trivy_vuln_scan(
     try:
         result = run_scan_subprocess(scan_cmd)
     except subprocess.TimeoutExpired:
-        Logger.get_logger().error("Trivy scan timed out")
-        return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+        Logger.get_logger().error(f"{label}: Trivy scan timed out" if label else "Trivy scan timed out")
+        return config.SOMETHING_WENT_WRONG_RETURN_CODE, severity_threshold
 
     if result.stdout:
         Logger.get_logger().debug(sanitize_trivy_log(result.stdout))
         if "--help" in (command or ""):
             from colorama import Fore
             Logger.log_with_color("INFO", sanitize_trivy_log(result.stdout), Fore.WHITE)
-            return config.PASS_RETURN_CODE, None
+            return None, severity_threshold
     if result.stderr:
-        Logger.get_logger().error(sanitize_trivy_log(result.stderr))
+        stderr = sanitize_trivy_log(result.stderr)
+        Logger.get_logger().error(f"{label}: {stderr}" if label else stderr)
+    return result.returncode, severity_threshold
+
+
+def _check_severity_threshold(result_file: str, severity_threshold: Optional[str]) -> int:
+    thresholds = [
+        s.strip().upper()
+        for s in (severity_threshold or "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL").split(",")
+    ]
+    if severity_threshold_met(result_file, thresholds):
+        Logger.get_logger().error(
+            f"Vulnerabilities matching severities: {', '.join(thresholds)} found."
+        )
+        return 1
+    return 0
+
+
+def run_trivy_vuln_scan(
+    command: str,
+    container_mode: bool,
+    result_file: str = "./results.json",
+    validate_command=None,
+    cli_severity: Optional[str] = None,
+    sca_mode: bool = False,
+    repo_url: Optional[str] = None,
+    repo_branch: Optional[str] = None,
+) -> Tuple[int, Optional[str]]:
+    if validate_command:
+        validate_command(command)
+
+    if container_mode:
+        docker_pull(get_trivy_image())
+
+    returncode, severity_threshold = _execute_trivy_vuln_scan(
+        command, container_mode, result_file, cli_severity=cli_severity, sca_mode=sca_mode,
+    )
+    if returncode is None:
+        return config.PASS_RETURN_CODE, None
 
     if not os.path.exists(result_file):
         return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
@@ -187,14 +302,98 @@ def run_trivy_vuln_scan(
             "SCA: finalized report identity (ArtifactName/type) for platform parsing"
         )
 
-    thresholds = [
-        s.strip().upper()
-        for s in (severity_threshold or "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL").split(",")
-    ]
-    if severity_threshold_met(result_file, thresholds):
-        Logger.get_logger().error(
-            f"Vulnerabilities matching severities: {', '.join(thresholds)} found."
+    return _check_severity_threshold(result_file, severity_threshold), result_file
+
+
+def run_sharded_sca_scan(
+    command: str,
+    container_mode: bool,
+    shards: List[Tuple[str, List[str]]],
+    result_file: str = "./results.json",
+    cli_severity: Optional[str] = None,
+    repo_url: Optional[str] = None,
+    repo_branch: Optional[str] = None,
+    jobs: int = 1,
+) -> Tuple[int, Optional[str]]:
+    """
+    Scan each (shard directory, nested shard directories) pair with its own Trivy run,
+    ``jobs`` at a time, and merge the reports into result_file. Shard directories are
+    relative to the working directory; each run skips the shards nested inside it, so
+    every file is scanned once. Runs share one cache whose DBs are downloaded up front.
+    """
+    validate_sca_command(command)
+    if container_mode:
+        docker_pull(get_trivy_image())
+    with shared_trivy_cache(container_mode):
+        return _scan_sca_shards(command, container_mode, shards, result_file, cli_severity, repo_url, repo_branch, jobs)
+
+
+def _scan_sca_shards(command, container_mode, shards, result_file, cli_severity, repo_url, repo_branch, jobs):
+    target = scan_target_from_command(command) or "."
+    shard_root = os.path.join(os.path.dirname(result_file) or ".", SCA_SHARDS_DIR)
+    shutil.rmtree(shard_root, ignore_errors=True)
+
+    def _scan(indexed_shard):
+        index, (directory, nested) = indexed_shard
+        shard_file = os.path.join(shard_root, str(index), os.path.basename(result_file))
+        os.makedirs(os.path.dirname(shard_file), exist_ok=True)
+        shard_command = shard_trivy_command(command, directory, nested)
+        returncode, _ = _execute_trivy_vuln_scan(
+            shard_command, container_mode, shard_file, cli_severity=cli_severity, sca_mode=True,
+            label=directory,
         )
-        return 1, result_file
+        return returncode, shard_file
 
-    return 0, result_file
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(shards)))) as pool:
+            outcomes = list(pool.map(_scan, enumerate(shards)))
+
+        reports = []
+        for (directory, _), (returncode, shard_file) in zip(shards, outcomes):
+            if returncode not in (0, 1) or not os.path.exists(shard_file):
+                Logger.get_logger().error(f"SCA scan of {directory} did not complete.")
+                return config.SOMETHING_WENT_WRONG_RETURN_CODE, None
+            with open(shard_file, "r", encoding="utf-8") as f:
+                reports.append((os.path.relpath(directory, target), json.load(f)))
+    finally:
+        shutil.rmtree(shard_root, ignore_errors=True)
+
+    with open(result_file, "w", encoding="utf-8") as f:
+        json.dump(merge_trivy_reports(reports, artifact_name=target), f, indent=2)
+    prepare_sca_report(result_file, repo_url=repo_url, repo_branch=repo_branch)
+    severity_threshold, _ = build_trivy_vuln_args(command, result_file, cli_severity=cli_severity)
+    return _check_severity_threshold(result_file, severity_threshold), result_file
+
+
+def shard_trivy_command(command: str, directory: str, nested: List[str]) -> str:
+    """The filesystem command with its target replaced by directory and nested shards skipped."""
+    args = shlex.split(command)
+    subcommand = parse_trivy_subcommand(command)
+    index = args.index(subcommand)
+    if index + 1 < len(args) and not args[index + 1].startswith("-"):
+        args[index + 1] = directory
+    else:
+        args.insert(index + 1, directory)
+    skip_dirs = [os.path.relpath(path, directory).replace(os.sep, "/") for path in nested]
+    # Passing --skip-dirs switches off the default .git skip, so keep it explicitly.
+    args.extend(["--skip-dirs", ",".join([".git", *skip_dirs])])
+    return shlex.join(args)
+
+
+def merge_trivy_reports(reports: List[Tuple[str, dict]], artifact_name: str) -> dict:
+    """
+    One Trivy report from per-shard reports: Results targets are re-based onto the
+    original scan target and the first report provides the header and metadata.
+    """
+    merged = None
+    for prefix, report in reports:
+        if merged is None:
+            merged = {key: value for key, value in report.items() if key != "Results"}
+            merged["ArtifactName"] = artifact_name
+            merged["Results"] = []
+        for result in report.get("Results") or []:
+            if prefix not in (".", "") and result.get("Target"):
+                result = dict(result)
+                result["Target"] = f"{prefix.replace(os.sep, '/')}/{result['Target']}"
+            merged["Results"].append(result)
+    return merged or {"ArtifactName": artifact_name, "Results": []}
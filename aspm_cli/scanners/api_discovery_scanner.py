@@ -15,13 +15,24 @@ class APIDiscoveryScanner(BaseScanner):
             "--command",
             type=str,
             default="-path . -output results.json",
-            help="code2api args (default: '-path . -output results.json')",
+            help="code2api args (default: '-path . -output results.json'); repeat -path to scan several roots",
         )
         parser.add_argument(
             "--container-mode",
             action="store_true",
             help="Run code2api in container mode",
         )
+        parser.add_argument(
+            "--auto-roots",
+            action="store_true",
+            help="Scan each top-level project directory (package.json, go.mod, pom.xml, ...) under -path as its own root",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum source roots scanned concurrently (default: available CPUs)",
+        )
         parser.add_argument(
             "--repo-url",
             default=GitInfo.get_repo_url(),
@@ -29,8 +40,13 @@ class APIDiscoveryScanner(BaseScanner):
         )
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
-        validator.validate_api_discovery_scan(args.command, args.container_mode)
+        validator.validate_api_discovery_scan(args.command, args.container_mode, jobs=getattr(args, "jobs", None))
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
-        scanner = OriginalAPIDiscoveryScanner(args.command, args.container_mode)
+        scanner = OriginalAPIDiscoveryScanner(
+            args.command,
+            args.container_mode,
+            auto_roots=getattr(args, "auto_roots", False),
+            jobs=getattr(args, "jobs", None),
+        )
         return scanner.run()
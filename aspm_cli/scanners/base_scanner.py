@@ -21,6 +21,13 @@ class BaseScanner(ABC):
     def get_data_type_identifier(self) -> str:
         return self.data_type_identifier
 
+    def get_result_artifacts(self, result_file: str | None) -> list[tuple[str, str]]:
+        """
+        (file, data_type) pairs to upload after run_scan. Scanners that produce
+        several artifacts (e.g. one per engine) override this.
+        """
+        return [(result_file, self.get_data_type_identifier())] if result_file else []
+
     @abstractmethod
     def add_arguments(self, parser: argparse.ArgumentParser):
         """
@@ -1,12 +1,16 @@
 import argparse
 from aspm_cli.scanners.base_scanner import BaseScanner
 from aspm_cli.utils.config import ConfigValidator
-from aspm_cli.scan.dast import DASTScanner as OriginalDASTScanner # Import original scanner logic
+from aspm_cli.scan.dast import DASTScanner as OriginalDASTScanner, load_targets # Import original scanner logic
 
 class DASTScanner(BaseScanner):
     help_text = "Run a DAST scan using OWASP ZAP"
     data_type_identifier = "ZAP"
 
+    def __init__(self):
+        super().__init__()
+        self._result_files = []
+
     def add_arguments(self, parser: argparse.ArgumentParser):
         parser.add_argument(
             "--severity-threshold",
@@ -23,10 +27,53 @@ class DASTScanner(BaseScanner):
             action="store_true",
             help="Run in container mode"
         )
+        parser.add_argument(
+            "--targets",
+            help="Comma-separated target URLs; --command (zap-baseline.py / zap-full-scan.py) runs once per target",
+        )
+        parser.add_argument(
+            "--targets-file",
+            help="File with one target URL per line (# comments allowed); combined with --targets",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum targets scanned concurrently, one ZAP container each (default: 4, or fewer CPUs)",
+        )
+        parser.add_argument(
+            "--zap-daemon",
+            action="store_true",
+            help=(
+                "Scan through a long-lived ZAP daemon's API (ZAP_API_URL, else a reused "
+                "accuknox-zap-daemon container) instead of starting ZAP per scan"
+            ),
+        )
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
-        validator.validate_dast_scan(args.command, args.severity_threshold, args.container_mode)
+        validator.validate_dast_scan(
+            args.command,
+            args.severity_threshold,
+            args.container_mode,
+            targets=load_targets(getattr(args, "targets", None), getattr(args, "targets_file", None)),
+            jobs=getattr(args, "jobs", None),
+            zap_daemon=getattr(args, "zap_daemon", False),
+        )
+
+    def get_result_artifacts(self, result_file):
+        if not self._result_files:
+            return super().get_result_artifacts(result_file)
+        return [(path, self.get_data_type_identifier()) for path in self._result_files]
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
-        scanner = OriginalDASTScanner(args.command, args.severity_threshold, args.container_mode)
-        return scanner.run()
\ No newline at end of file
+        scanner = OriginalDASTScanner(
+            args.command,
+            args.severity_threshold,
+            args.container_mode,
+            targets=load_targets(getattr(args, "targets", None), getattr(args, "targets_file", None)),
+            jobs=getattr(args, "jobs", None),
+            zap_daemon=getattr(args, "zap_daemon", False),
+        )
+        result = scanner.run()
+        self._result_files = scanner.result_files
+        return result
\ No newline at end of file
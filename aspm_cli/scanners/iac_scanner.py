@@ -2,6 +2,7 @@ import argparse
 from aspm_cli.scanners.base_scanner import BaseScanner
 from aspm_cli.utils.config import ConfigValidator
 from aspm_cli.utils.git_info import GitInfo
+from aspm_cli.utils.sharding import parse_shard
 from aspm_cli.scan import IaCScanner as OriginalIaCScanner
 
 class IACScanner(BaseScanner):
@@ -24,12 +25,38 @@ class IACScanner(BaseScanner):
             default="INFO,LOW,MEDIUM,HIGH,CRITICAL",
             help="Comma-separated list of severities to check. If any match, the scan will fail. Defaults to all severities."
         )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Re-scan only IaC files/directories changed since the last run (single -d target) and reuse cached results"
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum concurrent scanner runs in incremental or sharded mode (default: available CPUs)"
+        )
+        parser.add_argument(
+            "--shard-projects",
+            action="store_true",
+            help="Scan each detected Terraform root and Helm chart separately in parallel and merge the reports (single -d target)"
+        )
+        parser.add_argument(
+            "--shard",
+            help="Scan only slice i of N of the Terraform directories, Helm charts and files, hash-partitioned by path "
+                 "(e.g. 2/4; single -d target); combine the slices with 'results merge'"
+        )
         parser.add_argument("--repo-url", default=GitInfo.get_repo_url(), help="Git repository URL")
         parser.add_argument("--repo-branch", default=GitInfo.get_branch_name(), help="Git repository branch")
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
-        validator.validate_iac_scan(args.command, args.container_mode, args.repo_url, args.repo_branch, args.severity)
+        validator.validate_iac_scan(args.command, args.container_mode, args.repo_url, args.repo_branch, args.severity,
+                                    jobs=getattr(args, "jobs", None), incremental=getattr(args, "incremental", False),
+                                    shard_projects=getattr(args, "shard_projects", False), shard=getattr(args, "shard", None))
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
-        scanner = OriginalIaCScanner(args.command, args.container_mode, args.repo_url, args.repo_branch, args.severity)
+        scanner = OriginalIaCScanner(args.command, args.container_mode, args.repo_url, args.repo_branch, args.severity,
+                                     incremental=getattr(args, "incremental", False), jobs=getattr(args, "jobs", None),
+                                     shard_projects=getattr(args, "shard_projects", False),
+                                     shard=parse_shard(getattr(args, "shard", None)))
         return scanner.run()
\ No newline at end of file
@@ -4,6 +4,7 @@ from aspm_cli.scanners.base_scanner import BaseScanner
 from aspm_cli.scan.ml_scan import MLScanScanner as OriginalMLScanScanner
 from aspm_cli.utils.config import ConfigValidator
 from aspm_cli.utils.git_info import GitInfo
+from aspm_cli.utils.sharding import parse_shard
 
 
 class MLScanScanner(BaseScanner):
@@ -41,6 +42,32 @@ class MLScanScanner(BaseScanner):
             default="github",
             help="Source type in upload payload (default: github)",
         )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum modelscan runs at once (default: available CPUs)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1,
+            help="Model files scanned per modelscan run/container (default: 1)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Re-scan every model file instead of reusing cached results for unchanged content",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Keep results already written to results.json by an interrupted run and scan only the rest",
+        )
+        parser.add_argument(
+            "--shard",
+            help="Scan only slice i of N of the model files, hash-partitioned by path (e.g. 2/4); combine the slices with 'results merge'",
+        )
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
         validator.validate_ml_scan(
@@ -50,6 +77,9 @@ class MLScanScanner(BaseScanner):
             args.commit_ref,
             args.model_name,
             args.source_type,
+            jobs=getattr(args, "jobs", None),
+            batch_size=getattr(args, "batch_size", 1),
+            shard=getattr(args, "shard", None),
         )
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
@@ -60,5 +90,10 @@ class MLScanScanner(BaseScanner):
             commit_ref=args.commit_ref,
             model_name=args.model_name,
             source_type=args.source_type,
+            jobs=getattr(args, "jobs", None),
+            batch_size=getattr(args, "batch_size", 1),
+            no_cache=getattr(args, "no_cache", False),
+            resume=getattr(args, "resume", False),
+            shard=parse_shard(getattr(args, "shard", None)),
         )
         return scanner.run()
@@ -3,6 +3,7 @@ import os
 from aspm_cli.scanners.base_scanner import BaseScanner
 from aspm_cli.utils.config import ConfigValidator
 from aspm_cli.utils.git_info import GitInfo
+from aspm_cli.utils.sharding import parse_shard
 from aspm_cli.scan.sast import SASTScanner as OriginalSASTScanner 
 
 class SASTScanner(BaseScanner):
@@ -37,11 +38,16 @@ class SASTScanner(BaseScanner):
         parser.add_argument("--job-url", help="Job URL for scanning")
         parser.add_argument("--ai-analysis", action="store_true", help="Enable AI analysis of results")
         parser.add_argument("--codeassure-config", help="Path to codeassure.json config file for AI analysis")
+        parser.add_argument(
+            "--shard",
+            help="Scan only slice i of N of the files, hash-partitioned by path (e.g. 2/4); combine the slices with 'results merge'"
+        )
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
         validator.validate_sast_scan(
             args.command, args.container_mode, args.severity, args.repo_url,
-            args.commit_ref, args.commit_sha, args.pipeline_id, args.job_url
+            args.commit_ref, args.commit_sha, args.pipeline_id, args.job_url,
+            shard=getattr(args, "shard", None),
         )
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
@@ -58,6 +64,7 @@ class SASTScanner(BaseScanner):
             pipeline_id=args.pipeline_id,
             job_url=args.job_url,
             ai_analysis=ai_analysis,
-            codeassure_config=getattr(args, 'codeassure_config', None)
+            codeassure_config=getattr(args, 'codeassure_config', None),
+            shard=parse_shard(getattr(args, "shard", None)),
         )
         return scanner.run()
\ No newline at end of file
@@ -37,6 +37,17 @@ class SCAScanner(BaseScanner):
             default=GitInfo.get_branch_name(),
             help="Git repository branch (used for SCA asset identity; defaults from git)",
         )
+        parser.add_argument(
+            "--shard-projects",
+            action="store_true",
+            help="Scan each detected sub-project (package.json, go.mod, pom.xml, ...) separately in parallel and merge the reports",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum concurrent scanner runs with --shard-projects (default: available CPUs)",
+        )
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
         validator.validate_sca_scan(
@@ -45,6 +56,7 @@ class SCAScanner(BaseScanner):
             args.severity,
             args.repo_url,
             args.repo_branch,
+            jobs=getattr(args, "jobs", None),
         )
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
@@ -54,5 +66,7 @@ class SCAScanner(BaseScanner):
             severity=args.severity,
             repo_url=args.repo_url,
             repo_branch=args.repo_branch,
+            shard_projects=getattr(args, "shard_projects", False),
+            jobs=getattr(args, "jobs", None),
         )
         return scanner.run()
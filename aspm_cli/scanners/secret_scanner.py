@@ -3,23 +3,33 @@ import argparse
 from aspm_cli.scanners.base_scanner import BaseScanner
 from aspm_cli.scan.secret import SecretScanner as OriginalSecretScanner
 from aspm_cli.utils.config import ConfigValidator
+from aspm_cli.utils.git_info import GitInfo
+from aspm_cli.utils.sharding import parse_shard
 
 
 class SecretScanner(BaseScanner):
-    help_text = "Run secret scan using TruffleHog or Gitleaks"
+    help_text = "Run secret scan using TruffleHog, Gitleaks or both"
     data_type_identifier = "TruffleHog"
 
     def __init__(self, engine: str = "trufflehog"):
         super().__init__()
         self.engine = engine.lower()
         self.data_type_identifier = "DS" if self.engine == "gitleaks" else "TruffleHog"
+        self._result_files = {}
 
     def add_arguments(self, parser: argparse.ArgumentParser):
         parser.add_argument(
             "--command",
             type=str,
-            required=True,
-            help="Scanner args (TruffleHog: 'filesystem .'; Gitleaks: 'detect --source .')",
+            help=(
+                "Scanner args (TruffleHog: 'filesystem .'; Gitleaks: 'detect --source .'). "
+                "With --staged, extra flags appended to the staged-files scan"
+            ),
+        )
+        parser.add_argument(
+            "--staged",
+            action="store_true",
+            help="Scan only the files staged for commit and print findings (pre-commit hook); nothing is uploaded",
         )
         parser.add_argument(
             "--container-mode",
@@ -28,17 +38,102 @@ class SecretScanner(BaseScanner):
         )
         parser.add_argument(
             "--engine",
-            choices=["trufflehog", "gitleaks"],
+            choices=["trufflehog", "gitleaks", "both"],
             default="trufflehog",
-            help="Secret scanner engine (default: trufflehog)",
+            help="Secret scanner engine (default: trufflehog); 'both' runs TruffleHog and Gitleaks in parallel",
         )
+        parser.add_argument(
+            "--gitleaks-command",
+            help=(
+                "Gitleaks args for --engine both (default: derived from --command, e.g. "
+                "'filesystem .' -> 'dir .', 'git file://.' -> 'git .')"
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Scan only commits added since the last scan of this repo/branch "
+                "(git history scans) and merge with the stored findings"
+            ),
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=1,
+            help="Split the git history into N commit ranges scanned in parallel (git history scans)",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Maximum shards scanned concurrently (default: available CPUs)",
+        )
+        parser.add_argument(
+            "--shard",
+            help=(
+                "TruffleHog filesystem scans: scan only slice i of N of the files, hash-partitioned "
+                "by path (e.g. 2/4); combine the slices with 'results merge'"
+            ),
+        )
+        parser.add_argument(
+            "--dedupe",
+            action="store_true",
+            help="Collapse findings of the same secret in the same file (e.g. across commits) into one, with an occurrence count",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Baseline file of accepted findings (fingerprints only); findings listed in it are dropped before upload",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Add this scan's findings to the --baseline file (created if missing)",
+        )
+        parser.add_argument("--repo-url", default=GitInfo.get_repo_url(), help="Git repository URL (incremental state key)")
+        parser.add_argument("--repo-branch", default=GitInfo.get_branch_name(), help="Git repository branch (incremental state key)")
 
     def validate_config(self, args: argparse.Namespace, validator: ConfigValidator):
-        validator.validate_secret_scan(args.command, args.container_mode, args.engine)
+        validator.validate_secret_scan(
+            args.command,
+            args.container_mode,
+            args.engine,
+            shards=getattr(args, "shards", 1),
+            jobs=getattr(args, "jobs", None),
+            staged=getattr(args, "staged", False),
+            shard=getattr(args, "shard", None),
+            dedupe=getattr(args, "dedupe", False),
+            baseline=getattr(args, "baseline", None),
+            update_baseline=getattr(args, "update_baseline", False),
+            gitleaks_command=getattr(args, "gitleaks_command", None),
+        )
+
+    def get_result_artifacts(self, result_file):
+        if self.engine != "both":
+            return super().get_result_artifacts(result_file)
+        data_types = {"trufflehog": "TruffleHog", "gitleaks": "DS"}
+        return [(path, data_types[engine]) for engine, path in self._result_files.items()]
 
     def run_scan(self, args: argparse.Namespace) -> tuple[int, str]:
         engine = args.engine.lower()
         self.engine = engine
         self.data_type_identifier = "DS" if engine == "gitleaks" else "TruffleHog"
-        scanner = OriginalSecretScanner(args.command, args.container_mode, engine=engine)
-        return scanner.run()
+        scanner = OriginalSecretScanner(
+            args.command,
+            args.container_mode,
+            engine=engine,
+            incremental=getattr(args, "incremental", False),
+            repo_url=getattr(args, "repo_url", None),
+            repo_branch=getattr(args, "repo_branch", None),
+            shards=getattr(args, "shards", 1),
+            jobs=getattr(args, "jobs", None),
+            staged=getattr(args, "staged", False),
+            shard=parse_shard(getattr(args, "shard", None)),
+            dedupe=getattr(args, "dedupe", False),
+            baseline=getattr(args, "baseline", None),
+            update_baseline=getattr(args, "update_baseline", False),
+            gitleaks_command=getattr(args, "gitleaks_command", None),
+        )
+        result = scanner.run()
+        self._result_files = scanner.result_files
+        return result
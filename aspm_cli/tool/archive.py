@@ -0,0 +1,53 @@
+import os
+import tarfile
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+class UnsafeArchiveError(ValueError):
+    pass
+
+
+def _check_member(member: tarfile.TarInfo, dest: str) -> tarfile.TarInfo:
+    """Reject members that would land outside dest (fallback for Pythons without tarfile.data_filter)."""
+    name = member.name
+    if os.path.isabs(name) or name.startswith(("/", "\\")):
+        raise UnsafeArchiveError(f"Absolute path in archive: {name}")
+    target = os.path.realpath(os.path.join(dest, name))
+    if os.path.commonpath([dest, target]) != dest:
+        raise UnsafeArchiveError(f"Archive member escapes destination: {name}")
+    if member.issym() or member.islnk():
+        base = dest if member.islnk() else os.path.dirname(target)
+        link_target = os.path.realpath(os.path.join(base, member.linkname))
+        if os.path.isabs(member.linkname) or os.path.commonpath([dest, link_target]) != dest:
+            raise UnsafeArchiveError(f"Archive link escapes destination: {name} -> {member.linkname}")
+    elif not (member.isfile() or member.isdir()):
+        raise UnsafeArchiveError(f"Unsupported archive member type: {name}")
+    member.mode &= 0o755
+    return member
+
+
+def _counted(members: Iterator[tarfile.TarInfo], counter: list) -> Iterator[tarfile.TarInfo]:
+    for member in members:
+        counter[0] += 1
+        yield member
+
+
+def extract_tar_stream(fileobj: BinaryIO, dest: Path) -> int:
+    """
+    Extract a .tar.gz read sequentially from fileobj into dest in a single pass
+    (tarfile stream mode: no seeking, no temp file). Members that would escape
+    dest are rejected. Returns the number of members extracted.
+    """
+    dest_path = os.path.realpath(str(dest))
+    counter = [0]
+    # Keep tarfile's default record-sized buffer: large stream buffers make its
+    # per-member slicing of the decompressed buffer dominate extraction time.
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        # extractall defers directory permissions until every member is written.
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(path=dest_path, members=_counted(tar, counter), filter="data")
+        else:
+            members = (_check_member(member, dest_path) for member in tar)
+            tar.extractall(path=dest_path, members=_counted(members, counter))
+    return counter[0]
@@ -0,0 +1,298 @@
+import hashlib
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+
+import requests
+
+from aspm_cli.tool.sources import ArtifactSource, UpstreamSource, is_remote
+from aspm_cli.utils.cache import cache_dir, cache_key, read_json, write_json_atomic
+from aspm_cli.utils.http_session import shared_session
+from aspm_cli.utils.logger import Logger
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# (connect, read) timeouts; read applies per chunk, not to the whole download.
+DOWNLOAD_TIMEOUT = (15, 120)
+URL_INDEX_FILE = "urls.json"
+CHECKSUMS_ENV = "ACCUKNOX_TOOL_CHECKSUMS"
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class ChecksumMismatchError(ValueError):
+    pass
+
+
+def load_pinned_checksums(builtin: Dict[str, str]) -> Dict[str, str]:
+    """
+    Pinned SHA-256 per artifact URL: the built-in table, overridden/extended by
+    a JSON file ({"<url>": "<sha256>"}) named in ACCUKNOX_TOOL_CHECKSUMS.
+    """
+    pinned = dict(builtin)
+    manifest_path = os.getenv(CHECKSUMS_ENV, "").strip()
+    if manifest_path:
+        manifest = read_json(os.path.expanduser(manifest_path))
+        if not isinstance(manifest, dict):
+            raise ValueError(f"{CHECKSUMS_ENV} must point to a JSON object of url -> sha256")
+        pinned.update({url: str(value).lower() for url, value in manifest.items()})
+    return pinned
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hard-link source to destination (same filesystem), else copy it."""
+    destination = Path(destination)
+    if destination.exists() or destination.is_symlink():
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class ToolArtifactCache:
+    """
+    Content-addressed store for downloaded tool artifacts.
+
+    Layout under ``<cache root>/tools``:
+    - ``objects/<sha[:2]>/<sha256>``: verified artifacts
+    - ``partial/<key>.part``: interrupted downloads, resumed with HTTP Range
+    - ``urls.json``: url -> {sha256, size, etag}
+    """
+
+    def __init__(self, pinned: Optional[Dict[str, str]] = None, source: Optional[ArtifactSource] = None):
+        self.root = cache_dir("tools")
+        self.objects = cache_dir("tools", "objects")
+        self.partial = cache_dir("tools", "partial")
+        self.index_path = self.root / URL_INDEX_FILE
+        self.pinned = pinned or {}
+        # Artifacts are identified (index, pinned checksums) by their upstream URL
+        # whichever source they are actually read from.
+        self.source = source or UpstreamSource()
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / sha256
+
+    def _index(self) -> Dict[str, Dict]:
+        index = read_json(self.index_path, default={})
+        return index if isinstance(index, dict) else {}
+
+    def _record(self, url: str, entry: Dict) -> None:
+        with self._lock:
+            index = self._index()
+            index[url] = entry
+            write_json_atomic(self.index_path, index, indent=2)
+
+    def entry(self, url: str) -> Dict:
+        """Index entry (sha256, size, etag) for url, or {} if it was never downloaded."""
+        return dict(self._index().get(url) or {})
+
+    def forget(self, url: str) -> None:
+        """Drop url from the index so the next fetch downloads it again (the object stays)."""
+        with self._lock:
+            index = self._index()
+            if index.pop(url, None) is not None:
+                write_json_atomic(self.index_path, index, indent=2)
+
+    def changed_since(self, url: str, etag: str) -> bool:
+        """Conditional request: False on 304 Not Modified (or when the server cannot be reached)."""
+        location = self.source.resolve(url)
+        if not is_remote(location):
+            return False
+        try:
+            with shared_session().get(location, stream=True, timeout=DOWNLOAD_TIMEOUT,
+                                      headers={"If-None-Match": etag}) as response:
+                return response.status_code != 304 and response.ok
+        except requests.RequestException as e:
+            Logger.get_logger().debug(f"Could not check {url} for changes: {e}")
+            return False
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """Cached object for url if present, intact (size) and matching any pinned hash."""
+        entry = self._index().get(url) or {}
+        sha256 = entry.get("sha256")
+        if not sha256:
+            return None
+        expected = self.pinned.get(url)
+        if expected and expected != sha256:
+            return None
+        path = self._object_path(sha256)
+        try:
+            if path.stat().st_size != entry.get("size"):
+                return None
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, url: str, progress: Optional[ProgressCallback] = None) -> Path:
+        """Return the cached object for url, downloading (and resuming) it if needed."""
+        with self._url_lock(url):
+            cached = self.lookup(url)
+            if cached:
+                Logger.get_logger().debug(f"Using cached artifact for {url}")
+                if progress:
+                    progress("cached", 0, 0)
+                return cached
+            return self._download(url, progress)
+
+    def fetch_to(self, url: str, destination: Path, progress: Optional[ProgressCallback] = None) -> Path:
+        """Fetch url into the cache and hard-link (or copy) it to destination."""
+        source = self.fetch(url, progress)
+        link_or_copy(source, Path(destination))
+        return source
+
+    @contextmanager
+    def open_artifact(self, url: str, progress: Optional[ProgressCallback] = None) -> Iterator[BinaryIO]:
+        """
+        Yield a sequential reader over the artifact for url: the cached object if
+        present, otherwise the download itself, written to the cache and hashed as
+        it is read. The checksum is verified (ChecksumMismatchError) once the
+        caller is done, so consumers must treat their output as provisional
+        until the context exits cleanly.
+        """
+        with self._url_lock(url):
+            cached = self.lookup(url)
+            if cached:
+                if progress:
+                    progress("cached", 0, 0)
+                with open(cached, "rb") as handle:
+                    yield handle
+                return
+            with self._stream(url, progress) as stream:
+                yield stream
+                stream.drain()
+            self._commit(url, stream)
+
+    def _download(self, url: str, progress: Optional[ProgressCallback]) -> Path:
+        with self._stream(url, progress) as stream:
+            stream.drain()
+        return self._commit(url, stream)
+
+    @contextmanager
+    def _stream(self, url: str, progress: Optional[ProgressCallback]) -> Iterator["_ArtifactStream"]:
+        part = self.partial / f"{cache_key(url)}.part"
+        meta_path = self.partial / f"{cache_key(url)}.json"
+        location = self.source.resolve(url)
+
+        if not is_remote(location):
+            Logger.get_logger().debug(f"Copying {url} from {location}")
+            with open(location, "rb") as body:
+                total = os.fstat(body.fileno()).st_size
+                stream = _ArtifactStream(body, None, part, meta_path, 0, total, progress)
+                try:
+                    yield stream
+                finally:
+                    stream.close()
+            return
+
+        meta = read_json(meta_path, default={}) or {}
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {}
+        if offset and meta.get("validator"):
+            # If-Range: the server sends the full body instead of a range if the artifact changed.
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = meta["validator"]
+
+        Logger.get_logger().debug(f"Downloading {location}" + (f" (resuming at {offset} bytes)" if headers else ""))
+        response = shared_session().get(location, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers)
+        if response.status_code == 416:
+            # Stale partial (e.g. already complete): start over.
+            response.close()
+            part.unlink(missing_ok=True)
+            headers = {}
+            response = shared_session().get(location, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        with response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0
+
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            write_json_atomic(meta_path, {"url": url, "validator": validator})
+            length = int(response.headers.get("Content-Length") or 0)
+            response.raw.decode_content = True
+            stream = _ArtifactStream(
+                response.raw, response.headers.get("ETag"), part, meta_path, offset,
+                length + offset if length else 0, progress,
+            )
+            try:
+                yield stream
+            finally:
+                stream.close()
+
+    def _commit(self, url: str, stream: "_ArtifactStream") -> Path:
+        part, meta_path, sha256 = stream.part, stream.meta_path, stream.digest.hexdigest()
+        expected = self.pinned.get(url)
+        if expected and expected != sha256:
+            part.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(
+                f"Checksum mismatch for {url}: expected {expected}, got {sha256}"
+            )
+        if not expected:
+            Logger.get_logger().debug(f"No pinned checksum for {url}; recorded sha256 {sha256}")
+
+        target = self._object_path(sha256)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        size = part.stat().st_size
+        os.replace(part, target)
+        meta_path.unlink(missing_ok=True)
+        self._record(url, {"sha256": sha256, "size": size, "etag": stream.etag})
+        return target
+
+
+class _ArtifactStream:
+    """
+    File-like reader over a download: replays a resumed .part prefix, then the
+    response (or local source file) body, appending new bytes to the .part file and hashing everything.
+    """
+
+    def __init__(self, body: BinaryIO, etag: Optional[str], part: Path, meta_path: Path, offset: int,
+                 total: int, progress: Optional[ProgressCallback]):
+        self.part = part
+        self.meta_path = meta_path
+        self.etag = etag
+        self.digest = hashlib.sha256()
+        self._body = body
+        self._prefix = open(part, "rb") if offset else None
+        self._sink = open(part, "ab" if offset else "wb")
+        self._done = 0
+        self._total = total
+        self._progress = progress
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = DOWNLOAD_CHUNK_SIZE
+        data = b""
+        if self._prefix:
+            data = self._prefix.read(size)
+            if not data:
+                self._prefix.close()
+                self._prefix = None
+        if not data:
+            data = self._body.read(size)
+            self._sink.write(data)
+        self.digest.update(data)
+        self._done += len(data)
+        if self._progress and data:
+            self._progress("downloading", self._done, self._total)
+        return data
+
+    def drain(self) -> None:
+        """Consume whatever the reader left unread (tar padding, trailing bytes)."""
+        while self.read(DOWNLOAD_CHUNK_SIZE):
+            pass
+        self._sink.flush()
+
+    def close(self) -> None:
+        if self._prefix:
+            self._prefix.close()
+            self._prefix = None
+        self._sink.close()
@@ -5,10 +5,16 @@ import subprocess
 import sys
 import tarfile
 import tempfile
-import urllib.request
+import re
+import threading
+import uuid
 import zipfile
 from pathlib import Path
 
+from aspm_cli.tool.archive import extract_tar_stream
+from aspm_cli.tool.cache import ToolArtifactCache, load_pinned_checksums
+from aspm_cli.tool.manifest import InstalledManifest
+from aspm_cli.tool.sources import select_source
 from aspm_cli.utils.docker_runtime import cpu_arch, local_tool_install_supported, platform_name
 from aspm_cli.utils.logger import Logger
 
@@ -24,6 +30,21 @@ OPENGREP_VERSION_LINUX = "v1.0.0-alpha.14"
 OPENGREP_VERSION_DARWIN = "v1.22.0"
 OPENGREP_RULES_COMMIT = "f1d2b562b414783763fd02a6ed2736eaed622efa"
 
+# Pinned SHA-256 per artifact URL, verified before an artifact enters the tool cache.
+# Add an entry when bumping a version; ACCUKNOX_TOOL_CHECKSUMS can extend or override it.
+PINNED_SHA256 = {}
+
+# Version recorded in installed.json for natively installed (macOS/Windows) tools.
+# Linux bundles are versioned by the release tag in their URL.
+NATIVE_TOOL_VERSIONS = {
+    "iac": CHECKOV_VERSION,
+    "secret": TRUFFLEHOG_VERSION,
+    "container": TRIVY_VERSION,
+    "gitleaks": GITLEAKS_VERSION,
+    "sq-sast": SONAR_SCANNER_VERSION,
+    "sast": f"{OPENGREP_VERSION_DARWIN}+rules.{OPENGREP_RULES_COMMIT[:12]}",
+}
+
 # Tools with native macOS installers (Intel x86_64 + Apple Silicon arm64).
 DARWIN_SUPPORTED_TOOLS = frozenset({
     "iac",
@@ -45,6 +66,12 @@ WINDOWS_SUPPORTED_TOOLS = frozenset({
 })
 
 
+def _release_tag(url: str) -> str:
+    """Release tag of a GitHub release asset URL (falls back to the URL itself)."""
+    match = re.search(r"/releases/download/([^/]+)/", url)
+    return match.group(1) if match else url
+
+
 class ToolDownloader:
     TOOL_URLS = {
         "Windows": {
@@ -62,19 +89,39 @@ class ToolDownloader:
         },
     }
 
-    def __init__(self):
+    def __init__(self, install_dir=None, source=None):
+        """
+        :param install_dir: Override the per-user install directory (used to stage bundles)
+        :param source: Artifact source spec (see tool.sources.select_source); defaults to ACCUKNOX_TOOL_SOURCE
+        """
         self.system = platform.system()
         self.is_windows = self.system == "Windows"
         self.is_darwin = self.system == "Darwin"
 
-        if self.is_windows:
+        if install_dir:
+            self.install_dir = Path(install_dir)
+        elif self.is_windows:
             self.install_dir = Path(os.getenv("USERPROFILE")) / "AppData" / "Local" / "Programs" / "AccuKnox"
         else:
             self.install_dir = Path.home() / ".local" / "bin" / "accuknox"
 
         self.install_dir.mkdir(parents=True, exist_ok=True)
+        self.source = select_source(source)
+        self.cache = ToolArtifactCache(load_pinned_checksums(PINNED_SHA256), source=self.source)
+        # Upstream URLs each tool's installer fetched, for `tool bundle create`.
+        self.fetched_artifacts = {}
+        self.manifest = InstalledManifest(self.install_dir)
+        # Per-thread progress callback so one downloader can serve parallel installs.
+        self._local = threading.local()
+
+    def download_tool(self, tool_type, overwrite=False, progress=None):
+        """
+        Install tool_type unless the installed copy is already current.
 
-    def download_tool(self, tool_type, overwrite=False):
+        :param overwrite: ``tool update`` semantics: also replace installs of unknown version
+        :param progress: Optional callable(stage, done=0, total=0) for download/extract progress
+        """
+        self._local.progress = progress
         if not local_tool_install_supported():
             Logger.get_logger().error(
                 f"Local scanner tool install is not supported on {platform_name()}. "
@@ -83,54 +130,45 @@ class ToolDownloader:
             return False
 
         if self.is_windows:
-            return self._download_windows_tool(tool_type, overwrite=overwrite)
-
-        if self.is_darwin:
-            return self._download_darwin_tool(tool_type, overwrite=overwrite)
+            plan = self._windows_plan(tool_type)
+        elif self.is_darwin:
+            plan = self._darwin_plan(tool_type)
+        else:
+            plan = self._linux_plan(tool_type)
+        if plan is None:
+            return False
 
-        return self._download_linux_tarball(tool_type, overwrite=overwrite)
+        version, url, installer = plan
+        if self._is_current(tool_type, version, url, overwrite):
+            return True
+        return self._install(tool_type, version, installer)
 
-    def _download_linux_tarball(self, tool_type, overwrite=False):
+    def _linux_plan(self, tool_type):
         download_url = self.TOOL_URLS.get("Linux", {}).get(tool_type)
         if not download_url:
             Logger.get_logger().error(f"No download URL found for {tool_type} on {self.system}")
-            return False
+            return None
 
-        destination = self.install_dir / tool_type
-        if not self._prepare_destination(destination, tool_type, overwrite):
-            return False
+        def install():
+            Logger.get_logger().debug(f"Downloading {tool_type} from {download_url}")
+            return self._download_and_extract_tar_gz(download_url, self._staging_dir(), tool_type)
 
-        Logger.get_logger().debug(f"Downloading {tool_type} from {download_url}")
-        return self._download_and_extract_tar_gz(download_url, self.install_dir, tool_type)
+        return _release_tag(download_url), download_url, install
 
-    def _download_darwin_tool(self, tool_type, overwrite=False):
+    def _darwin_plan(self, tool_type):
         if tool_type not in DARWIN_SUPPORTED_TOOLS:
             Logger.get_logger().error(
                 f"Local install for '{tool_type}' is not available on macOS yet. "
                 f"Supported local tools: {', '.join(sorted(DARWIN_SUPPORTED_TOOLS))}. "
                 "Use --container-mode for this scanner, or install Docker Desktop."
             )
-            return False
+            return None
 
         try:
             arch = cpu_arch()
         except ValueError as e:
             Logger.get_logger().error(str(e))
-            return False
-
-        destination = self.install_dir / tool_type
-        # sast layout uses a folder named "sast"; sq-sast folder; others are files or folders
-        dest_paths = {
-            "iac": self.install_dir / "iac",
-            "secret": self.install_dir / "secret",
-            "container": self.install_dir / "container",
-            "gitleaks": self.install_dir / "gitleaks",
-            "sast": self.install_dir / "sast",
-            "sq-sast": self.install_dir / "sq-sast",
-        }
-        destination = dest_paths[tool_type]
-        if not self._prepare_destination(destination, tool_type, overwrite):
-            return False
+            return None
 
         installers = {
             "iac": self._install_darwin_iac,
@@ -140,52 +178,138 @@ class ToolDownloader:
             "gitleaks": self._install_darwin_gitleaks,
             "sq-sast": self._install_darwin_sq_sast,
         }
+        return f"{NATIVE_TOOL_VERSIONS[tool_type]}-{arch}", None, lambda: installers[tool_type](arch)
+
+    def _windows_plan(self, tool_type):
+        if tool_type not in WINDOWS_SUPPORTED_TOOLS:
+            Logger.get_logger().error(
+                f"Local install for '{tool_type}' is not available on Windows yet. "
+                f"Supported local tools: {', '.join(sorted(WINDOWS_SUPPORTED_TOOLS))}. "
+                "Use --container-mode for this scanner, or install Docker Desktop."
+            )
+            return None
+
+        installers = {
+            "iac": self._install_windows_iac,
+            "sast": self._install_windows_sast,
+            "secret": self._install_windows_secret,
+            "container": self._install_windows_container,
+            "gitleaks": self._install_windows_gitleaks,
+            "sq-sast": self._install_windows_sq_sast,
+        }
+        return NATIVE_TOOL_VERSIONS[tool_type], None, installers[tool_type]
+
+    def _is_current(self, tool_type, version, url, overwrite) -> bool:
+        """True if the installed tool_type matches version (and url) and need not be downloaded."""
+        installed = [path for path in (self.install_dir / tool_type, self.install_dir / f"{tool_type}.exe")
+                     if path.exists()]
+        if not installed:
+            return False
+
+        entry = self.manifest.get(tool_type)
+        if entry is None:
+            if overwrite:
+                return False
+            Logger.get_logger().warning(
+                f"{tool_type} already exists (version unknown). Skipping download; "
+                f"run 'tool update --type {tool_type}' to replace it."
+            )
+            return True
+
+        if entry.get("version") != version or (url and entry.get("url") != url):
+            Logger.get_logger().info(f"{tool_type} {entry.get('version')} is outdated; installing {version}.")
+            return False
+
+        # Same URL: ask the server whether the artifact changed since it was installed.
+        if overwrite and url and entry.get("etag") and self.cache.changed_since(url, entry["etag"]):
+            Logger.get_logger().info(f"{tool_type} {version} changed upstream; reinstalling.")
+            self.cache.forget(url)
+            return False
+
+        Logger.get_logger().info(f"{tool_type} {version} is already up to date.")
+        return True
+
+    def _install(self, tool_type, version, installer) -> bool:
+        # Installers build into a staging directory next to the install dir; the
+        # result is swapped in with renames, so a running scan never sees a
+        # half-removed or half-extracted tool.
+        staging = Path(tempfile.mkdtemp(prefix=f".{tool_type}-staging-", dir=str(self.install_dir)))
+        self._local.staging = staging
+        self._local.artifacts = []
         try:
-            return installers[tool_type](arch)
+            if not installer():
+                return False
+            for entry in staging.iterdir():
+                self._replace_path(entry, self.install_dir / entry.name)
         except Exception as e:
-            Logger.get_logger().error(f"Failed to install {tool_type} for macOS ({arch}): {e}")
+            Logger.get_logger().error(f"Failed to install {tool_type} for {platform_name()}: {e}")
             return False
+        finally:
+            self._local.staging = None
+            shutil.rmtree(staging, ignore_errors=True)
 
-    def _prepare_destination(self, destination: Path, tool_type: str, overwrite: bool) -> bool:
-        if destination.exists():
-            if overwrite:
-                Logger.get_logger().debug(f"Overwriting existing {tool_type} at {destination}")
-                try:
-                    if destination.is_dir():
-                        shutil.rmtree(destination)
-                    else:
-                        destination.unlink()
-                except Exception as e:
-                    Logger.get_logger().error(f"Failed to remove existing {tool_type}: {e}")
-                    return False
-            else:
-                Logger.get_logger().warning(f"{tool_type} already exists. Skipping download.")
-                return True
+        self.fetched_artifacts[tool_type] = list(self._local.artifacts)
+        url = self._local.artifacts[0] if self._local.artifacts else None
+        artifact = self.cache.entry(url) if url else {}
+        self.manifest.record(tool_type, version, url, etag=artifact.get("etag"), sha256=artifact.get("sha256"))
         return True
 
+    def _staging_dir(self) -> Path:
+        return self._local.staging
+
+    def _report(self, stage: str, done: int = 0, total: int = 0):
+        progress = getattr(self._local, "progress", None)
+        if progress:
+            progress(stage, done, total)
+
+    def _track(self, url: str):
+        # The first artifact an installer fetches is the one recorded in installed.json.
+        artifacts = getattr(self._local, "artifacts", None)
+        if artifacts is not None:
+            artifacts.append(url)
+
     def _download_file(self, url: str, dest: Path):
-        Logger.get_logger().debug(f"Downloading {url}")
-        urllib.request.urlretrieve(url, dest)
+        """Fetch url through the tool cache (resumable, checksum-verified) and link it to dest."""
+        self._track(url)
+        self.cache.fetch_to(url, dest, progress=self._report)
 
     def _download_and_extract_tar_gz(self, url: str, extract_to: Path, tool_type: str) -> bool:
-        with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp:
-            tmp_name = tmp.name
+        # Stream the archive straight into tarfile: it is hashed, cached and
+        # extracted in one pass. extract_to is a staging directory that is only
+        # swapped into place once the checksum has been verified.
+        self._track(url)
         try:
-            self._download_file(url, Path(tmp_name))
-            with tarfile.open(tmp_name, "r:gz") as tar:
-                members = tar.getmembers()
-                if not members:
+            with self.cache.open_artifact(url, progress=self._report) as artifact:
+                self._report("extracting")
+                if not extract_tar_stream(artifact, extract_to):
                     Logger.get_logger().error(f"Archive for {tool_type} is empty.")
                     return False
-                tar.extractall(path=extract_to)
             Logger.get_logger().debug(f"Extracted {tool_type} to {extract_to}")
             return True
         except Exception as e:
             Logger.get_logger().error(f"Failed to extract {tool_type}: {e}")
             return False
-        finally:
-            if os.path.exists(tmp_name):
-                os.unlink(tmp_name)
+
+    def _replace_path(self, source: Path, destination: Path):
+        if not (destination.exists() or destination.is_symlink()):
+            os.replace(source, destination)
+            return
+        if not self.is_windows and not destination.is_dir() and not source.is_dir():
+            os.replace(source, destination)
+            return
+        # Directories (and in-use files on Windows) cannot be replaced in one
+        # step: move the old copy aside first so the new one appears with a
+        # single rename, then remove the old copy.
+        retired = destination.with_name(f".{destination.name}.old-{uuid.uuid4().hex[:8]}")
+        os.replace(destination, retired)
+        os.replace(source, destination)
+        if retired.is_dir() and not retired.is_symlink():
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            try:
+                retired.unlink()
+            except OSError:
+                Logger.get_logger().debug(f"Could not remove {retired}; it is still in use")
 
     def _chmod_x(self, path: Path):
         path.chmod(path.stat().st_mode | 0o111)
@@ -198,8 +322,8 @@ class ToolDownloader:
         inside is arm64. Use that zip on Apple Silicon. On Intel macOS, install Checkov
         into a dedicated venv via pip (no usable x86_64 standalone zip).
         """
-        dest = self.install_dir / "iac"
-        venv_dir = self.install_dir / "iac-venv"
+        dest = self._staging_dir() / "iac"
+        venv_dir = self.install_dir / "iac-venv"  # venvs are not relocatable: built in place
 
         if arch == "x86_64":
             Logger.get_logger().info(
@@ -261,7 +385,7 @@ class ToolDownloader:
             f"https://github.com/opengrep/opengrep/releases/download/"
             f"{OPENGREP_VERSION_DARWIN}/{binary_name}"
         )
-        sast_dir = self.install_dir / "sast"
+        sast_dir = self._staging_dir() / "sast"
         sast_dir.mkdir(parents=True, exist_ok=True)
         dest = sast_dir / "sast"
         self._download_file(url, dest)
@@ -305,7 +429,7 @@ class ToolDownloader:
             with tarfile.open(tar_path, "r:gz") as tar:
                 tar.extractall(path=tmp)
             src = Path(tmp) / "trufflehog"
-            dest = self.install_dir / "secret"
+            dest = self._staging_dir() / "secret"
             shutil.copy2(src, dest)
             self._chmod_x(dest)
         return True
@@ -321,7 +445,7 @@ class ToolDownloader:
             with tarfile.open(tar_path, "r:gz") as tar:
                 tar.extractall(path=tmp)
             src = Path(tmp) / "trivy"
-            dest = self.install_dir / "container"
+            dest = self._staging_dir() / "container"
             shutil.copy2(src, dest)
             self._chmod_x(dest)
         return True
@@ -339,7 +463,7 @@ class ToolDownloader:
             with tarfile.open(tar_path, "r:gz") as tar:
                 tar.extractall(path=tmp)
             src = Path(tmp) / "gitleaks"
-            dest = self.install_dir / "gitleaks"
+            dest = self._staging_dir() / "gitleaks"
             shutil.copy2(src, dest)
             self._chmod_x(dest)
         return True
@@ -360,7 +484,7 @@ class ToolDownloader:
             )
             if extracted is None:
                 raise FileNotFoundError("sonar-scanner directory not found in archive")
-            dest = self.install_dir / "sq-sast"
+            dest = self._staging_dir() / "sq-sast"
             if dest.exists():
                 shutil.rmtree(dest)
             shutil.copytree(extracted, dest)
@@ -372,42 +496,6 @@ class ToolDownloader:
                             self._chmod_x(helper)
         return True
 
-    def _download_windows_tool(self, tool_type, overwrite=False):
-        if tool_type not in WINDOWS_SUPPORTED_TOOLS:
-            Logger.get_logger().error(
-                f"Local install for '{tool_type}' is not available on Windows yet. "
-                f"Supported local tools: {', '.join(sorted(WINDOWS_SUPPORTED_TOOLS))}. "
-                "Use --container-mode for this scanner, or install Docker Desktop."
-            )
-            return False
-
-        # Prefer checking both extensionless and .exe destinations for overwrite.
-        dest_candidates = {
-            "iac": [self.install_dir / "iac.exe", self.install_dir / "iac"],
-            "secret": [self.install_dir / "secret.exe", self.install_dir / "secret"],
-            "container": [self.install_dir / "container.exe", self.install_dir / "container"],
-            "gitleaks": [self.install_dir / "gitleaks.exe", self.install_dir / "gitleaks"],
-            "sast": [self.install_dir / "sast"],
-            "sq-sast": [self.install_dir / "sq-sast"],
-        }
-        for destination in dest_candidates[tool_type]:
-            if destination.exists() and not self._prepare_destination(destination, tool_type, overwrite):
-                return False
-
-        installers = {
-            "iac": self._install_windows_iac,
-            "sast": self._install_windows_sast,
-            "secret": self._install_windows_secret,
-            "container": self._install_windows_container,
-            "gitleaks": self._install_windows_gitleaks,
-            "sq-sast": self._install_windows_sq_sast,
-        }
-        try:
-            return installers[tool_type]()
-        except Exception as e:
-            Logger.get_logger().error(f"Failed to install {tool_type} for Windows: {e}")
-            return False
-
     def _find_extracted_file(self, root: Path, names) -> Path:
         for name in names:
             direct = root / name
@@ -430,7 +518,7 @@ class ToolDownloader:
             with zipfile.ZipFile(zip_path, "r") as zf:
                 zf.extractall(tmp)
             src = self._find_extracted_file(Path(tmp), ["checkov.exe", "checkov"])
-            dest = self.install_dir / "iac.exe"
+            dest = self._staging_dir() / "iac.exe"
             shutil.copy2(src, dest)
         return True
 
@@ -439,7 +527,7 @@ class ToolDownloader:
             f"https://github.com/opengrep/opengrep/releases/download/"
             f"{OPENGREP_VERSION_DARWIN}/opengrep_windows_x86.exe"
         )
-        sast_dir = self.install_dir / "sast"
+        sast_dir = self._staging_dir() / "sast"
         sast_dir.mkdir(parents=True, exist_ok=True)
         dest = sast_dir / "sast.exe"
         self._download_file(url, dest)
@@ -480,7 +568,7 @@ class ToolDownloader:
             with tarfile.open(tar_path, "r:gz") as tar:
                 tar.extractall(path=tmp)
             src = self._find_extracted_file(Path(tmp), ["trufflehog.exe", "trufflehog"])
-            dest = self.install_dir / "secret.exe"
+            dest = self._staging_dir() / "secret.exe"
             shutil.copy2(src, dest)
         return True
 
@@ -493,7 +581,7 @@ class ToolDownloader:
             with zipfile.ZipFile(zip_path, "r") as zf:
                 zf.extractall(tmp)
             src = self._find_extracted_file(Path(tmp), ["trivy.exe", "trivy"])
-            dest = self.install_dir / "container.exe"
+            dest = self._staging_dir() / "container.exe"
             shutil.copy2(src, dest)
         return True
 
@@ -509,7 +597,7 @@ class ToolDownloader:
             with zipfile.ZipFile(zip_path, "r") as zf:
                 zf.extractall(tmp)
             src = self._find_extracted_file(Path(tmp), ["gitleaks.exe", "gitleaks"])
-            dest = self.install_dir / "gitleaks.exe"
+            dest = self._staging_dir() / "gitleaks.exe"
             shutil.copy2(src, dest)
         return True
 
@@ -527,7 +615,7 @@ class ToolDownloader:
             )
             if extracted is None:
                 raise FileNotFoundError("sonar-scanner directory not found in archive")
-            dest = self.install_dir / "sq-sast"
+            dest = self._staging_dir() / "sq-sast"
             if dest.exists():
                 shutil.rmtree(dest)
             shutil.copytree(extracted, dest)
@@ -0,0 +1,42 @@
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from aspm_cli.utils.cache import read_json, write_json_atomic
+
+MANIFEST_FILE = "installed.json"
+
+
+class InstalledManifest:
+    """
+    ``installed.json`` in the tool install directory: what each installed tool
+    is (version, source URL, ETag and SHA-256 of the primary artifact), so
+    ``tool install``/``tool update`` can tell current installs from stale ones.
+    """
+
+    def __init__(self, install_dir: Path):
+        self.path = Path(install_dir) / MANIFEST_FILE
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        data = read_json(self.path, default={})
+        return data if isinstance(data, dict) else {}
+
+    def get(self, tool_type: str) -> Optional[Dict]:
+        entry = self._load().get(tool_type)
+        return entry if isinstance(entry, dict) else None
+
+    def record(self, tool_type: str, version: Optional[str], url: Optional[str],
+               etag: Optional[str] = None, sha256: Optional[str] = None) -> None:
+        with self._lock:
+            # Re-read under the lock: parallel installs each record their own tool.
+            data = self._load()
+            data[tool_type] = {
+                "version": version,
+                "url": url,
+                "etag": etag,
+                "sha256": sha256,
+                "installed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            write_json_atomic(self.path, data, indent=2)
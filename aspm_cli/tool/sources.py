@@ -0,0 +1,152 @@
+import io
+import json
+import os
+import tarfile
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+from aspm_cli.utils.cache import cache_dir, cache_key
+
+SOURCE_ENV = "ACCUKNOX_TOOL_SOURCE"
+BUNDLE_INDEX = "bundle.json"
+BUNDLE_COMPLETE_MARKER = ".complete"
+
+
+def is_remote(location: str) -> bool:
+    return location.startswith(("http://", "https://"))
+
+
+def artifact_path(url: str) -> str:
+    """Relative path of an upstream artifact inside a mirror, directory or bundle: ``<host>/<path>``."""
+    parsed = urlsplit(url)
+    return f"{parsed.netloc}/{parsed.path.lstrip('/')}"
+
+
+class ArtifactSource(ABC):
+    """
+    Where tool artifacts are read from. Installers always ask for the upstream
+    URL; a source maps it to the location it actually serves it from.
+    """
+
+    @abstractmethod
+    def resolve(self, url: str) -> str:
+        """Location (URL or local path) to read the upstream artifact url from."""
+        pass
+
+    @abstractmethod
+    def describe(self) -> str:
+        """Short description of the source for log messages."""
+        pass
+
+
+class UpstreamSource(ArtifactSource):
+    """The vendors' release URLs (github.com, binaries.sonarsource.com, ...)."""
+
+    def resolve(self, url: str) -> str:
+        return url
+
+    def describe(self) -> str:
+        return "upstream"
+
+
+class MirrorSource(ArtifactSource):
+    """An HTTP(S) mirror laid out as ``<base>/<host>/<path>`` (e.g. an unpacked bundle behind nginx)."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def resolve(self, url: str) -> str:
+        return f"{self.base_url}/{artifact_path(url)}"
+
+    def describe(self) -> str:
+        return f"mirror {self.base_url}"
+
+
+class DirectorySource(ArtifactSource):
+    """A local or network-mounted directory laid out as ``<dir>/<host>/<path>``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def resolve(self, url: str) -> str:
+        path = self.root.joinpath(*artifact_path(url).split("/"))
+        if not path.is_file():
+            raise FileNotFoundError(f"{url} is not available in tool source {self.root} (expected {path})")
+        return str(path)
+
+    def describe(self) -> str:
+        return f"directory {self.root}"
+
+
+class BundleSource(DirectorySource):
+    """A bundle tarball from ``tool bundle create``, unpacked once into the user cache."""
+
+    def __init__(self, bundle: Path):
+        self.bundle = Path(bundle)
+        stat = self.bundle.stat()
+        super().__init__(cache_dir("tools", "bundles", cache_key(self.bundle.resolve(), stat.st_size, stat.st_mtime_ns)))
+        if not (self.root / BUNDLE_COMPLETE_MARKER).exists():
+            self._unpack()
+
+    def _unpack(self) -> None:
+        with tarfile.open(self.bundle, "r:*") as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(self.root, filter="data")
+            else:
+                root = os.path.realpath(self.root)
+                for member in tar.getmembers():
+                    target = os.path.realpath(os.path.join(root, member.name))
+                    if not member.isfile() or os.path.commonpath([root, target]) != root:
+                        continue
+                    tar.extract(member, root)
+        (self.root / BUNDLE_COMPLETE_MARKER).touch()
+
+    def describe(self) -> str:
+        return f"bundle {self.bundle}"
+
+
+def select_source(spec: Optional[str] = None) -> ArtifactSource:
+    """
+    Build the artifact source from --source or ACCUKNOX_TOOL_SOURCE:
+    ``upstream`` (default), an ``http(s)://`` mirror base URL, a local
+    directory, or a bundle tarball (plain path or ``file://``).
+    """
+    spec = (spec if spec is not None else os.getenv(SOURCE_ENV, "")).strip()
+    if not spec or spec == "upstream":
+        return UpstreamSource()
+    if is_remote(spec):
+        return MirrorSource(spec)
+
+    path = Path(unquote(urlsplit(spec).path) if spec.startswith("file://") else spec).expanduser()
+    if path.is_dir():
+        return DirectorySource(path)
+    if path.is_file():
+        return BundleSource(path)
+    raise ValueError(f"Tool source not found: {spec}")
+
+
+def create_bundle(output: Path, artifacts: Dict[str, Path], meta: Dict[str, Dict]) -> int:
+    """
+    Write a bundle tarball: each artifact at ``<host>/<path>`` plus a bundle.json
+    index (url -> sha256, size). Artifacts are already compressed, so the tar is not.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    index = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "artifacts": {url: meta.get(url, {}) for url in sorted(artifacts)},
+    }
+    tmp = output.with_name(f".{output.name}.tmp")
+    with tarfile.open(tmp, "w") as tar:
+        for url in sorted(artifacts):
+            tar.add(str(artifacts[url]), arcname=artifact_path(url), recursive=False)
+        payload = json.dumps(index, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(BUNDLE_INDEX)
+        info.size = len(payload)
+        info.mtime = int(datetime.now().timestamp())
+        tar.addfile(info, io.BytesIO(payload))
+    os.replace(tmp, output)
+    return len(artifacts)
@@ -1,9 +1,14 @@
+import json
 import os
 import shlex
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 DEFAULT_RESULT_FILE = "results.json"
 DOCKER_WORKDIR = "/workdir"
+# code2api item fields holding a source file path relative to the scanned root.
+FILE_FIELDS = ("file", "file_path", "filename", "source_file")
+# Where an entry was found rather than what it is: left out of its identity when merging roots.
+LOCATION_FIELDS = (*FILE_FIELDS, "line", "line_number", "lineno", "start_line", "end_line", "source_roots")
 
 
 def parse_scan_path_from_command(command: str) -> str:
@@ -84,6 +89,13 @@ def normalize_code2api_args(command: str, output_file: str = DEFAULT_RESULT_FILE
     return normalized
 
 
+def _strip_dot_slash(path: str) -> str:
+    # Only leading "./" segments: dot-directories such as .accuknox-api-discovery keep their name.
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
 def normalize_code2api_args_for_docker(args: List[str], cwd: Optional[str] = None) -> List[str]:
     """Rewrite relative -path values for container /workdir mount."""
     cwd = cwd or os.getcwd()
@@ -100,15 +112,123 @@ def normalize_code2api_args_for_docker(args: List[str], cwd: Optional[str] = Non
     if target in (".", ""):
         result[path_idx + 1] = DOCKER_WORKDIR
     elif not os.path.isabs(target) and not target.startswith(DOCKER_WORKDIR):
-        result[path_idx + 1] = f"{DOCKER_WORKDIR}/{target.lstrip('./')}"
+        result[path_idx + 1] = f"{DOCKER_WORKDIR}/{_strip_dot_slash(target)}"
 
     try:
         output_idx = result.index("-output")
         if output_idx + 1 < len(result):
             output = result[output_idx + 1]
             if not os.path.isabs(output) and not output.startswith(DOCKER_WORKDIR):
-                result[output_idx + 1] = f"{DOCKER_WORKDIR}/{output.lstrip('./')}"
+                result[output_idx + 1] = f"{DOCKER_WORKDIR}/{_strip_dot_slash(output)}"
     except ValueError:
         pass
 
     return result
+
+
+def code2api_paths(args: List[str]) -> List[str]:
+    """Every -path value of normalized code2api args, in order."""
+    return [args[i + 1] for i, arg in enumerate(args[:-1]) if arg == "-path"]
+
+
+def with_single_root(args: List[str], root: str, output: str) -> List[str]:
+    """Normalized args scanning only root and writing to output."""
+    result = []
+    i = 0
+    while i < len(args):
+        if args[i] in ("-path", "-output") and i + 1 < len(args):
+            i += 2
+            continue
+        result.append(args[i])
+        i += 1
+    return ["-path", root, "-output", output, *result]
+
+
+def _attribute(item: Any, root: str) -> Any:
+    if not isinstance(item, dict):
+        return item
+    tagged = dict(item)
+    for field in FILE_FIELDS:
+        value = tagged.get(field)
+        if isinstance(value, str) and value and not os.path.isabs(value) and root not in (".", ""):
+            normalized = value.replace(os.sep, "/").lstrip("/")
+            prefix = root.replace(os.sep, "/").strip("/") + "/"
+            if not normalized.startswith(prefix):
+                tagged[field] = prefix + normalized
+    return tagged
+
+
+def _endpoint_identity(item: Any) -> str:
+    if isinstance(item, dict):
+        item = {key: value for key, value in item.items() if key not in LOCATION_FIELDS}
+    return json.dumps(item, sort_keys=True)
+
+
+def _list_counts(merged: Dict[str, Any]) -> Dict[str, int]:
+    """Summary names a count of each merged list can be reported under."""
+    counts = {}
+    for key, items in merged.items():
+        if isinstance(items, list):
+            for name in (key, f"total_{key}", f"{key}_count"):
+                counts[name] = len(items)
+    return counts
+
+
+def _merge_summaries(summaries: Sequence[Dict[str, Any]], merged: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summary of the merged report. Counts of the merged lists are recomputed; other
+    counts (and nested breakdowns) cannot be after de-duplication and are dropped.
+    Other values are kept when every root reported the same one.
+    """
+    counts = _list_counts(merged)
+    summary: Dict[str, Any] = {}
+    dropped = set()
+    for report_summary in summaries:
+        for name, value in report_summary.items():
+            if name in counts:
+                summary[name] = counts[name]
+            elif isinstance(value, (int, float, dict, list)) and not isinstance(value, bool):
+                dropped.add(name)
+            elif name not in summary:
+                summary[name] = value
+            elif summary[name] != value:
+                dropped.add(name)
+    return {name: value for name, value in summary.items() if name not in dropped}
+
+
+def merge_code2api_reports(reports: Sequence[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    One code2api report from per-root reports. List entries (internal_apis,
+    external_apis, ...) are de-duplicated on what they describe, leaving out where
+    they were found (file, line), so an endpoint reported by several roots is kept
+    once. Each entry lists every root that reported it in source_roots; its file
+    paths, made relative to the scan directory, are those of the first. Summary
+    counts of those lists are recomputed from the merged lists.
+    """
+    merged: Dict[str, Any] = {}
+    summaries = []
+    seen: Dict[str, Dict[str, Any]] = {}
+    for root, report in reports:
+        for key, value in report.items():
+            if key == "summary" and isinstance(value, dict):
+                summaries.append(value)
+            elif isinstance(value, list):
+                items = merged.setdefault(key, [])
+                entries = seen.setdefault(key, {})
+                for item in value:
+                    identity = _endpoint_identity(item)
+                    entry = entries.get(identity)
+                    if entry is None:
+                        entry = entries[identity] = _attribute(item, root)
+                        items.append(entry)
+                        if isinstance(entry, dict):
+                            entry["source_roots"] = []
+                    if isinstance(entry, dict) and root not in entry["source_roots"]:
+                        entry["source_roots"].append(root)
+            else:
+                merged.setdefault(key, value)
+
+    if summaries:
+        merged["summary"] = _merge_summaries(summaries, merged)
+    merged["source_roots"] = [root for root, _ in reports]
+    return merged
@@ -0,0 +1,230 @@
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from aspm_cli.utils.git_info import GitInfo
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.subprocess_utils import default_job_count, worker_process_context
+
+TRIVY_SCAN_TYPES = frozenset({"sca", "container"})
+CHECKOUTS_DIR = "checkouts"
+LOGS_DIR = "logs"
+
+
+def load_manifest(path: str) -> Dict:
+    """Read a batch manifest: JSON, or YAML (``.yaml``/``.yml``, needs PyYAML)."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); or use a JSON manifest.")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Manifest {path} must be a mapping with a 'repos' list.")
+    return data
+
+
+def _git(*args: str, cwd: Optional[str] = None) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def _is_git_repo(path: str) -> bool:
+    try:
+        _git("rev-parse", "--git-dir", cwd=path)
+        return True
+    except (subprocess.CalledProcessError, OSError):
+        return False
+
+
+def checkout_repo(repo: Dict, checkouts: str) -> Optional[str]:
+    """
+    Check a repository out into its worker directory with ``git clone --shared``
+    (objects are borrowed from the source, nothing is copied), at ``ref`` if set.
+    The clone keeps the source's ``origin`` URL so results carry the real repo URL.
+    Returns None for a directory that is not a git repository: it is scanned in place.
+    """
+    source = os.path.abspath(os.path.expanduser(repo["path"]))
+    if not _is_git_repo(source):
+        if repo.get("ref"):
+            raise ValueError(f"{source} is not a git repository; 'ref' cannot be checked out.")
+        return None
+
+    if repo["name"] in ("", ".", "..") or os.path.basename(repo["name"]) != repo["name"]:
+        raise ValueError(f"Invalid repository name '{repo['name']}'.")
+    dest = os.path.join(checkouts, repo["name"])
+    shutil.rmtree(dest, ignore_errors=True)
+    _git("clone", "--quiet", "--shared", "--no-checkout", source, dest)
+    _git("checkout", "--quiet", *([repo["ref"]] if repo.get("ref") else []), cwd=dest)
+    try:
+        origin = repo.get("url") or _git("config", "--get", "remote.origin.url", cwd=source)
+    except subprocess.CalledProcessError:
+        origin = None
+    if origin:
+        _git("remote", "set-url", "origin", origin, cwd=dest)
+    return dest
+
+
+@contextlib.contextmanager
+def _output_to(log_path: str):
+    """Send this process's stdout/stderr (and the CLI's logging) to log_path."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    with open(log_path, "ab") as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+    Logger.rebind_streams()
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved_fd in zip((1, 2), saved):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        Logger.rebind_streams()
+
+
+def _run_cli(argv: List[str]) -> int:
+    from aspm_cli.cli import build_parser
+
+    try:
+        # Built in the repo's directory: git-derived defaults describe this repo.
+        args = build_parser().parse_args(argv)
+        args.func(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        Logger.get_logger().error(f"Command execution failed: {e}")
+        return 1
+    return 0
+
+
+def scan_repo(task: Dict) -> Dict:
+    """Pool worker: check out one repository and run its scans in order, logging to its own file."""
+    repo = task["repo"]
+    outcome = {"name": repo["name"], "scans": [], "error": None, "log": task["log"]}
+    started = time.monotonic()
+    previous_cwd = os.getcwd()
+    checkout = None
+    # Reads memoized for the previous repository of this worker describe another checkout.
+    GitInfo.clear_memo()
+    with _output_to(task["log"]):
+        try:
+            checkout = checkout_repo(repo, task["checkouts"])
+            os.chdir(checkout or os.path.abspath(os.path.expanduser(repo["path"])))
+            for scan in repo["scans"]:
+                scan_started = time.monotonic()
+                Logger.get_logger().info(f"--- {scan['type']} scan of {repo['name']} ---")
+                code = _run_cli(["scan", *task["options"], scan["type"], *scan["args"]])
+                outcome["scans"].append({
+                    "type": scan["type"],
+                    "exit_code": code,
+                    "duration": round(time.monotonic() - scan_started, 1),
+                })
+        except (subprocess.CalledProcessError, OSError, ValueError) as e:
+            detail = getattr(e, "stderr", None) or str(e)
+            Logger.get_logger().error(f"Could not prepare {repo['name']}: {detail}")
+            outcome["error"] = str(detail).strip().splitlines()[-1] if str(detail).strip() else "checkout failed"
+        finally:
+            os.chdir(previous_cwd)
+            if checkout and not task["keep_checkouts"]:
+                shutil.rmtree(checkout, ignore_errors=True)
+    outcome["duration"] = round(time.monotonic() - started, 1)
+    return outcome
+
+
+@contextlib.contextmanager
+def _shared_trivy(manifest):
+    """Point every Trivy run of the batch at one shared cache whose DBs are downloaded once, up front."""
+    from aspm_cli.scan.trivy_runner import shared_trivy_cache
+
+    modes = {
+        "--container-mode" in scan.args
+        for repo in manifest.repos for scan in repo.scans if scan.type in TRIVY_SCAN_TYPES
+    }
+    if not modes:
+        yield
+        return
+    # Local and container runs read the same host directory; one download serves both.
+    with shared_trivy_cache(container_mode=True in modes) as cache:
+        Logger.get_logger().info(f"Using shared Trivy cache {cache}")
+        yield
+
+
+def run_batch(manifest, options: List[str], workdir: str, keep_checkouts: bool = False) -> List[Dict]:
+    """
+    Scan every repository of a validated manifest on a process pool. Each worker
+    keeps its imports, parser defaults per repo, Docker image checks and HTTP
+    session warm across the repositories it handles; the Trivy DB is shared.
+    """
+    checkouts = os.path.join(workdir, CHECKOUTS_DIR)
+    logs = os.path.join(workdir, LOGS_DIR)
+    os.makedirs(checkouts, exist_ok=True)
+    os.makedirs(logs, exist_ok=True)
+
+    tasks = [
+        {
+            "repo": repo.model_dump(),
+            "options": options,
+            "checkouts": checkouts,
+            "log": os.path.join(logs, f"{repo.name}.log"),
+            "keep_checkouts": keep_checkouts,
+        }
+        for repo in manifest.repos
+    ]
+    jobs = min(manifest.jobs or default_job_count(), len(tasks))
+    Logger.get_logger().info(f"Scanning {len(tasks)} repositories with {jobs} worker(s); logs in {logs}")
+
+    outcomes = {}
+    # Workers inherit the shared Trivy cache settings from this process's environment.
+    with _shared_trivy(manifest), ProcessPoolExecutor(max_workers=jobs, mp_context=worker_process_context()) as pool:
+        futures = {pool.submit(scan_repo, task): task for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            task = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = {"name": task["repo"]["name"], "scans": [], "error": str(e), "log": task["log"], "duration": 0}
+            outcomes[outcome["name"]] = outcome
+            Logger.get_logger().info(f"[{done}/{len(tasks)}] {outcome['name']}: {repo_status(outcome)}")
+    return [outcomes[task["repo"]["name"]] for task in tasks]
+
+
+def repo_status(outcome: Dict) -> str:
+    if outcome["error"]:
+        return "error"
+    return "failed" if any(scan["exit_code"] for scan in outcome["scans"]) else "passed"
+
+
+def format_status_table(outcomes: List[Dict]) -> str:
+    scan_types = list(dict.fromkeys(scan["type"] for outcome in outcomes for scan in outcome["scans"]))
+    header = ["REPOSITORY", *(scan_type.upper() for scan_type in scan_types), "STATUS", "TIME"]
+    rows = []
+    for outcome in outcomes:
+        by_type = {scan["type"]: scan for scan in outcome["scans"]}
+        cells = []
+        for scan_type in scan_types:
+            scan = by_type.get(scan_type)
+            if scan is None:
+                cells.append("-")
+            else:
+                cells.append("pass" if scan["exit_code"] == 0 else f"fail ({scan['exit_code']})")
+        status = repo_status(outcome)
+        if outcome["error"]:
+            status = f"error: {outcome['error']}"
+        rows.append([outcome["name"], *cells, status, f"{outcome['duration']}s"])
+    widths = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    lines = ["  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header, *rows]]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
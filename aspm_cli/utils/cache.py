@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_NAME = "accuknox-aspm-scanner"
+
+
+def cache_root() -> Path:
+    """
+    User-level cache directory shared by incremental scans and tool downloads.
+    Override with ACCUKNOX_CACHE_DIR (useful for CI cache steps).
+    """
+    override = os.getenv("ACCUKNOX_CACHE_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "AccuKnox" / "cache"
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / CACHE_DIR_NAME
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a namespaced directory under the cache root."""
+    path = cache_root().joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable short key for a tuple of identity values (repo, branch, args...)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part if part is not None else "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def read_json(path, default=None):
+    """Load a JSON file, returning default when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path, data, indent=None) -> None:
+    """Write JSON via a temp file + rename so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            if indent is None:
+                json.dump(data, handle, separators=(",", ":"))
+            else:
+                json.dump(data, handle, indent=indent)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
@@ -8,6 +8,7 @@ import json
 import logging
 from colorama import Fore
 
+from aspm_cli.utils.http_session import shared_session
 from aspm_cli.utils.logger import Logger
 from aspm_cli.utils.spinner import Spinner
 
@@ -94,7 +95,7 @@ def upload_results(file_path, endpoint, label, token, tenant_id, data_type, keep
 
         with open(file_path, 'rb') as file:
             url = _build_endpoint_url(endpoint, api_path)
-            response = requests.post(
+            response = shared_session().post(
                 url,
                 headers=headers,
                 params=params,
@@ -1,9 +1,16 @@
 import os
+import re
+import shlex
 from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator, FieldValidationInfo
-from typing import Optional, Literal
+from typing import List, Literal, Optional, Union
+from urllib.parse import urlparse
 from aspm_cli.utils.logger import Logger
 from aspm_cli.utils.common import ALLOWED_SCAN_TYPES
 from aspm_cli.utils.sbom import validate_sbom_command
+from aspm_cli.utils.sharding import parse_shard
+
+# A batch repo name becomes a directory and log file name: one plain path component.
+BATCH_REPO_NAME = re.compile(r"^[A-Za-z0-9._-]+$")
 
 # Return code constants
 PASS_RETURN_CODE = 0
@@ -100,13 +107,34 @@ class ConfigValidator:
     # These methods encapsulate the validation rules for each scan type.
     # They leverage Pydantic models internally for strong validation.
 
-    def validate_iac_scan(self, command: str, container_mode: bool, repo_url: Optional[str], repo_branch: Optional[str], severity: str):
+    def validate_iac_scan(self, command: str, container_mode: bool, repo_url: Optional[str], repo_branch: Optional[str], severity: str,
+                          jobs: Optional[int] = None, incremental: bool = False, shard_projects: bool = False,
+                          shard: Optional[str] = None):
         class IaCScanConfig(BaseModel):
             command: str = Field(..., min_length=1, description="Command arguments for IAC scanner")
             container_mode: bool
             repo_url: Optional[str]
             repo_branch: Optional[str]
             severity: str = Field(..., description="Comma-separated list of severities")
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent incremental or sharded scanner runs")
+            incremental: bool = False
+            shard_projects: bool = False
+            shard: Optional[str] = Field(None, description="Slice i/N of the IaC units")
+
+            @field_validator("shard")
+            @classmethod
+            def validate_shard(cls, v: Optional[str]):
+                parse_shard(v)
+                return v
+
+            @model_validator(mode="after")
+            def validate_modes(self):
+                modes = [flag for flag, enabled in (("--incremental", self.incremental),
+                                                    ("--shard-projects", self.shard_projects),
+                                                    ("--shard", self.shard)) if enabled]
+                if len(modes) > 1:
+                    raise ValueError(f"{' and '.join(modes)} cannot be combined.")
+                return self
 
             @field_validator("severity", mode="before")
             @classmethod
@@ -129,7 +157,8 @@ class ConfigValidator:
                 return ",".join(sorted(provided_severities))
 
         try:
-            IaCScanConfig(command=command, container_mode=container_mode, repo_url=repo_url, repo_branch=repo_branch, severity=severity)
+            IaCScanConfig(command=command, container_mode=container_mode, repo_url=repo_url, repo_branch=repo_branch, severity=severity, jobs=jobs,
+                          incremental=incremental, shard_projects=shard_projects, shard=shard)
             self._log_validation_success("IAC")
         except ValidationError as e:
             concise_msg = _format_validation_error(e)
@@ -191,14 +220,59 @@ class ConfigValidator:
             Logger.get_logger().debug(f"SQ SAST scan configuration error: {concise_msg}")
             raise ValueError(concise_msg)
 
-    def validate_secret_scan(self, command: str, container_mode: bool, engine: str = "trufflehog"):
+    def validate_secret_scan(self, command: str, container_mode: bool, engine: str = "trufflehog",
+                             shards: int = 1, jobs: Optional[int] = None, staged: bool = False,
+                             shard: Optional[str] = None, dedupe: bool = False,
+                             baseline: Optional[str] = None, update_baseline: bool = False,
+                             gitleaks_command: Optional[str] = None):
+        from aspm_cli.scan.secret import derive_gitleaks_command
+
         class SecretScanConfig(BaseModel):
-            command: str = Field(..., min_length=1, description="Command arguments for Secret scanner")
+            command: Optional[str] = Field(None, description="Command arguments for Secret scanner")
             container_mode: bool
-            engine: Literal["trufflehog", "gitleaks"] = "trufflehog"
+            engine: Literal["trufflehog", "gitleaks", "both"] = "trufflehog"
+            shards: int = Field(1, ge=1, description="Number of commit-range shards")
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent shard workers")
+            staged: bool = False
+            shard: Optional[str] = Field(None, description="Slice i/N of the files (filesystem scans)")
+            dedupe: bool = False
+            baseline: Optional[str] = Field(None, description="Baseline file of accepted findings")
+            update_baseline: bool = False
+            gitleaks_command: Optional[str] = Field(None, description="Gitleaks args for engine 'both'")
+
+            @field_validator("shard")
+            @classmethod
+            def validate_shard(cls, v: Optional[str]):
+                parse_shard(v)
+                return v
+
+            @model_validator(mode="after")
+            def validate_command(self):
+                # --staged builds its own scan command; --command then only adds flags.
+                if not self.staged and not (self.command or "").strip():
+                    raise ValueError("--command is required unless --staged is set.")
+                if self.shard:
+                    positional = [arg for arg in shlex.split(self.command or "") if not arg.startswith("-")]
+                    if self.staged or self.engine != "trufflehog" or positional[:1] != ["filesystem"]:
+                        raise ValueError("--shard needs a TruffleHog 'filesystem <path>' command.")
+                if self.update_baseline and not self.baseline:
+                    raise ValueError("--update-baseline needs --baseline <file>.")
+                if self.staged and (self.dedupe or self.baseline):
+                    raise ValueError("--dedupe and --baseline apply to result files and cannot be used with --staged.")
+                if self.engine == "both":
+                    if self.staged:
+                        raise ValueError("--engine both cannot be used with --staged.")
+                    if not (self.gitleaks_command or "").strip():
+                        derive_gitleaks_command(self.command)
+                elif self.gitleaks_command:
+                    raise ValueError("--gitleaks-command applies to --engine both only.")
+                return self
 
         try:
-            SecretScanConfig(command=command, container_mode=container_mode, engine=engine)
+            SecretScanConfig(command=command, container_mode=container_mode, engine=engine,
+                             shards=shards, jobs=jobs, staged=staged, shard=shard, dedupe=dedupe,
+                             baseline=baseline, update_baseline=update_baseline,
+                             gitleaks_command=gitleaks_command)
             self._log_validation_success("Secret")
         except ValidationError as e:
             concise_msg = _format_validation_error(e)
@@ -212,6 +286,7 @@ class ConfigValidator:
         severity: str,
         repo_url: Optional[str] = None,
         repo_branch: Optional[str] = None,
+        jobs: Optional[int] = None,
     ):
         from aspm_cli.scan.trivy_runner import validate_sca_command
 
@@ -221,6 +296,7 @@ class ConfigValidator:
             severity: str = Field(..., description="Comma-separated list of severities")
             repo_url: Optional[str]
             repo_branch: Optional[str]
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent sharded scanner runs")
 
             @field_validator("severity", mode="before")
             @classmethod
@@ -246,6 +322,7 @@ class ConfigValidator:
                 severity=severity,
                 repo_url=repo_url,
                 repo_branch=repo_branch,
+                jobs=jobs,
             )
             validate_sca_command(command)
             self._log_validation_success("SCA")
@@ -262,6 +339,9 @@ class ConfigValidator:
         commit_ref: Optional[str] = None,
         model_name: Optional[str] = None,
         source_type: Optional[str] = None,
+        jobs: Optional[int] = None,
+        batch_size: int = 1,
+        shard: Optional[str] = None,
     ):
         class MLScanConfig(BaseModel):
             command: str = Field(..., min_length=1, description="Command arguments for ML scan")
@@ -270,6 +350,15 @@ class ConfigValidator:
             commit_ref: Optional[str] = None
             model_name: Optional[str] = None
             source_type: Optional[str] = "github"
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent modelscan runs")
+            batch_size: int = Field(1, ge=1, description="Model files per modelscan run")
+            shard: Optional[str] = Field(None, description="Slice i/N of the model files")
+
+            @field_validator("shard")
+            @classmethod
+            def validate_shard(cls, v: Optional[str]):
+                parse_shard(v)
+                return v
 
         try:
             MLScanConfig(
@@ -279,6 +368,9 @@ class ConfigValidator:
                 commit_ref=commit_ref,
                 model_name=model_name,
                 source_type=source_type,
+                jobs=jobs,
+                batch_size=batch_size,
+                shard=shard,
             )
             self._log_validation_success("ML Scan")
         except ValidationError as e:
@@ -286,13 +378,14 @@ class ConfigValidator:
             Logger.get_logger().debug(f"ML scan configuration error: {concise_msg}")
             raise ValueError(concise_msg)
 
-    def validate_api_discovery_scan(self, command: str, container_mode: bool):
+    def validate_api_discovery_scan(self, command: str, container_mode: bool, jobs: Optional[int] = None):
         class APIDiscoveryScanConfig(BaseModel):
             command: str = Field(..., min_length=1, description="Command arguments for API discovery scan")
             container_mode: bool
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent source roots")
 
         try:
-            APIDiscoveryScanConfig(command=command, container_mode=container_mode)
+            APIDiscoveryScanConfig(command=command, container_mode=container_mode, jobs=jobs)
             self._log_validation_success("API Discovery")
         except ValidationError as e:
             concise_msg = _format_validation_error(e)
@@ -327,7 +420,8 @@ class ConfigValidator:
 
         self._log_validation_success("Container")
 
-    def validate_sast_scan(self, command: str, container_mode: bool, severity: str, repo_url: Optional[str], commit_ref: Optional[str], commit_sha: Optional[str], pipeline_id: Optional[str], job_url: Optional[str]):
+    def validate_sast_scan(self, command: str, container_mode: bool, severity: str, repo_url: Optional[str], commit_ref: Optional[str], commit_sha: Optional[str], pipeline_id: Optional[str], job_url: Optional[str],
+                           shard: Optional[str] = None):
         class SASTScanConfig(BaseModel):
             command: str = Field(..., min_length=1, description="Command arguments for SAST scanner")
             container_mode: bool
@@ -337,7 +431,14 @@ class ConfigValidator:
             commit_sha: Optional[str]
             pipeline_id: Optional[str]
             job_url: Optional[str]
-            
+            shard: Optional[str] = Field(None, description="Slice i/N of the target files")
+
+            @field_validator("shard")
+            @classmethod
+            def validate_shard(cls, v: Optional[str]):
+                parse_shard(v)
+                return v
+
             @field_validator("severity", mode="before")
             @classmethod
             def validate_severity(cls, v: str, info: FieldValidationInfo):
@@ -367,7 +468,8 @@ class ConfigValidator:
                 commit_ref=commit_ref,
                 commit_sha=commit_sha,
                 pipeline_id=pipeline_id,
-                job_url=job_url
+                job_url=job_url,
+                shard=shard,
             )
             self._log_validation_success("SAST")
         except ValidationError as e:
@@ -375,21 +477,114 @@ class ConfigValidator:
             Logger.get_logger().debug(f"SAST scan configuration error: {concise_msg}")
             raise ValueError(concise_msg)
 
-    def validate_dast_scan(self, command: str, severity_threshold: str, container_mode: bool):
+    def validate_dast_scan(self, command: str, severity_threshold: str, container_mode: bool,
+                           targets: Optional[list] = None, jobs: Optional[int] = None, zap_daemon: bool = False):
+        from aspm_cli.scan.dast import ZAP_SCAN_SCRIPTS
+
         class DASTScanConfig(BaseModel):
             command: str = Field(..., min_length=1, description="Command arguments for DAST scanner")
             severity_threshold: Literal["LOW", "MEDIUM", "HIGH"] = Field(..., description="Severity threshold for DAST scan")
             container_mode: bool
+            targets: list = Field(default_factory=list, description="Target URLs scanned one by one")
+            jobs: Optional[int] = Field(None, ge=1, description="Concurrent target scans")
+            zap_daemon: bool = False
 
             @field_validator("severity_threshold", mode="before")
             @classmethod
             def convert_to_upper(cls, v: str):
                 return v.upper()
 
+            @field_validator("targets")
+            @classmethod
+            def validate_targets(cls, v: list):
+                invalid = [url for url in v if urlparse(url).scheme not in ("http", "https") or not urlparse(url).netloc]
+                if invalid:
+                    raise ValueError(f"Targets must be http(s) URLs: {', '.join(invalid)}")
+                return v
+
+            @model_validator(mode="after")
+            def validate_multi_target(self):
+                if self.targets:
+                    if not self.container_mode and not self.zap_daemon:
+                        raise ValueError("--targets / --targets-file need --container-mode or --zap-daemon.")
+                    if not any(script in self.command for script in ZAP_SCAN_SCRIPTS):
+                        raise ValueError(f"--targets / --targets-file need a {' or '.join(ZAP_SCAN_SCRIPTS)} command.")
+                if self.zap_daemon:
+                    args = shlex.split(self.command)
+                    if not any(script in args for script in ZAP_SCAN_SCRIPTS):
+                        raise ValueError(f"--zap-daemon needs a {' or '.join(ZAP_SCAN_SCRIPTS)} command.")
+                    if not self.targets and "-t" not in args[:-1]:
+                        raise ValueError("--zap-daemon needs a target: -t <url> in --command, or --targets.")
+                    if "-m" in args[:-1] and not args[args.index("-m") + 1].replace(".", "", 1).isdigit():
+                        raise ValueError("-m must be the spider duration in minutes.")
+                    if not self.container_mode and not os.getenv("ZAP_API_URL", "").strip():
+                        raise ValueError("--zap-daemon needs --container-mode to start the daemon, or ZAP_API_URL.")
+                return self
+
         try:
-            DASTScanConfig(command=command, severity_threshold=severity_threshold, container_mode=container_mode)
+            DASTScanConfig(command=command, severity_threshold=severity_threshold, container_mode=container_mode,
+                           targets=targets or [], jobs=jobs, zap_daemon=zap_daemon)
             self._log_validation_success("DAST")
         except ValidationError as e:
             concise_msg = _format_validation_error(e)
             Logger.get_logger().debug(f"DAST scan configuration error: {concise_msg}")
-            raise ValueError(concise_msg)
\ No newline at end of file
+            raise ValueError(concise_msg)
+
+    def validate_batch_manifest(self, manifest: dict, jobs: Optional[int] = None):
+        """Validate a `scan batch` manifest and return it with defaults applied."""
+        class BatchScanConfig(BaseModel):
+            type: str = Field(..., description="Scan type, as after `scan`")
+            args: Union[str, List[str]] = Field(default_factory=list, description="Arguments after the scan type")
+
+            @field_validator("type", mode="before")
+            @classmethod
+            def validate_type(cls, v):
+                if not isinstance(v, str) or v.lower() not in ALLOWED_SCAN_TYPES:
+                    raise ValueError(f"Scan type must be one of: {', '.join(ALLOWED_SCAN_TYPES)}")
+                return v.lower()
+
+            @field_validator("args", mode="after")
+            @classmethod
+            def split_args(cls, v):
+                return shlex.split(v) if isinstance(v, str) else v
+
+        class BatchRepoConfig(BaseModel):
+            name: Optional[str] = None
+            path: str = Field(..., min_length=1, description="Local repository, bare mirror or directory")
+            ref: Optional[str] = Field(None, description="Branch, tag or commit to check out")
+            url: Optional[str] = Field(None, description="Repository URL reported with the results")
+            scans: Optional[List[BatchScanConfig]] = None
+
+        class BatchManifestConfig(BaseModel):
+            scans: List[BatchScanConfig] = Field(default_factory=list, description="Scans run on every repo")
+            repos: List[BatchRepoConfig] = Field(..., min_length=1)
+            jobs: Optional[int] = Field(None, ge=1, description="Repositories scanned concurrently")
+
+            @model_validator(mode="after")
+            def validate_repos(self):
+                names = set()
+                for repo in self.repos:
+                    repo.name = repo.name or os.path.basename(os.path.normpath(repo.path)).removesuffix(".git")
+                    if not BATCH_REPO_NAME.match(repo.name) or repo.name in (".", ".."):
+                        raise ValueError(
+                            f"Invalid repository name '{repo.name}': use letters, digits, '.', '_' and '-' only."
+                        )
+                    if repo.name in names:
+                        raise ValueError(f"Duplicate repository name '{repo.name}'; set 'name' explicitly.")
+                    names.add(repo.name)
+                    if repo.scans is None:
+                        repo.scans = self.scans
+                    if not repo.scans:
+                        raise ValueError(f"No scans configured for repository '{repo.name}'.")
+                return self
+
+        try:
+            if jobs is not None:
+                manifest = {**manifest, "jobs": jobs}
+            config = BatchManifestConfig(**manifest)
+            self._log_validation_success("Batch")
+            return config
+        except (ValidationError, TypeError) as e:
+            concise_msg = _format_validation_error(e) if isinstance(e, ValidationError) else str(e)
+            Logger.get_logger().debug(f"Batch manifest error: {concise_msg}")
+            raise ValueError(concise_msg)
@@ -0,0 +1,330 @@
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from aspm_cli.utils.cache import cache_root
+
+# Keep this module's top-level imports to the standard library: the CLI
+# imports it before anything else to decide whether to forward to a daemon.
+
+SOCKET_ENV = "ACCUKNOX_DAEMON_SOCKET"
+DISABLE_ENV = "ACCUKNOX_NO_DAEMON"
+SOCKET_NAME = "daemon.sock"
+# Never forwarded: managing the daemon must work whether or not one is running,
+# and a long-lived job server should not occupy a daemon worker.
+LOCAL_COMMANDS = frozenset({"daemon", "serve"})
+REQUEST_BUFFER = 1024 * 1024
+STDIO_FDS = (0, 1, 2)
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds") and hasattr(os, "fork")
+
+
+def socket_path() -> str:
+    """ACCUKNOX_DAEMON_SOCKET, else $XDG_RUNTIME_DIR, else the user cache directory."""
+    override = os.getenv(SOCKET_ENV, "").strip()
+    if override:
+        return os.path.expanduser(override)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR", "").strip()
+    if runtime_dir:
+        return os.path.join(runtime_dir, "accuknox-aspm-scanner.sock")
+    return str(cache_root() / SOCKET_NAME)
+
+
+def _send(sock: socket.socket, message: Dict) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _connect(path: str) -> Optional[socket.socket]:
+    if not daemon_supported() or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def control(action: str, path: Optional[str] = None) -> Optional[Dict]:
+    """Send a control request (status, stop) to the daemon; None if none is running."""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, {"control": action})
+        line = sock.makefile("rb").readline()
+    return json.loads(line) if line else None
+
+
+def forward_to_daemon(argv: List[str]) -> Optional[int]:
+    """
+    Run argv in a running scan daemon, handing it this process's cwd, environment
+    and stdin/stdout/stderr. Returns the command's exit code, or None when no
+    daemon is available and the command should run in-process.
+    """
+    if os.getenv(DISABLE_ENV, "").strip().upper() in ("1", "TRUE"):
+        return None
+    if argv and argv[0] in LOCAL_COMMANDS:
+        return None
+    sock = _connect(socket_path())
+    if sock is None:
+        return None
+
+    request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        socket.send_fds(sock, [json.dumps(request).encode("utf-8") + b"\n"], list(STDIO_FDS))
+    except OSError:
+        sock.close()
+        return None
+
+    reader = sock.makefile("rb")
+    with sock:
+        while True:
+            try:
+                line = reader.readline()
+            except KeyboardInterrupt:
+                # The daemon's worker is not in this terminal's process group: relay Ctrl-C.
+                try:
+                    _send(sock, {"signal": "INT"})
+                except OSError:
+                    return 130
+                continue
+            if not line:
+                sys.stderr.write("accuknox-aspm-scanner: lost connection to the scan daemon\n")
+                return 1
+            message = json.loads(line)
+            if "exit" in message:
+                return int(message["exit"])
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def _read_request(conn: socket.socket) -> Tuple[Dict, List[int]]:
+    data, fds, _flags, _addr = socket.recv_fds(conn, REQUEST_BUFFER, len(STDIO_FDS))
+    while data and not data.endswith(b"\n"):
+        chunk = conn.recv(REQUEST_BUFFER)
+        if not chunk:
+            break
+        data += chunk
+    return (json.loads(data) if data.strip() else {}), list(fds)
+
+
+class ScanDaemon:
+    """
+    Long-lived process that keeps the CLI's imports, parser and Docker image
+    checks warm. Each forwarded command runs in a forked worker that adopts the
+    client's cwd, environment and stdio, so commands are isolated from each
+    other exactly like separate CLI invocations.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or socket_path()
+        self.started = time.time()
+        self.requests = 0
+        self.workers: Dict[int, int] = {}
+        self._running = False
+        self._listener: Optional[socket.socket] = None
+        self._selector = selectors.DefaultSelector()
+
+    def serve(self) -> None:
+        from aspm_cli.cli import build_parser
+        from aspm_cli.utils.logger import Logger
+
+        # Warm every import (commands, scanners, pydantic models, requests) once.
+        build_parser()
+        self._bind()
+        Logger.get_logger().info(f"Scan daemon listening on {self.path} (pid {os.getpid()})")
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        self._running = True
+        try:
+            while self._running:
+                for key, _events in self._selector.select(timeout=1.0):
+                    if key.fileobj is self._listener:
+                        self._accept()
+                    else:
+                        self._collect_report(key.fileobj)
+                self._reap()
+        finally:
+            self._shutdown()
+        Logger.get_logger().info("Scan daemon stopped")
+
+    def _bind(self) -> None:
+        if os.path.exists(self.path):
+            if control("status", self.path) is not None:
+                raise RuntimeError(f"A scan daemon is already running on {self.path}")
+            os.unlink(self.path)  # stale socket from a daemon that did not shut down cleanly
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        listener.listen(16)
+        self._listener = listener
+        self._selector.register(listener, selectors.EVENT_READ)
+
+    def _request_stop(self, *_args) -> None:
+        self._running = False
+
+    def _shutdown(self) -> None:
+        if self._listener is not None:
+            self._selector.unregister(self._listener)
+            self._listener.close()
+            self._listener = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def _accept(self) -> None:
+        conn, _ = self._listener.accept()
+        fds: List[int] = []
+        try:
+            peer_uid = _peer_uid(conn)
+            if peer_uid is not None and peer_uid != os.getuid():
+                return
+            request, fds = _read_request(conn)
+            if "control" in request:
+                self._control(conn, request["control"])
+                return
+            if len(fds) != len(STDIO_FDS) or "argv" not in request:
+                return
+            self.requests += 1
+            self._spawn(conn, request, fds)
+        except (OSError, ValueError):
+            return
+        finally:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+
+    def _control(self, conn: socket.socket, action: str) -> None:
+        status = {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime": int(time.time() - self.started),
+            "requests": self.requests,
+            "running": len(self.workers),
+        }
+        if action == "stop":
+            self._running = False
+        _send(conn, status)
+
+    def _spawn(self, conn: socket.socket, request: Dict, fds: List[int]) -> None:
+        report_read, report_write = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.close(report_read)
+                self._listener.close()
+                code = self._run_worker(conn, request, fds, report_write)
+            finally:
+                os._exit(code)
+        os.close(report_write)
+        self.workers[pid] = report_read
+        self._selector.register(os.fdopen(report_read, "rb", closefd=False), selectors.EVENT_READ)
+
+    def _run_worker(self, conn: socket.socket, request: Dict, fds: List[int], report_fd: int) -> int:
+        from aspm_cli.cli import run
+        from aspm_cli.utils.docker_pull import memoized_images
+        from aspm_cli.utils.git_info import GitInfo
+        from aspm_cli.utils.logger import Logger
+        from aspm_cli.utils.subprocess_utils import system_exit_code
+
+        # Own process group, so a relayed Ctrl-C also reaches scanner subprocesses.
+        os.setpgrp()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for target, fd in zip(STDIO_FDS, fds):
+            os.dup2(fd, target)
+        os.chdir(request.get("cwd") or "/")
+        # Git reads memoized by the daemon's warm-up parser would be stale for this request.
+        GitInfo.clear_memo()
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        # Re-evaluate terminal detection and log level against the client's stdio and env.
+        Logger.rebind_streams()
+        finished = threading.Event()
+        threading.Thread(target=self._relay_signals, args=(conn, finished), daemon=True).start()
+
+        try:
+            # A fresh parser: git-derived defaults (--repo-url, ...) must describe the client's cwd.
+            run(request["argv"])
+            code = 0
+        except SystemExit as e:
+            code = system_exit_code(e.code)
+        except KeyboardInterrupt:
+            code = 130
+        finished.set()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        try:
+            os.write(report_fd, json.dumps({"images": memoized_images()}).encode("utf-8"))
+        except OSError:
+            pass
+        try:
+            _send(conn, {"exit": code})
+        except OSError:
+            pass
+        return 0
+
+    def _relay_signals(self, conn: socket.socket, finished: threading.Event) -> None:
+        for line in conn.makefile("rb"):
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if message.get("signal") == "INT" and not finished.is_set():
+                os.killpg(0, signal.SIGINT)
+        if not finished.is_set():
+            # Client went away before the command finished: stop the whole worker group.
+            os.killpg(0, signal.SIGTERM)
+
+    def _collect_report(self, pipe) -> None:
+        from aspm_cli.utils.docker_pull import remember_images
+
+        self._selector.unregister(pipe)
+        data = b""
+        while True:
+            chunk = os.read(pipe.fileno(), REQUEST_BUFFER)
+            if not chunk:
+                break
+            data += chunk
+        os.close(pipe.fileno())
+        try:
+            remember_images(json.loads(data).get("images") or {})
+        except ValueError:
+            pass
+
+    def _reap(self) -> None:
+        while self.workers:
+            try:
+                pid, _status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            self.workers.pop(pid, None)
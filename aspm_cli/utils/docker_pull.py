@@ -1,7 +1,33 @@
 import subprocess
+import threading
+import time
+from typing import Dict
 
 from aspm_cli.utils.logger import Logger
 
+# Images verified present locally (image -> time checked). Repeated pulls in one
+# run, or across commands served by the scan daemon, skip `docker image inspect`.
+IMAGE_MEMO_TTL_SECONDS = 300
+_verified_images: Dict[str, float] = {}
+_memo_lock = threading.Lock()
+
+
+def memoized_images() -> Dict[str, float]:
+    with _memo_lock:
+        return dict(_verified_images)
+
+
+def remember_images(images: Dict[str, float]) -> None:
+    with _memo_lock:
+        for image, checked in images.items():
+            if checked > _verified_images.get(image, 0):
+                _verified_images[image] = checked
+
+
+def _recently_verified(image: str) -> bool:
+    with _memo_lock:
+        return time.time() - _verified_images.get(image, 0) < IMAGE_MEMO_TTL_SECONDS
+
 
 def _image_exists_locally(image: str) -> bool:
     result = subprocess.run(
@@ -14,8 +40,12 @@ def _image_exists_locally(image: str) -> bool:
 
 def docker_pull(image: str, platform: str = None):
     """Pull a Docker image, or use it if already present locally."""
+    if _recently_verified(image):
+        Logger.get_logger().debug(f"Using local Docker image (verified recently): {image}")
+        return
     if _image_exists_locally(image):
         Logger.get_logger().debug(f"Using local Docker image: {image}")
+        remember_images({image: time.time()})
         return
 
     Logger.get_logger().debug(f"Pulling Docker image: {image}")
@@ -31,4 +61,16 @@ def docker_pull(image: str, platform: str = None):
         raise RuntimeError(f"Failed to pull image: {image}")
 
     Logger.get_logger().debug(result.stdout)
-    Logger.get_logger().debug(f"Successfully pulled image: {image}")
\ No newline at end of file
+    Logger.get_logger().debug(f"Successfully pulled image: {image}")
+    remember_images({image: time.time()})
+
+def docker_image_id(image: str):
+    """Content digest (image ID) of a local image, or None if it cannot be inspected."""
+    result = subprocess.run(
+        ["docker", "image", "inspect", "--format", "{{.Id}}", image],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
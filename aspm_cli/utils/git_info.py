@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import subprocess
+import threading
 from aspm_cli.utils.logger import Logger
 
 class GitInfo:
@@ -8,15 +10,40 @@ class GitInfo:
     Utility class to retrieve Git repository information.
     Handles potential errors gracefully and logs them.
     """
+    # Repository metadata (remote URL, branch) is read once per working directory by
+    # every scanner's argument defaults: memoize those reads. Commit reads (HEAD,
+    # rev-list, merge-base) are never memoized. Long-lived workers (scan batch, serve,
+    # daemon) call clear_memo() before each unit of work, so nothing outlives one run.
+    _memo: dict = {}
+    _memo_lock = threading.Lock()
+
+    @staticmethod
+    def clear_memo() -> None:
+        with GitInfo._memo_lock:
+            GitInfo._memo.clear()
+
     @staticmethod
-    def _run_git_command(command_parts: list[str]) -> str | None:
+    def _run_git_command(command_parts: list[str], timeout: int = 5, memoize: bool = False) -> str | None:
+        if not memoize:
+            return GitInfo._read_git_command(command_parts, timeout)
+        key = (os.getcwd(), tuple(command_parts))
+        with GitInfo._memo_lock:
+            if key in GitInfo._memo:
+                return GitInfo._memo[key]
+        value = GitInfo._read_git_command(command_parts, timeout)
+        with GitInfo._memo_lock:
+            GitInfo._memo[key] = value
+        return value
+
+    @staticmethod
+    def _read_git_command(command_parts: list[str], timeout: int = 5) -> str | None:
         try:
             result = subprocess.run(
                 ['git'] + command_parts,
                 capture_output=True,
                 text=True,
                 check=True,
-                timeout=5
+                timeout=timeout
             )
             return result.stdout.strip()
         except subprocess.CalledProcessError as e:
@@ -36,29 +63,47 @@ class GitInfo:
     def get_repo_url() -> str | None:
         """Retrieves the Git repository URL."""
         # Try 'origin' remote first, then list all
-        url = GitInfo._run_git_command(['config', '--get', 'remote.origin.url'])
+        url = GitInfo._run_git_command(['config', '--get', 'remote.origin.url'], memoize=True)
         if url:
             return url
 
         # If origin not found, try to get any remote
-        remotes = GitInfo._run_git_command(['remote'])
+        remotes = GitInfo._run_git_command(['remote'], memoize=True)
         if remotes:
             first_remote = remotes.splitlines()[0]
-            url = GitInfo._run_git_command(['config', '--get', f'remote.{first_remote}.url'])
+            url = GitInfo._run_git_command(['config', '--get', f'remote.{first_remote}.url'], memoize=True)
             return url
         return None
 
     @staticmethod
     def get_branch_name() -> str | None:
         """Retrieves the current Git branch name."""
-        return GitInfo._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'])
+        return GitInfo._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'], memoize=True)
 
     @staticmethod
     def get_commit_ref() -> str | None:
         """Retrieves the full commit reference (e.g., HEAD, branch name)."""
-        return GitInfo._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'])
+        return GitInfo._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'], memoize=True)
 
     @staticmethod
     def get_commit_sha() -> str | None:
         """Retrieves the full commit SHA."""
-        return GitInfo._run_git_command(['rev-parse', 'HEAD'])
\ No newline at end of file
+        return GitInfo._run_git_command(['rev-parse', 'HEAD'])
+
+    @staticmethod
+    def resolve_commit(ref: str) -> str | None:
+        """Resolves a ref to a full commit SHA, or None if it does not exist."""
+        return GitInfo._run_git_command(['rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}'])
+
+    @staticmethod
+    def is_ancestor(ancestor: str, descendant: str) -> bool:
+        """True when `ancestor` is reachable from `descendant` (history was not rewritten)."""
+        return GitInfo._run_git_command(['merge-base', '--is-ancestor', ancestor, descendant]) is not None
+
+
+    @staticmethod
+    def list_first_parent_commits(head: str, since: str | None = None) -> list[str]:
+        """First-parent commits reachable from `head` (after `since`), oldest first."""
+        revision = f'{since}..{head}' if since else head
+        output = GitInfo._run_git_command(['rev-list', '--first-parent', '--reverse', revision], timeout=300)
+        return output.split() if output else []
@@ -0,0 +1,36 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept alive per host; sized for parallel tool downloads.
+POOL_SIZE = 16
+
+_lock = threading.Lock()
+_session = None
+
+
+def shared_session() -> requests.Session:
+    """
+    Process-wide requests session so concurrent downloads reuse keep-alive
+    connections (GitHub release redirects hit the same few hosts). Connect
+    errors and 502/503/504 on GET/HEAD are retried with backoff.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                connect=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"}),
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
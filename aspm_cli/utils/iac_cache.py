@@ -0,0 +1,403 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aspm_cli.utils.cache import cache_dir, cache_key, read_json, write_json_atomic
+
+CACHE_VERSION = 2
+CHECK_LISTS = ("passed_checks", "failed_checks", "skipped_checks")
+TERRAFORM_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json")
+HELM_CHART_FILE = "Chart.yaml"
+DOCKER_WORKDIR = "/workdir"
+
+# Mirrors Checkov's default directory excludes; hidden dirs are skipped except CI config dirs it scans.
+SKIP_DIR_NAMES = frozenset({"node_modules", ".terraform", ".serverless", "__pycache__"})
+HIDDEN_DIRS_SCANNED = frozenset({".github", ".circleci", ".gitlab"})
+
+_LOCAL_MODULE_SOURCE = re.compile(r'\bsource\s*=\s*"(\.{1,2}/[^"]*)"')
+
+
+def _is_terraform_file(name: str) -> bool:
+    return name.endswith(TERRAFORM_SUFFIXES)
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _rel(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+class IaCUnit:
+    """
+    Smallest re-scannable piece of an IaC tree:
+    - ``tfdir``: a Terraform directory (module), fingerprinted with its local module dependencies
+    - ``chart``: a Helm chart (directory with Chart.yaml)
+    - ``file``: any other file (Kubernetes manifests, Dockerfiles, CloudFormation, ...)
+    """
+
+    def __init__(self, unit_id: str, kind: str, path: str):
+        self.unit_id = unit_id
+        self.kind = kind
+        self.path = path
+        self.files: List[str] = []
+        self.fingerprint: Optional[str] = None
+
+    @property
+    def is_directory(self) -> bool:
+        return self.kind in ("tfdir", "chart")
+
+
+class IaCInventory:
+    """Walks a Checkov ``-d`` target once, grouping files into units and fingerprinting them."""
+
+    def __init__(self, target: str, exclude: Iterable[str] = (), fingerprint: bool = True):
+        self.target = os.path.realpath(target)
+        self._exclude = {os.path.realpath(path) for path in exclude}
+        self.units: Dict[str, IaCUnit] = {}
+        self._file_owner: Dict[str, str] = {}
+        self._chart_roots: List[str] = []
+        self._file_hashes: Dict[str, str] = {}
+        self._scan()
+        if fingerprint:
+            self._fingerprint_all()
+
+    def _scan(self):
+        for dirpath, dirnames, filenames in os.walk(self.target):
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if d not in SKIP_DIR_NAMES and (not d.startswith(".") or d in HIDDEN_DIRS_SCANNED)
+            )
+            if HELM_CHART_FILE in filenames:
+                self._chart_roots.append(dirpath)
+            chart_root = self._chart_root_of(dirpath)
+            for filename in sorted(filenames):
+                full_path = os.path.join(dirpath, filename)
+                if not os.path.isfile(full_path) or os.path.realpath(full_path) in self._exclude:
+                    continue
+                rel_path = _rel(full_path, self.target)
+                if chart_root:
+                    unit = self._unit("chart", chart_root)
+                elif _is_terraform_file(filename):
+                    unit = self._unit("tfdir", dirpath)
+                else:
+                    unit = self._unit("file", full_path)
+                unit.files.append(full_path)
+                self._file_owner[rel_path] = unit.unit_id
+
+    def _chart_root_of(self, dirpath: str) -> Optional[str]:
+        for root in reversed(self._chart_roots):
+            if dirpath == root or dirpath.startswith(root + os.sep):
+                return root
+        return None
+
+    def _unit(self, kind: str, path: str) -> IaCUnit:
+        unit_id = f"{kind}:{_rel(path, self.target)}"
+        if unit_id not in self.units:
+            self.units[unit_id] = IaCUnit(unit_id, kind, path)
+        return self.units[unit_id]
+
+    def _hash(self, path: str) -> str:
+        if path not in self._file_hashes:
+            self._file_hashes[path] = _file_digest(path)
+        return self._file_hashes[path]
+
+    def _module_dependencies(self, unit: IaCUnit) -> List[str]:
+        """Local module directories referenced via ``source = "./..."``."""
+        dependencies = set()
+        for path in unit.files:
+            if not path.endswith(".tf"):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+                    content = handle.read()
+            except OSError:
+                continue
+            for source in _LOCAL_MODULE_SOURCE.findall(content):
+                module_dir = os.path.realpath(os.path.join(unit.path, source))
+                dependency_id = f"tfdir:{_rel(module_dir, self.target)}"
+                if dependency_id in self.units and dependency_id != unit.unit_id:
+                    dependencies.add(dependency_id)
+        return sorted(dependencies)
+
+    def _fingerprint(self, unit: IaCUnit, visiting: set) -> str:
+        if unit.fingerprint:
+            return unit.fingerprint
+        digest = hashlib.sha256(unit.kind.encode("utf-8"))
+        for path in sorted(unit.files):
+            digest.update(_rel(path, self.target).encode("utf-8"))
+            digest.update(self._hash(path).encode("ascii"))
+        if unit.kind == "tfdir":
+            visiting.add(unit.unit_id)
+            for dependency_id in self._module_dependencies(unit):
+                if dependency_id in visiting:
+                    continue
+                digest.update(dependency_id.encode("utf-8"))
+                digest.update(self._fingerprint(self.units[dependency_id], visiting).encode("ascii"))
+            visiting.discard(unit.unit_id)
+        unit.fingerprint = digest.hexdigest()
+        return unit.fingerprint
+
+    def _fingerprint_all(self):
+        for unit in self.units.values():
+            self._fingerprint(unit, set())
+
+    def owner_of(self, rel_path: str) -> Optional[str]:
+        """Unit that owns a target-relative file path ("/main.tf" or "main.tf")."""
+        rel_path = rel_path.lstrip("/")
+        owner = self._file_owner.get(rel_path)
+        if owner:
+            return owner
+        # Files Checkov reports but the walk skipped still group with their directory.
+        directory = os.path.dirname(rel_path) or "."
+        return f"tfdir:{directory}" if _is_terraform_file(rel_path) else f"file:{rel_path}"
+
+
+def host_path(path: str, cwd: str, container_mode: bool) -> str:
+    """Map a Checkov absolute path (possibly inside /workdir) back to the host."""
+    if container_mode and (path == DOCKER_WORKDIR or path.startswith(DOCKER_WORKDIR + "/")):
+        return os.path.join(cwd, path[len(DOCKER_WORKDIR):].lstrip("/"))
+    return path if os.path.isabs(path) else os.path.join(cwd, path)
+
+
+def _report_target_path(check: Dict[str, Any], field: str, scan_root: str, target: str,
+                        cwd: str, container_mode: bool) -> Optional[str]:
+    abs_field = "file_abs_path" if field == "file_path" else None
+    absolute = check.get(abs_field) if abs_field else None
+    if absolute:
+        absolute = host_path(absolute, cwd, container_mode)
+    else:
+        relative = check.get(field)
+        if not relative:
+            return None
+        absolute = os.path.join(scan_root, relative.lstrip("/"))
+    return "/" + _rel(os.path.realpath(absolute) if os.path.exists(absolute) else os.path.normpath(absolute), target)
+
+
+def iter_reports(data: Any) -> Iterable[Dict[str, Any]]:
+    """Yield per-framework Checkov reports from a dict or list output."""
+    if isinstance(data, dict):
+        data = [data]
+    for entry in data or []:
+        if isinstance(entry, dict) and "check_type" in entry:
+            yield entry
+
+
+def split_reports_by_unit(
+    data: Any,
+    inventory: IaCInventory,
+    scan_root: str,
+    cwd: str,
+    container_mode: bool,
+    keep_units: Optional[set] = None,
+) -> Tuple[Dict[str, Dict[str, Dict[str, list]]], Dict[str, Dict[str, Any]]]:
+    """
+    Re-base Checkov results onto the ``-d`` target (as a full ``-d`` run reports them)
+    and group them by owning unit.
+    Module-call results are owned by the calling file's unit, so a caller change
+    re-evaluates them. Results for units outside ``keep_units`` are dropped.
+    Returns (unit_results, report_meta).
+    """
+    target = inventory.target
+    unit_results: Dict[str, Dict[str, Dict[str, list]]] = {}
+    report_meta: Dict[str, Dict[str, Any]] = {}
+
+    for report in iter_reports(data):
+        check_type = report["check_type"]
+        summary = report.get("summary") or {}
+        report_meta.setdefault(check_type, {
+            "url": report.get("url"),
+            "checkov_version": summary.get("checkov_version"),
+        })
+        results = report.get("results") or {}
+
+        for list_name in CHECK_LISTS:
+            for check in results.get(list_name) or []:
+                file_path = _report_target_path(check, "file_path", scan_root, target, cwd, container_mode)
+                if not file_path:
+                    continue
+                # Only file_path and caller_file_path depend on the scan root; Checkov
+                # derives file_abs_path and repo_file_path from the file itself, so they
+                # are kept as reported and match a full run from the same directory.
+                check = dict(check)
+                check["file_path"] = file_path
+                owner_path = file_path
+                if check.get("caller_file_path"):
+                    caller = _report_target_path(check, "caller_file_path", scan_root, target, cwd, container_mode)
+                    check["caller_file_path"] = caller
+                    owner_path = caller or file_path
+                owner = inventory.owner_of(owner_path)
+                if keep_units is not None and owner not in keep_units:
+                    continue
+                bucket = unit_results.setdefault(owner, {}).setdefault(check_type, {})
+                bucket.setdefault(list_name, []).append(check)
+
+        for error_path in results.get("parsing_errors") or []:
+            absolute = host_path(error_path, cwd, container_mode) if os.path.isabs(error_path) \
+                else os.path.join(scan_root, error_path.lstrip("/"))
+            relative = "/" + _rel(absolute, target)
+            owner = inventory.owner_of(relative)
+            if keep_units is not None and owner not in keep_units:
+                continue
+            bucket = unit_results.setdefault(owner, {}).setdefault(check_type, {})
+            bucket.setdefault("parsing_errors", []).append(relative)
+
+    return unit_results, report_meta
+
+
+def merge_unit_results(into: Dict[str, Dict[str, Dict[str, list]]],
+                       results: Dict[str, Dict[str, Dict[str, list]]]) -> None:
+    """Add per-unit results from another Checkov run, skipping checks already present."""
+    for unit_id, check_types in results.items():
+        for check_type, lists in check_types.items():
+            bucket = into.setdefault(unit_id, {}).setdefault(check_type, {})
+            for name, items in lists.items():
+                existing = bucket.setdefault(name, [])
+                seen = {json.dumps(item, sort_keys=True) for item in existing}
+                for item in items:
+                    key = json.dumps(item, sort_keys=True)
+                    if key not in seen:
+                        seen.add(key)
+                        existing.append(item)
+
+
+def _check_sort_key(check: Dict[str, Any]):
+    line_range = check.get("file_line_range") or [0, 0]
+    return (
+        check.get("file_path") or "",
+        line_range[0] if line_range else 0,
+        check.get("resource") or "",
+        check.get("check_id") or "",
+    )
+
+
+def build_checkov_output(
+    unit_results: Dict[str, Dict[str, Dict[str, list]]],
+    report_meta: Dict[str, Dict[str, Any]],
+    check_type_order: Optional[List[str]] = None,
+    quiet: bool = False,
+) -> Any:
+    """
+    Assemble Checkov JSON output (single report dict or per-framework list)
+    from per-unit results, with summaries recomputed and deterministic ordering.
+    ``quiet`` mirrors Checkov's --quiet JSON shape (failed checks only, full summary).
+    """
+    merged: Dict[str, Dict[str, list]] = {}
+    for unit_id in sorted(unit_results):
+        for check_type, lists in unit_results[unit_id].items():
+            bucket = merged.setdefault(check_type, {name: [] for name in (*CHECK_LISTS, "parsing_errors")})
+            for name, items in lists.items():
+                bucket.setdefault(name, []).extend(items)
+
+    order = [ct for ct in (check_type_order or []) if ct in merged]
+    order.extend(sorted(ct for ct in merged if ct not in order))
+    versions = [meta.get("checkov_version") for meta in report_meta.values() if meta.get("checkov_version")]
+    default_version = versions[0] if versions else None
+
+    reports = []
+    for check_type in order:
+        lists = merged[check_type]
+        for name in CHECK_LISTS:
+            lists[name] = sorted(lists[name], key=_check_sort_key)
+        lists["parsing_errors"] = sorted(set(lists["parsing_errors"]))
+        resources = {
+            (check.get("file_path"), check.get("resource"))
+            for name in CHECK_LISTS for check in lists[name]
+        }
+        meta = report_meta.get(check_type) or {}
+        summary = {
+            "passed": len(lists["passed_checks"]),
+            "failed": len(lists["failed_checks"]),
+            "skipped": len(lists["skipped_checks"]),
+            "parsing_errors": len(lists["parsing_errors"]),
+            "resource_count": len(resources),
+            "checkov_version": meta.get("checkov_version") or default_version,
+        }
+        if quiet:
+            reports.append({
+                "check_type": check_type,
+                "results": {"failed_checks": lists["failed_checks"]},
+                "summary": summary,
+            })
+            continue
+        report = {
+            "check_type": check_type,
+            "results": {
+                "passed_checks": lists["passed_checks"],
+                "failed_checks": lists["failed_checks"],
+                "skipped_checks": lists["skipped_checks"],
+                "parsing_errors": lists["parsing_errors"],
+            },
+            "summary": summary,
+        }
+        if meta.get("url"):
+            report["url"] = meta["url"]
+        reports.append(report)
+
+    if not reports:
+        return {
+            "passed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "parsing_errors": 0,
+            "resource_count": 0,
+            "checkov_version": default_version,
+        }
+    return reports[0] if len(reports) == 1 else reports
+
+
+class IaCResultCache:
+    """Per-unit Checkov results keyed by target, Checkov arguments and scanner identity."""
+
+    def __init__(self, *identity: Any):
+        self.path = cache_dir("iac") / f"{cache_key(*identity)}.json"
+        data = read_json(self.path, default={})
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            data = {}
+        self.units: Dict[str, Dict[str, Any]] = data.get("units") or {}
+        self.report_meta: Dict[str, Dict[str, Any]] = data.get("report_meta") or {}
+        self.check_type_order: List[str] = data.get("check_type_order") or []
+
+    def changed_units(self, inventory: IaCInventory) -> List[str]:
+        return sorted(
+            unit_id for unit_id, unit in inventory.units.items()
+            if (self.units.get(unit_id) or {}).get("fingerprint") != unit.fingerprint
+        )
+
+    def update(self, inventory: IaCInventory, scanned_units: Iterable[str],
+               unit_results: Dict[str, Dict[str, Dict[str, list]]],
+               report_meta: Dict[str, Dict[str, Any]]) -> None:
+        for unit_id in scanned_units:
+            unit = inventory.units.get(unit_id)
+            if unit is None:
+                continue
+            self.units[unit_id] = {
+                "fingerprint": unit.fingerprint,
+                "results": unit_results.get(unit_id) or {},
+            }
+        # Units whose files were deleted drop out of the report.
+        for unit_id in list(self.units):
+            if unit_id not in inventory.units:
+                del self.units[unit_id]
+        for check_type, meta in report_meta.items():
+            self.report_meta[check_type] = meta
+            if check_type not in self.check_type_order:
+                self.check_type_order.append(check_type)
+
+    def results(self) -> Dict[str, Dict[str, Dict[str, list]]]:
+        return {unit_id: entry.get("results") or {} for unit_id, entry in self.units.items()}
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {
+            "version": CACHE_VERSION,
+            "units": self.units,
+            "report_meta": self.report_meta,
+            "check_type_order": self.check_type_order,
+        })
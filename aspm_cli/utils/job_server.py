@@ -0,0 +1,513 @@
+import contextlib
+import hmac
+import io
+import json
+import os
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from aspm_cli.utils.logger import Logger
+from aspm_cli.utils.subprocess_utils import system_exit_code, worker_process_context
+
+TOKEN_ENV = "ACCUKNOX_SERVE_TOKEN"
+LOG_FILE = "job.log"
+RESULTS_DIR = "results"
+MAX_REQUEST_BYTES = 1024 * 1024
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+WILDCARD_HOSTS = frozenset({"", "0.0.0.0", "::"})
+# The only environment a job may set: its AccuKnox upload settings. Anything
+# else (PATH, SCAN_IMAGE, ...) would let a client choose what the worker runs.
+JOB_ENV_KEYS = frozenset({
+    "ACCUKNOX_TOKEN",
+    "ACCUKNOX_ENDPOINT",
+    "ACCUKNOX_LABEL",
+    "ACCUKNOX_TENANT",
+    "ACCUKNOX_PROJECT",
+    "ACCUKNOX_PROJECT_NAME",
+    "ACCUKNOX_ENABLE_AI_SAST",
+})
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+
+RESULT_CONTENT_TYPES = {
+    ".json": "application/json",
+    ".sarif": "application/json",
+    ".jsonl": "application/x-ndjson",
+}
+JOB_PATH = re.compile(
+    r"^/jobs/(?P<id>[0-9a-f]{32})(?P<tail>/result|/log|/results/(?P<name>[A-Za-z0-9._-]+))?$"
+)
+
+
+class JobRejected(Exception):
+    """A job request the server will not accept; carries the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _run_job(job_dir: str, argv: List[str], cwd: str, env: Dict[str, str]) -> None:
+    """Worker process body: one scan, with the CLI's scan command, in the job's cwd and env."""
+    if hasattr(os, "setpgrp"):
+        # Own process group, so cancelling also stops the scanner subprocesses.
+        os.setpgrp()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    log_fd = os.open(os.path.join(job_dir, LOG_FILE), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    os.dup2(log_fd, 1)
+    os.dup2(log_fd, 2)
+    os.close(log_fd)
+    os.chdir(cwd)
+    os.environ.pop(TOKEN_ENV, None)
+    os.environ.update(env)
+
+    from aspm_cli.cli import build_parser
+    from aspm_cli.utils.common import clean_env_vars
+    from aspm_cli.utils.git_info import GitInfo
+
+    clean_env_vars()
+    # Git reads memoized by the server's parser would be stale for this job.
+    GitInfo.clear_memo()
+    Logger.rebind_streams()
+
+    results_dir = os.path.join(job_dir, RESULTS_DIR)
+    os.makedirs(results_dir, exist_ok=True)
+
+    def keep_result(result_file):
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(result_file)).lstrip(".") or "result"
+        stem, extension = os.path.splitext(name)
+        index = 1
+        while os.path.exists(os.path.join(results_dir, name)):
+            index += 1
+            name = f"{stem}-{index}{extension}"
+        shutil.copyfile(result_file, os.path.join(results_dir, name))
+
+    code = 0
+    try:
+        # Built after chdir: git-derived defaults (--repo-url, --repo-branch) must describe the job's repo.
+        args = build_parser().parse_args(argv)
+        args.result_sink = keep_result
+        args.func(args)
+    except SystemExit as e:
+        code = system_exit_code(e.code)
+    except Exception as e:
+        Logger.get_logger().error(f"Command execution failed: {e}")
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(code)
+
+
+class Job:
+    def __init__(self, scan_type: str, argv: List[str], cwd: str, env: Dict[str, str], job_dir: str):
+        self.id = os.path.basename(job_dir)
+        self.scan_type = scan_type
+        self.argv = argv
+        self.cwd = cwd
+        self.env = env
+        self.dir = job_dir
+        self.status = QUEUED
+        self.exit_code: Optional[int] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.process = None
+        self.cancel_requested = False
+
+    def result_names(self) -> List[str]:
+        """Names of the job's result files (one per uploadable artifact), sorted."""
+        try:
+            return sorted(os.listdir(os.path.join(self.dir, RESULTS_DIR)))
+        except OSError:
+            return []
+
+    def result_path(self, name: Optional[str] = None) -> Optional[str]:
+        """Path of the named result file, or of the first one; None if there is no such file."""
+        names = self.result_names()
+        if name is None:
+            name = names[0] if names else None
+        if name not in names:
+            return None
+        return os.path.join(self.dir, RESULTS_DIR, name)
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "scan_type": self.scan_type,
+            "argv": self.argv,
+            "cwd": self.cwd,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "results": self.result_names() if self.status == FINISHED else [],
+        }
+
+
+class JobServer:
+    """
+    Queue of scan jobs run by a bounded pool of worker processes. Each job is one
+    `scan` command executed in-process by a fresh worker (scanners write result
+    files into, and read config from, the working directory and environment, so
+    jobs cannot share a process). Jobs on the same directory never run at once.
+    """
+
+    def __init__(self, workers: int, queue_size: int, state_dir: Optional[str] = None,
+                 max_finished: int = 1000):
+        from aspm_cli.cli import build_parser
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_finished = max_finished
+        self.keep_state = state_dir is not None
+        self.state_dir = state_dir or tempfile.mkdtemp(prefix="accuknox-serve-")
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._parser = build_parser()
+        self._parse_lock = threading.Lock()
+        self._context = worker_process_context()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, payload: Dict) -> Job:
+        from aspm_cli.scanners import scanner_registry
+
+        if not isinstance(payload, dict):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        scan_type = str(payload.get("scan_type") or "").lower()
+        if scan_type.upper() not in scanner_registry:
+            raise JobRejected(
+                HTTPStatus.BAD_REQUEST,
+                f"Invalid scan_type. Allowed types: {', '.join(key.lower() for key in scanner_registry)}",
+            )
+        args, options, env = payload.get("args", []), payload.get("options", []), payload.get("env", {})
+        if not all(isinstance(value, list) and all(isinstance(item, str) for item in value) for value in (args, options)):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, "'args' and 'options' must be lists of strings")
+        if not isinstance(env, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in env.items()):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, "'env' must be an object of string values")
+        refused = sorted(key for key in env if key not in JOB_ENV_KEYS)
+        if refused:
+            raise JobRejected(
+                HTTPStatus.BAD_REQUEST,
+                f"'env' may only set {', '.join(sorted(JOB_ENV_KEYS))}; refused: {', '.join(refused)}",
+            )
+        cwd = payload.get("cwd") or os.getcwd()
+        if not isinstance(cwd, str) or not os.path.isabs(cwd) or not os.path.isdir(cwd):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, "'cwd' must be an absolute path to an existing directory")
+
+        # `scan [options] <type> [args]` - exactly what the CLI would be given.
+        argv = ["scan", *options, scan_type, *args]
+        self._check_arguments(argv)
+
+        with self._cond:
+            if self._stopping:
+                raise JobRejected(HTTPStatus.SERVICE_UNAVAILABLE, "Server is shutting down")
+            if sum(1 for job in self.jobs.values() if job.status == QUEUED) >= self.queue_size:
+                raise JobRejected(HTTPStatus.TOO_MANY_REQUESTS, f"Job queue is full ({self.queue_size} queued)")
+            job_dir = os.path.join(self.state_dir, uuid.uuid4().hex)
+            os.makedirs(job_dir)
+            job = Job(scan_type, argv, os.path.realpath(cwd), env, job_dir)
+            self.jobs[job.id] = job
+            self._cond.notify_all()
+        return job
+
+    def _check_arguments(self, argv: List[str]) -> None:
+        stderr = io.StringIO()
+        # argparse reports errors on stderr and exits; capture both (one parse at a time).
+        with self._parse_lock, contextlib.redirect_stderr(stderr):
+            try:
+                self._parser.parse_args(argv)
+            except SystemExit as e:
+                if e.code:
+                    message = stderr.getvalue().strip().splitlines()
+                    raise JobRejected(HTTPStatus.BAD_REQUEST, message[-1] if message else "Invalid arguments")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._cond:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; a job that already ended is removed with its files."""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished = time.time()
+            elif job.status == RUNNING:
+                job.cancel_requested = True
+                self._terminate(job)
+            else:
+                del self.jobs[job_id]
+                shutil.rmtree(job.dir, ignore_errors=True)
+            self._cond.notify_all()
+            return job
+
+    def _terminate(self, job: Job) -> None:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(job.process.pid, signal.SIGTERM)
+                return
+            except (ProcessLookupError, PermissionError):
+                pass  # not yet in its own group
+        job.process.terminate()
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while not self._stopping:
+                self._reap()
+                self._evict()
+                job = self._next_runnable()
+                if job is None:
+                    self._cond.wait(timeout=0.5)
+                    continue
+                job.process = self._context.Process(
+                    target=_run_job, args=(job.dir, job.argv, job.cwd, job.env), name=f"scan-job-{job.id}",
+                )
+                job.process.start()
+                job.status = RUNNING
+                job.started = time.time()
+                Logger.get_logger().info(f"Job {job.id} started: {' '.join(job.argv)} (cwd {job.cwd})")
+
+    def _next_runnable(self) -> Optional[Job]:
+        running = [job for job in self.jobs.values() if job.status == RUNNING]
+        if len(running) >= self.workers:
+            return None
+        busy = {job.cwd for job in running}
+        for job in self.jobs.values():
+            if job.status == QUEUED and job.cwd not in busy:
+                return job
+        return None
+
+    def _reap(self) -> None:
+        for job in self.jobs.values():
+            if job.status != RUNNING or job.process.is_alive():
+                continue
+            job.process.join()
+            job.exit_code = job.process.exitcode
+            job.status = CANCELLED if job.cancel_requested else FINISHED
+            job.finished = time.time()
+            job.process.close()
+            job.process = None
+            Logger.get_logger().info(f"Job {job.id} {job.status} (exit code {job.exit_code})")
+
+    def _evict(self) -> None:
+        """Drop the oldest ended jobs, and their files, beyond the retention limit."""
+        ended = [job for job in self.jobs.values() if job.status in (FINISHED, CANCELLED) and job.process is None]
+        if len(ended) <= self.max_finished:
+            return
+        ended.sort(key=lambda job: job.finished or job.created)
+        for job in ended[:len(ended) - self.max_finished]:
+            del self.jobs[job.id]
+            shutil.rmtree(job.dir, ignore_errors=True)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopping = True
+            for job in self.jobs.values():
+                if job.status == RUNNING:
+                    job.cancel_requested = True
+                    self._terminate(job)
+            self._cond.notify_all()
+        self._dispatcher.join()
+        with self._cond:
+            for job in self.jobs.values():
+                if job.process is not None:
+                    job.process.join(timeout=10)
+            self._reap()
+        if not self.keep_state:
+            shutil.rmtree(self.state_dir, ignore_errors=True)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = "accuknox-aspm-scanner"
+
+    @property
+    def jobs(self) -> JobServer:
+        return self.server.jobs
+
+    def log_message(self, format, *args):
+        Logger.get_logger().debug(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: HTTPStatus, body) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _send_file(self, path: str, content_type: str) -> None:
+        with open(path, "rb") as f:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+    def _allowed_host(self, host: Optional[str]) -> bool:
+        allowed = self.server.allowed_hosts
+        return allowed is None or (host or "").lower() in allowed
+
+    def _authorized(self) -> bool:
+        """Host, Origin and bearer token checks; answers the request itself when they fail."""
+        # A Host or Origin we do not serve means a DNS-rebinding or cross-site request.
+        if not self._allowed_host(urlsplit("//" + self.headers.get("Host", "")).hostname):
+            self._send_error(HTTPStatus.FORBIDDEN, "Host not allowed")
+            return False
+        origin = self.headers.get("Origin")
+        if origin is not None and not self._allowed_host(urlsplit(origin).hostname):
+            self._send_error(HTTPStatus.FORBIDDEN, "Origin not allowed")
+            return False
+        token = self.server.auth_token
+        if not token:
+            return True
+        supplied = self.headers.get("Authorization", "")
+        if hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+            return True
+        self._send_error(HTTPStatus.UNAUTHORIZED, "Missing or invalid bearer token")
+        return False
+
+    def _job(self):
+        match = JOB_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return None, None, None
+        job = self.jobs.get(match.group("id"))
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "No such job")
+            return None, None, None
+        return job, match.group("tail"), match.group("name")
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = self.path.split("?", 1)[0]
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok", "workers": self.jobs.workers})
+            return
+        if path == "/jobs":
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.jobs.list()]})
+            return
+        job, tail, name = self._job()
+        if job is None:
+            return
+        if tail is None:
+            self._send_json(HTTPStatus.OK, job.to_dict())
+        elif tail == "/log":
+            log = os.path.join(job.dir, LOG_FILE)
+            if os.path.exists(log):
+                self._send_file(log, "text/plain; charset=utf-8")
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "Job has not started")
+        elif job.status != FINISHED:
+            self._send_error(HTTPStatus.CONFLICT, f"Job is {job.status}")
+        else:
+            result = job.result_path(name)
+            if result is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "No such result file" if name else "Job produced no result file")
+            else:
+                extension = os.path.splitext(result)[1]
+                self._send_file(result, RESULT_CONTENT_TYPES.get(extension, "application/octet-stream"))
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.split("?", 1)[0] != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type must be application/json")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            job = self.jobs.submit(payload)
+        except ValueError:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON")
+            return
+        except JobRejected as e:
+            self._send_error(e.status, str(e))
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        job, tail, _name = self._job()
+        if job is None:
+            return
+        if tail is not None:
+            self._send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Use DELETE /jobs/<id>")
+            return
+        self.jobs.cancel(job.id)
+        self._send_json(HTTPStatus.OK, job.to_dict())
+
+
+def allowed_hosts(host: str, extra_hosts: Iterable[str] = ()) -> Optional[frozenset]:
+    """
+    Host names the API answers to: localhost, the listen address and any extra
+    names. None (any host) when listening on all addresses without extra names.
+    """
+    extra = {name.lower() for name in extra_hosts}
+    if host in WILDCARD_HOSTS and not extra:
+        return None
+    return frozenset(LOCAL_HOSTS | extra | ({host.lower()} - WILDCARD_HOSTS))
+
+
+def serve(host: str, port: int, workers: int, queue_size: int,
+          state_dir: Optional[str] = None, auth_token: Optional[str] = None,
+          extra_hosts: Iterable[str] = (), max_finished: int = 1000) -> None:
+    jobs = JobServer(workers, queue_size, state_dir, max_finished)
+    httpd = ThreadingHTTPServer((host, port), JobRequestHandler)
+    httpd.daemon_threads = True
+    httpd.jobs = jobs
+    httpd.auth_token = auth_token
+    httpd.allowed_hosts = allowed_hosts(host, extra_hosts)
+
+    def _stop(*_args):
+        # shutdown() blocks until serve_forever returns, so it cannot run on the serving thread.
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    Logger.get_logger().info(
+        f"Scan job API listening on http://{httpd.server_address[0]}:{httpd.server_address[1]} "
+        f"({workers} worker(s), queue of {queue_size})"
+    )
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        jobs.shutdown()
+        Logger.get_logger().info("Scan job API stopped")
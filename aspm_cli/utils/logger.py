@@ -1,5 +1,6 @@
 import logging
 import os
+import sys
 from colorama import Fore, init
 
 # Initialize colorama
@@ -55,6 +56,23 @@ class Logger:
         
         return ColoredFormatter(log_format)
     
+    @classmethod
+    def rebind_streams(cls):
+        """
+        Re-wrap stdout/stderr with colorama and point the log handlers at the
+        current sys.stderr, after the process's stdio was redirected (daemon and
+        job workers). Colors are then kept or stripped for the new target.
+        """
+        from colorama import deinit
+
+        deinit()
+        init(autoreset=True)
+        logger = cls.get_logger()
+        logger.setLevel(logging.DEBUG if os.getenv('DEBUG', 'FALSE').upper() == 'TRUE' else logging.INFO)
+        for handler in logger.handlers:
+            if isinstance(handler, logging.StreamHandler):
+                handler.setStream(sys.stderr)
+
     @staticmethod
     def log_with_color(level, message, color=None):
         # Get the logger
@@ -0,0 +1,95 @@
+import hashlib
+import mmap
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from aspm_cli.utils.cache import cache_dir, cache_key, read_json, write_json_atomic
+from aspm_cli.utils.ml_scan import split_modelscan_output
+
+INDEX_FILE = "index.json"
+# Stand-in for the model path inside cached reports; rewritten on every hit.
+MODEL_PLACEHOLDER = "__accuknox_model__"
+# Bytes mapped per window while hashing; a multiple of every platform's mmap granularity.
+HASH_WINDOW = 64 * 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """Streaming SHA-256 of a file via sliding mmap windows (bounded memory for multi-GB models)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        try:
+            offset = 0
+            while offset < size:
+                length = min(HASH_WINDOW, size - offset)
+                with mmap.mmap(handle.fileno(), length, offset=offset, access=mmap.ACCESS_READ) as window:
+                    digest.update(window)
+                offset += length
+        except (OSError, ValueError):
+            # Filesystems without mmap support: fall back to buffered reads.
+            digest = hashlib.sha256()
+            handle.seek(0)
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def to_cache_entry(modelscan_output: Dict[str, Any], input_path: str) -> Dict[str, Any]:
+    """Replace the scanned path with a placeholder so the report can be reused for any path."""
+    return split_modelscan_output(
+        modelscan_output, {input_path: (MODEL_PLACEHOLDER, MODEL_PLACEHOLDER)}
+    )[input_path]
+
+
+def from_cache_entry(entry: Dict[str, Any], input_path: str, absolute_path: str) -> Dict[str, Any]:
+    return split_modelscan_output(entry, {MODEL_PLACEHOLDER: (input_path, absolute_path)})[MODEL_PLACEHOLDER]
+
+
+class MLScanCache:
+    """
+    modelscan reports keyed by model content (SHA-256) and scanner identity
+    (image ID or local binary). A (size, mtime_ns, inode) index avoids
+    re-hashing files that have not changed since they were last seen.
+    """
+
+    def __init__(self, scanner_identity: str):
+        root = cache_dir("ml-scan")
+        self.index_path = root / INDEX_FILE
+        self.results_dir = cache_dir("ml-scan", cache_key(scanner_identity))
+        index = read_json(self.index_path, default={})
+        self._index: Dict[str, Dict[str, Any]] = index if isinstance(index, dict) else {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def digest(self, path: str) -> str:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        with self._lock:
+            known = self._index.get(real_path)
+        if known and known.get("stat") == signature and known.get("sha256"):
+            return known["sha256"]
+        sha256 = hash_file(real_path)
+        with self._lock:
+            self._index[real_path] = {"stat": signature, "sha256": sha256}
+            self._dirty = True
+        return sha256
+
+    def has(self, sha256: str) -> bool:
+        return (self.results_dir / f"{sha256}.json").is_file()
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        entry = read_json(self.results_dir / f"{sha256}.json")
+        return entry if isinstance(entry, dict) else None
+
+    def put(self, sha256: str, entry: Dict[str, Any]) -> None:
+        write_json_atomic(self.results_dir / f"{sha256}.json", entry)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        # Drop index entries for files that no longer exist.
+        index = {path: value for path, value in self._index.items() if os.path.exists(path)}
+        write_json_atomic(self.index_path, index)
+        self._dirty = False
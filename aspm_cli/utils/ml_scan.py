@@ -2,14 +2,10 @@ import json
 import os
 import re
 import shlex
+import shutil
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
-from aspm_cli.utils.path_safety import resolve_path_within_root
-
-MODEL_EXTENSIONS = frozenset({".pb", ".h5", ".keras", ".pth", ".pt", ".ckpt", ".npy", ".pkl"})
-SKIP_DIR_NAMES = frozenset({".git", ".accuknox-modelscan", "node_modules", "__pycache__"})
-
 
 def parse_scan_path_from_command(command: str) -> str:
     """Extract the -p/--path target from a modelscan command string."""
@@ -76,32 +72,22 @@ def normalize_modelscan_cli_args(command: str, output_file: str) -> List[str]:
     return normalized
 
 
-def discover_model_files(scan_root: str, cwd: Optional[str] = None) -> List[str]:
-    """Return model artifact paths under scan_root (or scan_root itself if it is a model file)."""
-    cwd = cwd or os.getcwd()
+def stage_file(source: str, destination: str) -> None:
+    """
+    Expose a model file at another path without copying it: hardlink, else a
+    relative symlink (valid inside the /workdir mount too), else a copy.
+    """
     try:
-        path = resolve_path_within_root(scan_root, cwd)
-    except ValueError:
-        return []
-
-    if os.path.isfile(path):
-        return [path] if _is_model_file(path) else []
-
-    if not os.path.isdir(path):
-        return []
-
-    discovered: List[str] = []
-    for dirpath, dirnames, filenames in os.walk(path):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIR_NAMES and not d.startswith(".")]
-        for filename in filenames:
-            full_path = os.path.join(dirpath, filename)
-            if _is_model_file(full_path):
-                discovered.append(full_path)
-    return sorted(discovered)
-
-
-def _is_model_file(path: str) -> bool:
-    return os.path.splitext(path)[1].lower() in MODEL_EXTENSIONS
+        os.link(source, destination)
+        return
+    except OSError:
+        pass
+    try:
+        os.symlink(os.path.relpath(source, os.path.dirname(destination)), destination)
+        return
+    except OSError:
+        pass
+    shutil.copy2(source, destination)
 
 
 def _parse_github_model_id(repo_url: Optional[str]) -> Optional[str]:
@@ -200,7 +186,176 @@ def count_issues(modelscan_results: List[Dict[str, Any]]) -> int:
     return total
 
 
+class ModelScanPayloadWriter:
+    """
+    Stream an ``ondemand_modelscan`` payload to disk as results complete.
+
+    The file is a header line (envelope up to the ``modelscan_results`` array),
+    one compact result per line, and a closing line written by ``close()``.
+    A crashed run therefore leaves every completed result on disk; opening
+    with ``resume=True`` keeps those results and appends after them.
+    """
+
+    FOOTER = "]}}\n"
+
+    def __init__(self, path: str, metadata: Dict[str, str], resume: bool = False):
+        self.path = path
+        self.resume = resume
+        self.result_count = 0
+        self.issue_count = 0
+        self.completed = set()
+        envelope = json.dumps(build_ondemand_modelscan_payload([], metadata), separators=(",", ":"))
+        # modelscan_results is the envelope's last key: cut it open after "[".
+        self._header = envelope[:-len("]}}")] + "\n"
+        self._handle = None
+
+    def __enter__(self):
+        if not (self.resume and self._reopen_partial()):
+            self._handle = open(self.path, "w", encoding="utf-8")
+            self._handle.write(self._header)
+            self._handle.flush()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._handle:
+            # Leave the partial file (header + completed results) for --resume.
+            self._handle.close()
+            self._handle = None
+        return False
+
+    def _reopen_partial(self) -> bool:
+        """Load completed results from a previous run of the same model; False to start fresh."""
+        try:
+            handle = open(self.path, "r+b")
+        except OSError:
+            return False
+        with handle:
+            if handle.readline().decode("utf-8", "replace") != self._header:
+                return False
+            end_of_results = handle.tell()
+            while True:
+                line = handle.readline()
+                if not line.endswith(b"\n") or line.decode("utf-8", "replace") == self.FOOTER:
+                    break
+                try:
+                    result = json.loads(line.decode("utf-8").lstrip(","))
+                except ValueError:
+                    break
+                self._count(result)
+                end_of_results = handle.tell()
+            handle.truncate(end_of_results)
+        self._handle = open(self.path, "a", encoding="utf-8")
+        return True
+
+    def _count(self, result: Dict[str, Any]) -> None:
+        self.result_count += 1
+        self.issue_count += count_issues([result])
+        if result.get("model_path"):
+            self.completed.add(result["model_path"])
+
+    def write(self, result: Dict[str, Any]) -> None:
+        separator = "," if self.result_count else ""
+        self._handle.write(separator + json.dumps(result, separators=(",", ":")) + "\n")
+        self._handle.flush()
+        self._count(result)
+
+    def close(self) -> None:
+        if self._handle:
+            self._handle.write(self.FOOTER)
+            self._handle.close()
+            self._handle = None
+
+
 def load_modelscan_output(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as handle:
         data = json.load(handle)
     return data if isinstance(data, dict) else {"issues": data}
+
+
+def _source_pattern(token: str):
+    return re.compile(r"(?:^|.*[/\\])" + re.escape(token) + r"(?=$|[:/\\])")
+
+
+def _rebase_source(value: Any, patterns, targets) -> tuple:
+    """Return (token, rewritten value) for a source string or {"source": ...} entry."""
+    source = value.get("source") if isinstance(value, dict) else value
+    if not isinstance(source, str):
+        return None, value
+    for token, pattern in patterns:
+        match = pattern.match(source)
+        if match:
+            rewritten = targets[token][0] + source[match.end():]
+            if isinstance(value, dict):
+                value = dict(value)
+                value["source"] = rewritten
+                return token, value
+            return token, rewritten
+    return None, value
+
+
+def split_modelscan_output(
+    modelscan_output: Dict[str, Any],
+    targets: Dict[str, tuple],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Split one modelscan JSON report covering several files into per-file reports.
+
+    ``targets`` maps a unique file-name token (the staged file name, or a cache
+    placeholder) to ``(input_path, absolute_path)`` as a single-file run would
+    report them. Sources are rewritten to those paths and summary totals are
+    recomputed. Entries that cannot be attributed are kept on every file.
+    """
+    patterns = [(token, _source_pattern(token)) for token in targets]
+    summary = modelscan_output.get("summary") or {}
+    per_file: Dict[str, Dict[str, list]] = {
+        token: {"issues": [], "errors": [], "scanned": [], "skipped": []} for token in targets
+    }
+
+    def distribute(kind: str, values: Any):
+        for value in values if isinstance(values, list) else []:
+            token, rewritten = _rebase_source(value, patterns, targets)
+            owners = [token] if token else list(targets)
+            for owner in owners:
+                per_file[owner][kind].append(rewritten)
+
+    distribute("issues", modelscan_output.get("issues"))
+    distribute("errors", modelscan_output.get("errors"))
+    distribute("scanned", (summary.get("scanned") or {}).get("scanned_files"))
+    distribute("skipped", (summary.get("skipped") or {}).get("skipped_files"))
+
+    reports: Dict[str, Dict[str, Any]] = {}
+    for token, (input_path, absolute_path) in targets.items():
+        parts = per_file[token]
+        by_severity = {key: 0 for key in (summary.get("total_issues_by_severity") or {})}
+        for issue in parts["issues"]:
+            severity = str((issue or {}).get("severity") or "").upper() if isinstance(issue, dict) else ""
+            if severity:
+                by_severity[severity] = by_severity.get(severity, 0) + 1
+
+        report = dict(modelscan_output)
+        report["issues"] = parts["issues"]
+        report["errors"] = parts["errors"]
+        file_summary = dict(summary)
+        file_summary.update({
+            "total_issues_by_severity": by_severity,
+            "total_issues": len(parts["issues"]),
+            "input_path": input_path,
+            "absolute_path": absolute_path,
+        })
+        if "scanned" in summary:
+            file_summary["scanned"] = {
+                **(summary.get("scanned") or {}),
+                "total_scanned": len(parts["scanned"]),
+                "scanned_files": parts["scanned"],
+            }
+        if "skipped" in summary:
+            file_summary["skipped"] = {
+                **(summary.get("skipped") or {}),
+                "total_skipped": len(parts["skipped"]),
+                "skipped_files": parts["skipped"],
+            }
+        report["summary"] = file_summary
+        reports[token] = report
+    return reports
@@ -0,0 +1,221 @@
+import fnmatch
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from aspm_cli.utils.path_safety import resolve_path_within_root
+from aspm_cli.utils.subprocess_utils import default_job_count
+
+# Extensions modelscan routes to a scanner on its own.
+MODEL_EXTENSIONS = frozenset({".pb", ".h5", ".keras", ".pth", ".pt", ".ckpt", ".npy", ".pkl", ".pickle", ".joblib"})
+# Generic or misleading extensions (and extensionless files) are only scanned if their header looks like a model.
+SNIFF_EXTENSIONS = frozenset({"", ".bin", ".dat", ".data", ".model", ".safetensors", ".weights"})
+# Extensionless files that are never models: project files, and everything in script directories.
+NON_MODEL_NAMES = frozenset({
+    "AUTHORS", "BUILD", "CHANGELOG", "CODEOWNERS", "CONTRIBUTING", "COPYING", "Dockerfile", "Gemfile",
+    "Jenkinsfile", "LICENSE", "Makefile", "NOTICE", "Pipfile", "Procfile", "README", "Rakefile",
+    "Vagrantfile", "VERSION", "WORKSPACE", "gradlew", "mvnw",
+})
+NON_MODEL_DIR_NAMES = frozenset({"bin", "sbin", "scripts", "hooks", "docs"})
+# Extensions modelscan accepts without staging under a different name.
+MODELSCAN_EXTENSIONS = MODEL_EXTENSIONS | frozenset({".bin", ".dat", ".data"})
+SKIP_DIR_NAMES = frozenset({".git", ".accuknox-modelscan", "node_modules", "__pycache__"})
+
+SNIFF_BYTES = 16
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+ZIP_SIGNATURE = b"PK\x03\x04"
+PICKLE_PROTO_OPCODE = 0x80
+# Staging extension per detected format.
+FORMAT_EXTENSIONS = {"pickle": ".pkl", "hdf5": ".h5", "torch-zip": ".pt", "protobuf": ".pb"}
+
+
+def sniff_model_format(path: str) -> Optional[str]:
+    """
+    Classify a file by its first bytes: pickle (protocol 2+), HDF5, PyTorch zip
+    archive or a SavedModel-shaped protobuf. Returns None for anything else.
+    """
+    try:
+        # Raw fd I/O: the buffered file object costs more than the read itself here.
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            header = os.read(fd, SNIFF_BYTES)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+    if len(header) < 4:
+        return None
+    if header[0] == PICKLE_PROTO_OPCODE and 2 <= header[1] <= 5:
+        return "pickle"
+    if header.startswith(HDF5_SIGNATURE):
+        return "hdf5"
+    if header.startswith(ZIP_SIGNATURE):
+        return "torch-zip" if _is_torch_archive(path) else None
+    # SavedModel: field 1 varint (schema version), then field 2 length-delimited (meta graphs).
+    if header[0] == 0x08 and header[1] < 0x80 and header[2] == 0x12:
+        return "protobuf"
+    return None
+
+
+def _is_torch_archive(path: str) -> bool:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return any(name == "data.pkl" or name.endswith("/data.pkl") for name in archive.namelist())
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+# _name_kind results: a model by extension, or a file whose header decides.
+_MODEL, _SNIFF = 1, 2
+
+
+def _name_kind(name: str, in_script_dir: bool) -> int:
+    """Classify a file by name alone (os.path.splitext semantics): _MODEL, _SNIFF or 0."""
+    base = name.lstrip(".")
+    dot = base.rfind(".")
+    if dot < 0:
+        # Dotfiles (.gitignore, .env, ...) have no extension either.
+        return 0 if in_script_dir or base != name or name in NON_MODEL_NAMES else _SNIFF
+    extension = base[dot:].lower()
+    if extension in MODEL_EXTENSIONS:
+        return _MODEL
+    return _SNIFF if extension in SNIFF_EXTENSIONS else 0
+
+
+def classify_model_file(path: str) -> Optional[str]:
+    """Return the format label ("extension" or a sniffed format) if path is a model file."""
+    directory, name = os.path.split(path)
+    kind = _name_kind(name, os.path.basename(directory) in NON_MODEL_DIR_NAMES)
+    if kind == _MODEL:
+        return "extension"
+    if kind == _SNIFF:
+        return sniff_model_format(path)
+    return None
+
+
+def model_stage_extension(path: str) -> Optional[str]:
+    """Extension to stage a file under so modelscan picks a scanner, or None if its name already works."""
+    if os.path.splitext(path)[1].lower() in MODELSCAN_EXTENSIONS:
+        return None
+    return FORMAT_EXTENSIONS.get(sniff_model_format(path) or "")
+
+
+class _IgnoreRule:
+    """One .gitignore line, evaluated against directories only."""
+
+    def __init__(self, base: str, line: str):
+        self.base = base
+        self.negate = line.startswith("!")
+        pattern = line[1:] if self.negate else line
+        pattern = pattern.rstrip("/")
+        self.anchored = "/" in pattern
+        self.pattern = pattern.lstrip("/")
+
+    def matches(self, path: str) -> bool:
+        relative = os.path.relpath(path, self.base).replace(os.sep, "/")
+        if relative.startswith(".."):
+            return False
+        if not self.anchored:
+            return fnmatch.fnmatchcase(os.path.basename(path), self.pattern)
+        if fnmatch.fnmatchcase(relative, self.pattern):
+            return True
+        return self.pattern.startswith("**/") and fnmatch.fnmatchcase(relative, self.pattern[3:])
+
+
+def _read_ignore_rules(directory: str) -> List[_IgnoreRule]:
+    try:
+        with open(os.path.join(directory, ".gitignore"), "r", encoding="utf-8", errors="ignore") as handle:
+            lines = handle.read().splitlines()
+    except OSError:
+        return []
+    rules = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            rules.append(_IgnoreRule(directory, line))
+    return rules
+
+
+def _is_ignored(path: str, rules: Tuple[_IgnoreRule, ...]) -> bool:
+    ignored = False
+    for rule in rules:
+        if rule.matches(path):
+            ignored = not rule.negate
+    return ignored
+
+
+def _prune(entry: os.DirEntry, rules: Tuple[_IgnoreRule, ...]) -> bool:
+    name = entry.name
+    return name in SKIP_DIR_NAMES or name.startswith(".") or _is_ignored(entry.path, rules)
+
+
+def _scan_directory(directory: str, rules: Tuple[_IgnoreRule, ...]) -> Tuple[List[str], List[str], Tuple[_IgnoreRule, ...]]:
+    """(subdirectories to walk, model files, ignore rules in effect) of one directory."""
+    entries = list(os.scandir(directory))
+    if any(entry.name == ".gitignore" for entry in entries):
+        rules = rules + tuple(_read_ignore_rules(directory))
+    in_script_dir = os.path.basename(directory) in NON_MODEL_DIR_NAMES
+    directories, files = [], []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not _prune(entry, rules):
+                    directories.append(entry.path)
+                continue
+            # Names first: only candidates cost an is_file() stat or a header read.
+            kind = _name_kind(entry.name, in_script_dir)
+            if kind and entry.is_file() and (kind == _MODEL or sniff_model_format(entry.path)):
+                files.append(entry.path)
+        except OSError:
+            continue
+    return directories, files, rules
+
+
+def _walk(directory: str, rules: Tuple[_IgnoreRule, ...], found: List[str]) -> None:
+    try:
+        directories, files, rules = _scan_directory(directory, rules)
+    except OSError:
+        return
+    found.extend(files)
+    for subdirectory in directories:
+        _walk(subdirectory, rules, found)
+
+
+def discover_model_files(scan_root: str, cwd: Optional[str] = None, jobs: Optional[int] = None) -> List[str]:
+    """
+    Return model artifact paths under scan_root (or scan_root itself if it is a model file).
+
+    Directories are walked with os.scandir, in parallel across the top-level
+    subdirectories, pruning hidden/vendored directories and directories matched
+    by .gitignore files. Files are classified by extension, or by their header
+    for generic extensions and extensionless files (except dotfiles, well-known
+    project files and files in script directories).
+    """
+    cwd = cwd or os.getcwd()
+    try:
+        path = resolve_path_within_root(scan_root, cwd)
+    except ValueError:
+        return []
+
+    if os.path.isfile(path):
+        return [path] if classify_model_file(path) else []
+
+    if not os.path.isdir(path):
+        return []
+
+    try:
+        directories, discovered, rules = _scan_directory(path, ())
+    except OSError:
+        return []
+
+    def walk_subtree(directory: str) -> List[str]:
+        found: List[str] = []
+        _walk(directory, rules, found)
+        return found
+
+    workers = max(1, min(jobs or default_job_count(), len(directories) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for found in pool.map(walk_subtree, directories):
+            discovered.extend(found)
+    return sorted(discovered)
@@ -0,0 +1,81 @@
+import fnmatch
+import os
+from typing import Iterable, List, Tuple
+
+from aspm_cli.utils.iac_cache import IaCInventory
+
+# Files that make a directory the root of a dependency project for SCA sharding.
+SCA_PROJECT_FILES = frozenset({
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+    "go.mod", "pom.xml", "build.gradle", "build.gradle.kts",
+    "Pipfile", "Pipfile.lock", "poetry.lock", "pyproject.toml", "setup.py", "uv.lock",
+    "Gemfile", "Gemfile.lock", "composer.json", "composer.lock",
+    "Cargo.toml", "Cargo.lock", "packages.config", "Package.swift", "Podfile", "pubspec.yaml", "mix.exs",
+})
+SCA_PROJECT_PATTERNS = ("requirements*.txt", "*.csproj", "*.sln")
+
+# Vendored trees hold the manifests of installed packages, not projects of the repo.
+SKIP_DIR_NAMES = frozenset({"node_modules", "bower_components", "vendor", "__pycache__", ".terraform"})
+
+# (shard directory, shard directories nested directly inside it)
+Shard = Tuple[str, List[str]]
+
+
+def _is_project_file(name: str) -> bool:
+    return name in SCA_PROJECT_FILES or any(fnmatch.fnmatch(name, pattern) for pattern in SCA_PROJECT_PATTERNS)
+
+
+def _inside(path: str, root: str) -> bool:
+    return path != root and path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def find_sca_project_roots(target: str) -> List[str]:
+    """Directories under target holding a dependency manifest or lock file, found with one walk."""
+    target = os.path.realpath(target)
+    roots = []
+    for dirpath, dirnames, filenames in os.walk(target):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIR_NAMES and not d.startswith("."))
+        if dirpath != target and any(_is_project_file(name) for name in filenames):
+            roots.append(dirpath)
+    return roots
+
+
+def find_service_roots(target: str) -> List[str]:
+    """Top-most dependency-project directories under target (nested projects belong to them)."""
+    roots: List[str] = []
+    # Sorted paths list every parent before its children.
+    for root in sorted(find_sca_project_roots(target)):
+        if not any(_inside(root, parent) for parent in roots):
+            roots.append(root)
+    return roots
+
+
+def find_iac_project_roots(inventory: IaCInventory) -> List[str]:
+    """Helm charts and top-most Terraform directories (nested modules stay with their root)."""
+    roots = [unit.path for unit in inventory.units.values() if unit.kind == "chart"]
+    terraform_roots = []
+    # Sorted paths list every parent before its children.
+    for path in sorted(unit.path for unit in inventory.units.values() if unit.kind == "tfdir"):
+        if not any(_inside(path, root) for root in terraform_roots):
+            terraform_roots.append(path)
+    return sorted(root for root in roots + terraform_roots if root != inventory.target)
+
+
+def plan_shards(target: str, roots: Iterable[str], files: Iterable[str] = None) -> List[Shard]:
+    """
+    Shards for target: each project root plus target itself (for files outside any
+    project), each paired with the shard roots directly nested inside it so that its
+    scan can skip them. With ``files``, target is only a shard when one of them lies
+    outside every project root.
+    """
+    target = os.path.realpath(target)
+    roots = sorted(set(roots) - {target})
+    nested = {root: [] for root in [target, *roots]}
+    for root in roots:
+        parent = max((other for other in nested if _inside(root, other)), key=len)
+        nested[parent].append(root)
+
+    shards = [(root, nested[root]) for root in roots]
+    if files is None or any(not any(_inside(path, root) for root in roots) for path in files):
+        shards.insert(0, (target, nested[target]))
+    return shards
@@ -0,0 +1,159 @@
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+from aspm_cli.utils.iac_cache import CHECK_LISTS, build_checkov_output, iter_reports, merge_unit_results
+from aspm_cli.utils.ml_scan import count_issues
+from aspm_cli.utils.secret_results import dedupe_trufflehog_findings, load_jsonl, write_jsonl
+
+# Result formats that `results merge` combines, by scan type.
+MERGEABLE_SCAN_TYPES = ("sast", "secret", "iac", "ml-scan")
+# Checkov summary counts that a --quiet report keeps but whose check lists it drops.
+_QUIET_SUMMARY_COUNTS = ("passed", "skipped", "parsing_errors", "resource_count")
+
+
+def _json_key(item: Any) -> str:
+    return json.dumps(item, sort_keys=True)
+
+
+def _unique(items: Sequence[Any], key=_json_key) -> List[Any]:
+    seen, unique = set(), []
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            unique.append(item)
+    return unique
+
+
+def _opengrep_finding_key(finding: Dict[str, Any]) -> Tuple:
+    start, end = finding.get("start") or {}, finding.get("end") or {}
+    return (finding.get("check_id"), finding.get("path"),
+            start.get("line"), start.get("col"), end.get("line"), end.get("col"))
+
+
+def merge_opengrep_reports(reports: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """One OpenGrep JSON report: results and errors de-duplicated, scanned paths combined."""
+    merged = dict(reports[0]) if reports else {}
+    merged["results"] = _unique([f for r in reports for f in r.get("results") or []], key=_opengrep_finding_key)
+    merged["errors"] = _unique([e for r in reports for e in r.get("errors") or []])
+    scanned = sorted({path for r in reports for path in (r.get("paths") or {}).get("scanned") or []})
+    if scanned or any("paths" in r for r in reports):
+        merged["paths"] = {**(merged.get("paths") or {}), "scanned": scanned}
+    return merged
+
+
+def merge_checkov_reports(reports: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    One Checkov report (per-framework list plus the repo details entry) from several.
+    Checks are de-duplicated per framework and summaries recomputed; counts that
+    --quiet reports do not list (passed, skipped, ...) are summed from the inputs.
+    """
+    unit_results: Dict[str, Dict[str, Dict[str, list]]] = {}
+    report_meta: Dict[str, Dict[str, Any]] = {}
+    check_type_order: List[str] = []
+    summed: Dict[str, Dict[str, int]] = {}
+    quiet = True
+    details = None
+
+    for data in reports:
+        for entry in data if isinstance(data, list) else [data]:
+            if isinstance(entry, dict) and "details" in entry and details is None:
+                details = entry
+        for report in iter_reports(data):
+            check_type = report["check_type"]
+            results = report.get("results") or {}
+            summary = report.get("summary") or {}
+            quiet = quiet and "passed_checks" not in results
+            merge_unit_results(unit_results, {"merged": {check_type: {
+                name: results.get(name) or [] for name in (*CHECK_LISTS, "parsing_errors")
+            }}})
+            report_meta.setdefault(check_type, {"url": report.get("url"),
+                                                "checkov_version": summary.get("checkov_version")})
+            if check_type not in check_type_order:
+                check_type_order.append(check_type)
+            counts = summed.setdefault(check_type, dict.fromkeys(_QUIET_SUMMARY_COUNTS, 0))
+            for name in _QUIET_SUMMARY_COUNTS:
+                counts[name] += summary.get(name) or 0
+
+    output = build_checkov_output(unit_results, report_meta, check_type_order, quiet=quiet)
+    merged = output if isinstance(output, list) else [output]
+    if quiet:
+        for report in merged:
+            if report.get("check_type") in summed:
+                report["summary"].update(summed[report["check_type"]])
+    if details is not None:
+        merged.append(details)
+    return merged
+
+
+def merge_modelscan_payloads(payloads: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """One ondemand_modelscan payload; a model path scanned by several inputs is kept once."""
+    envelope = dict((payloads[0] if payloads else {}).get("ondemand_modelscan") or {})
+    results = [
+        result for payload in payloads
+        for result in (payload.get("ondemand_modelscan") or {}).get("modelscan_results") or []
+    ]
+    envelope["modelscan_results"] = _unique(results, key=lambda r: r.get("model_path") or _json_key(r))
+    return {"ondemand_modelscan": envelope}
+
+
+def detect_result_format(path: str) -> str:
+    """Scan type whose result file this is: sast, secret (TruffleHog JSONL), iac or ml-scan."""
+    with open(path, "r", encoding="utf-8") as handle:
+        text = handle.read()
+    try:
+        data = json.loads(text) if text.strip() else None
+    except ValueError:
+        data = None
+    if data is None:
+        lines = [line for line in text.splitlines() if line.strip()]
+        try:
+            if all(isinstance(json.loads(line), dict) for line in lines):
+                return "secret"
+        except ValueError:
+            pass
+        raise ValueError(f"{path}: not a JSON or JSONL scan result")
+    if isinstance(data, dict) and "ondemand_modelscan" in data:
+        return "ml-scan"
+    if isinstance(data, dict) and "SourceMetadata" in data:
+        return "secret"
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return "sast"
+    entries = data if isinstance(data, list) else [data]
+    if any(isinstance(entry, dict) and ("check_type" in entry or "details" in entry) for entry in entries):
+        return "iac"
+    raise ValueError(f"{path}: unrecognized scan result format")
+
+
+def merge_result_files(paths: Sequence[str], output: str) -> Tuple[str, int]:
+    """
+    Merge per-shard result files of one scan type into output.
+    Returns (scan type, number of findings in the merged report).
+    """
+    formats = {path: detect_result_format(path) for path in paths}
+    scan_types = set(formats.values())
+    if len(scan_types) != 1:
+        listing = ", ".join(f"{path} ({scan_type})" for path, scan_type in formats.items())
+        raise ValueError(f"Result files are from different scan types: {listing}")
+    scan_type = scan_types.pop()
+
+    if scan_type == "secret":
+        findings = dedupe_trufflehog_findings([f for path in paths for f in load_jsonl(path)])
+        return scan_type, write_jsonl(output, findings)
+
+    reports = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            reports.append(json.load(handle))
+    if scan_type == "sast":
+        merged = merge_opengrep_reports(reports)
+        count = len(merged["results"])
+    elif scan_type == "iac":
+        merged = merge_checkov_reports(reports)
+        count = sum(len((r.get("results") or {}).get("failed_checks") or []) for r in iter_reports(merged))
+    else:
+        merged = merge_modelscan_payloads(reports)
+        count = count_issues(merged["ondemand_modelscan"]["modelscan_results"])
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(merged, handle, indent=2)
+    return scan_type, count
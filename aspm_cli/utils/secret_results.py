@@ -0,0 +1,323 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from aspm_cli.utils.cache import read_json, write_json_atomic
+
+FindingKey = Tuple[str, str, str, str]
+
+BASELINE_VERSION = 1
+# Findings kept between runs (incremental state) carry the secret's SHA-256 instead
+# of the secret: JSON findings in this field, SARIF results in this property.
+SECRET_HASH_FIELD = "SecretSHA256"
+SARIF_SECRET_HASH_PROPERTY = "secretSha256"
+REDACTED = "REDACTED"
+
+
+def hash_secret(raw: Optional[str]) -> str:
+    """SHA-256 of a raw secret so it can be compared without being stored in clear."""
+    return hashlib.sha256((raw or "").encode("utf-8")).hexdigest()
+
+
+def load_jsonl(path: str) -> List[Dict[str, Any]]:
+    """Read TruffleHog JSONL output, skipping blank or non-JSON lines."""
+    findings = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                finding = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(finding, dict):
+                findings.append(finding)
+    return findings
+
+
+def write_jsonl(path: str, findings: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        for finding in findings:
+            handle.write(json.dumps(finding, separators=(",", ":")))
+            handle.write("\n")
+            count += 1
+    return count
+
+
+def _trufflehog_source_data(finding: Dict[str, Any]) -> Dict[str, Any]:
+    data = (finding.get("SourceMetadata") or {}).get("Data") or {}
+    # Data is keyed by source type: {"Git": {...}}, {"Filesystem": {...}}, ...
+    for value in data.values():
+        if isinstance(value, dict):
+            return value
+    return {}
+
+
+def trufflehog_finding_key(finding: Dict[str, Any]) -> FindingKey:
+    """(detector, raw secret hash, file, commit) identity of a TruffleHog finding."""
+    source = _trufflehog_source_data(finding)
+    detector = str(finding.get("DetectorName") or finding.get("DetectorType") or "")
+    raw = finding.get("RawV2") or finding.get("Raw") or ""
+    return (
+        detector,
+        finding.get(SECRET_HASH_FIELD) or hash_secret(raw),
+        str(source.get("file") or ""),
+        str(source.get("commit") or ""),
+    )
+
+
+def trufflehog_finding_location(finding: Dict[str, Any]) -> Tuple[str, int]:
+    source = _trufflehog_source_data(finding)
+    return str(source.get("file") or ""), int(source.get("line") or 0)
+
+
+def trufflehog_finding_label(finding: Dict[str, Any]) -> str:
+    return f"{finding.get('DetectorName') or 'secret'}{' (verified)' if finding.get('Verified') else ''}"
+
+
+def parse_trufflehog_output(output: Optional[str]) -> List[Tuple[str, int, str]]:
+    """(file, line, label) of each distinct finding in TruffleHog --json output."""
+    findings = []
+    for line in (output or "").splitlines():
+        try:
+            finding = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(finding, dict) and finding.get("SourceMetadata"):
+            findings.append(finding)
+    return [(*trufflehog_finding_location(finding), trufflehog_finding_label(finding))
+            for finding in dedupe_trufflehog_findings(findings)]
+
+
+def dedupe_trufflehog_findings(findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = set()
+    unique = []
+    for finding in findings:
+        key = trufflehog_finding_key(finding)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(finding)
+    return unique
+
+
+def _sarif_result_key(result: Dict[str, Any]) -> FindingKey:
+    location = ((result.get("locations") or [{}])[0] or {}).get("physicalLocation") or {}
+    uri = (location.get("artifactLocation") or {}).get("uri") or ""
+    snippet = ((location.get("region") or {}).get("snippet") or {}).get("text") or ""
+    commit = (result.get("partialFingerprints") or {}).get("commitSha") or ""
+    secret_hash = (result.get("properties") or {}).get(SARIF_SECRET_HASH_PROPERTY) or hash_secret(snippet)
+    return (str(result.get("ruleId") or ""), secret_hash, uri, commit)
+
+
+def gitleaks_finding_key(finding: Dict[str, Any]) -> FindingKey:
+    """Identity of a Gitleaks finding (native JSON entry or SARIF result)."""
+    if "ruleId" in finding or "locations" in finding:
+        return _sarif_result_key(finding)
+    return (
+        str(finding.get("RuleID") or ""),
+        finding.get(SECRET_HASH_FIELD) or hash_secret(finding.get("Secret")),
+        str(finding.get("File") or ""),
+        str(finding.get("Commit") or ""),
+    )
+
+
+def gitleaks_finding_location(finding: Dict[str, Any]) -> Tuple[str, int]:
+    return str(finding.get("File") or ""), int(finding.get("StartLine") or 0)
+
+
+def redact_trufflehog_finding(finding: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a TruffleHog finding without the raw secret; SecretSHA256 keeps its identity."""
+    redacted = {key: value for key, value in finding.items() if key not in ("Raw", "RawV2")}
+    redacted[SECRET_HASH_FIELD] = trufflehog_finding_key(finding)[1]
+    return redacted
+
+
+def redact_gitleaks_finding(finding: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a Gitleaks finding (JSON or SARIF) with the secret replaced by its SHA-256."""
+    secret_hash = gitleaks_finding_key(finding)[1]
+    if "ruleId" in finding or "locations" in finding:
+        redacted = json.loads(json.dumps(finding))
+        for location in redacted.get("locations") or []:
+            region = ((location or {}).get("physicalLocation") or {}).get("region")
+            if isinstance(region, dict) and isinstance(region.get("snippet"), dict):
+                region["snippet"]["text"] = REDACTED
+        redacted["properties"] = {**(redacted.get("properties") or {}), SARIF_SECRET_HASH_PROPERTY: secret_hash}
+        return redacted
+    redacted = {**finding, SECRET_HASH_FIELD: secret_hash}
+    # Match and Line hold the source line the secret was found on.
+    for key in ("Secret", "Match", "Line"):
+        if key in redacted:
+            redacted[key] = REDACTED
+    return redacted
+
+
+def _merge_unique(base: List[Dict[str, Any]], extra: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = {gitleaks_finding_key(item) for item in base if isinstance(item, dict)}
+    merged = list(base)
+    for item in extra:
+        if not isinstance(item, dict):
+            continue
+        key = gitleaks_finding_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(item)
+    return merged
+
+
+def is_sarif(report: Any) -> bool:
+    return isinstance(report, dict) and isinstance(report.get("runs"), list)
+
+
+def gitleaks_findings(report: Any) -> List[Dict[str, Any]]:
+    """Flatten a Gitleaks report (JSON list or SARIF) into its findings."""
+    if isinstance(report, list):
+        return [item for item in report if isinstance(item, dict)]
+    if is_sarif(report):
+        findings = []
+        for run in report["runs"]:
+            findings.extend(item for item in (run.get("results") or []) if isinstance(item, dict))
+        return findings
+    return []
+
+
+def merge_gitleaks_reports(base: Any, extra: Any) -> Any:
+    """
+    Merge two Gitleaks reports of the same format, de-duplicating findings.
+    Returns None when the formats are not mergeable (e.g. CSV or mixed formats).
+    """
+    if base is None:
+        return extra
+    if extra is None:
+        return base
+    if isinstance(base, list) and isinstance(extra, list):
+        return _merge_unique(base, extra)
+    if is_sarif(base) and is_sarif(extra):
+        merged = json.loads(json.dumps(base))
+        if not merged["runs"]:
+            merged["runs"] = extra["runs"]
+            return merged
+        extra_results = gitleaks_findings(extra)
+        run = merged["runs"][0]
+        run["results"] = _merge_unique(run.get("results") or [], extra_results)
+        return merged
+    return None
+
+
+def load_json_report(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as handle:
+        content = handle.read()
+    if not content.strip():
+        return None
+    return json.loads(content)
+
+
+def normalize_secret_finding(finding: Dict[str, Any], engine: str) -> Dict[str, Any]:
+    """
+    Engine-neutral view of a TruffleHog or Gitleaks (JSON or SARIF) finding:
+    engine, detector, file, line, commit and the SHA-256 of the secret.
+    """
+    if engine == "gitleaks":
+        detector, secret_hash, path, commit = gitleaks_finding_key(finding)
+        if "ruleId" in finding or "locations" in finding:
+            location = ((finding.get("locations") or [{}])[0] or {}).get("physicalLocation") or {}
+            line = int((location.get("region") or {}).get("startLine") or 0)
+        else:
+            line = gitleaks_finding_location(finding)[1]
+    else:
+        detector, secret_hash, path, commit = trufflehog_finding_key(finding)
+        line = trufflehog_finding_location(finding)[1]
+    return {"engine": engine, "detector": detector, "file": _baseline_path(path), "line": line,
+            "commit": commit, "secret_hash": secret_hash}
+
+
+def overlap_key(normalized: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Identity of a normalized finding across engines, whose detector names differ."""
+    return normalized["secret_hash"], normalized["file"], normalized["commit"]
+
+
+def replace_gitleaks_findings(report: Any, findings: List[Dict[str, Any]]) -> Any:
+    """Report of the same format as report (JSON list or SARIF) holding findings instead."""
+    if not is_sarif(report):
+        return list(findings)
+    replaced = dict(report)
+    replaced["runs"] = [dict(run, results=[]) for run in report["runs"]]
+    if replaced["runs"]:
+        replaced["runs"][0]["results"] = list(findings)
+    return replaced
+
+
+def redact_gitleaks_report(report: Any) -> Any:
+    """Gitleaks report (JSON list or SARIF) of the same format with every secret redacted."""
+    if report is None:
+        return []
+    return replace_gitleaks_findings(report, [redact_gitleaks_finding(finding) for finding in gitleaks_findings(report)])
+
+
+def _baseline_path(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, "/") if path else ""
+
+
+def secret_fingerprint(key: FindingKey) -> str:
+    """
+    Fingerprint of a finding by (detector, raw secret hash, path); the commit is left out
+    so the same leaked secret in many commits of a file is one fingerprint.
+    """
+    detector, secret_hash, path, _commit = key
+    return hashlib.sha256("\0".join((detector, secret_hash, _baseline_path(path))).encode("utf-8")).hexdigest()
+
+
+def collapse_findings(
+    findings: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], FindingKey]
+) -> List[Tuple[Dict[str, Any], int]]:
+    """First finding of each fingerprint with the number of findings sharing it, in scan order."""
+    counts: Dict[str, int] = {}
+    first: Dict[str, Dict[str, Any]] = {}
+    for finding in findings:
+        fingerprint = secret_fingerprint(key(finding))
+        counts[fingerprint] = counts.get(fingerprint, 0) + 1
+        first.setdefault(fingerprint, finding)
+    return [(finding, counts[fingerprint]) for fingerprint, finding in first.items()]
+
+
+def load_baseline(path: str) -> Set[str]:
+    """
+    Fingerprints recorded in a baseline file. Raises ValueError when the file is not
+    a baseline; a missing file is an empty baseline.
+    """
+    if not os.path.exists(path):
+        return set()
+    data = read_json(path)
+    if not isinstance(data, dict) or not isinstance(data.get("findings"), list):
+        raise ValueError(f"{path} is not a secret baseline file")
+    return {entry["fingerprint"] for entry in data["findings"]
+            if isinstance(entry, dict) and isinstance(entry.get("fingerprint"), str)}
+
+
+def update_baseline(path: str, findings: Iterable[Dict[str, Any]],
+                    key: Callable[[Dict[str, Any]], FindingKey]) -> int:
+    """
+    Add the fingerprints of findings to the baseline at path, creating it if needed.
+    Only fingerprints, detectors and paths are stored, never the secret.
+    Returns the number of fingerprints added.
+    """
+    data = read_json(path) if os.path.exists(path) else None
+    entries = list(data["findings"]) if isinstance(data, dict) and isinstance(data.get("findings"), list) else []
+    known = {entry.get("fingerprint") for entry in entries if isinstance(entry, dict)}
+    added = 0
+    for finding in findings:
+        finding_key = key(finding)
+        fingerprint = secret_fingerprint(finding_key)
+        if fingerprint in known:
+            continue
+        known.add(fingerprint)
+        entries.append({"fingerprint": fingerprint, "detector": finding_key[0],
+                        "path": _baseline_path(finding_key[2])})
+        added += 1
+    entries.sort(key=lambda entry: (entry.get("path") or "", entry.get("detector") or "", entry.get("fingerprint") or ""))
+    write_json_atomic(path, {"version": BASELINE_VERSION, "findings": entries}, indent=2)
+    return added
@@ -0,0 +1,68 @@
+import os
+import time
+from typing import Optional, Sequence
+
+from aspm_cli.utils.cache import cache_dir, cache_key, read_json, write_json_atomic
+from aspm_cli.utils.secret_results import (
+    load_json_report,
+    load_jsonl,
+    redact_gitleaks_report,
+    redact_trufflehog_finding,
+    write_jsonl,
+)
+
+STATE_FILE = "state.json"
+
+
+class SecretWatermark:
+    """
+    Last fully scanned commit for a (engine, repo, branch, scan args), plus the
+    findings accumulated up to that commit, with their secrets redacted. Stored
+    under the user cache directory.
+    """
+
+    def __init__(self, engine: str, repo_url: Optional[str], branch: Optional[str], cwd: Optional[str] = None,
+                 scan_args: Sequence[str] = ()):
+        self.engine = engine
+        # Fall back to the checkout path so local clones without a remote still get a stable key.
+        repo_identity = repo_url or os.path.realpath(cwd or os.getcwd())
+        # Different scan args (paths, rules, detectors) find different things: separate state.
+        self.directory = cache_dir("secret", cache_key(engine, repo_identity, branch or "", *scan_args))
+        self.findings_file = str(self.directory / ("findings.json" if engine == "gitleaks" else "findings.jsonl"))
+
+    def load(self) -> Optional[dict]:
+        state = read_json(self.directory / STATE_FILE)
+        if not isinstance(state, dict) or not state.get("commit"):
+            return None
+        if not os.path.exists(self.findings_file):
+            return None
+        return state
+
+    @property
+    def commit(self) -> Optional[str]:
+        state = self.load()
+        return state["commit"] if state else None
+
+    def save(self, commit: str, findings_source: Optional[str]) -> None:
+        """
+        Record `commit` as fully scanned; `findings_source` holds all findings up to it.
+        Only redacted copies of the findings are stored, never the secrets.
+        """
+        if findings_source and os.path.exists(findings_source):
+            if self.engine == "gitleaks":
+                write_json_atomic(self.findings_file, redact_gitleaks_report(load_json_report(findings_source)), indent=2)
+            else:
+                write_jsonl(self.findings_file, [redact_trufflehog_finding(finding)
+                                                 for finding in load_jsonl(findings_source)])
+        else:
+            open(self.findings_file, "w", encoding="utf-8").close()
+        write_json_atomic(
+            self.directory / STATE_FILE,
+            {"commit": commit, "engine": self.engine, "updated_at": int(time.time())},
+        )
+
+    def reset(self) -> None:
+        for name in (STATE_FILE, os.path.basename(self.findings_file)):
+            path = self.directory / name
+            if path.exists():
+                path.unlink()
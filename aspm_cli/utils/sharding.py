@@ -0,0 +1,81 @@
+import hashlib
+import os
+import re
+import subprocess
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# (index, count): this node scans slice ``index`` (1-based) of ``count``.
+Shard = Tuple[int, int]
+
+_SHARD_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+# Upper bound on the file-target argv bytes handed to one scanner run (well below ARG_MAX).
+MAX_TARGET_ARG_BYTES = 512 * 1024
+
+
+def parse_shard(value: Optional[str]) -> Optional[Shard]:
+    """``"2/5"`` -> (2, 5); None when unset. Raises ValueError for anything else."""
+    if value is None or not str(value).strip():
+        return None
+    match = _SHARD_SPEC.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid shard {value!r}: expected i/N, e.g. 1/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {value!r}: i must be between 1 and N")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """Stable 1-based slice of key: the same on every machine and Python process."""
+    digest = hashlib.sha256(key.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(keys: Iterable[str], shard: Shard) -> List[str]:
+    index, count = shard
+    return [key for key in keys if shard_of(key, count) == index]
+
+
+def list_files(targets: Sequence[str], cwd: Optional[str] = None) -> List[str]:
+    """
+    Files under targets, relative to cwd and sorted. Inside a git work tree this is
+    the tracked and untracked, non-ignored files (``.gitignore`` applies); elsewhere
+    a walk that skips hidden directories.
+    """
+    cwd = cwd or os.getcwd()
+    targets = list(targets) or ["."]
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *targets],
+            cwd=cwd, capture_output=True, check=True,
+        ).stdout
+        files = {
+            path for path in output.decode("utf-8", "surrogateescape").split("\0")
+            if path and os.path.isfile(os.path.join(cwd, path))
+        }
+    except (subprocess.CalledProcessError, OSError):
+        files = set()
+        for target in targets:
+            absolute = os.path.join(cwd, target)
+            if os.path.isfile(absolute):
+                files.add(os.path.relpath(absolute, cwd))
+                continue
+            for dirpath, dirnames, filenames in os.walk(absolute):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                files.update(os.path.relpath(os.path.join(dirpath, name), cwd) for name in filenames)
+    return sorted(path.replace(os.sep, "/") for path in files)
+
+
+def chunk_paths(paths: Sequence[str], max_bytes: int = MAX_TARGET_ARG_BYTES) -> List[List[str]]:
+    """Split paths into runs whose command-line size stays under max_bytes."""
+    chunks, current, size = [], [], 0
+    for path in paths:
+        length = len(path.encode("utf-8")) + 1
+        if current and size + length > max_bytes:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(path)
+        size += length
+    if current:
+        chunks.append(current)
+    return chunks
@@ -3,6 +3,7 @@ import sys
 import itertools
 import asyncio
 import threading
+import time
 from aspm_cli.utils.logger import Logger
 from colorama import Fore, init
 
@@ -64,4 +65,76 @@ class Spinner:
             char = next(self._spinner)
             sys.stdout.write(f"\r{self.color}{self.message} {char}")
             sys.stdout.flush()
-            await asyncio.sleep(0.1)
\ No newline at end of file
+            await asyncio.sleep(0.1)
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+class MultiProgress:
+    """
+    One status line per task for concurrent work (e.g. parallel tool installs).
+    Redrawn in place on a terminal; in CI (or when stdout is not a TTY) only
+    status changes are logged, so build logs stay readable.
+    """
+
+    def __init__(self, tasks, color=Fore.GREEN):
+        self.tasks = list(tasks)
+        self.color = color
+        self.is_ci = (
+            os.getenv('DISABLE_SPINNER', 'FALSE').upper() == 'TRUE'
+            or os.getenv("GITHUB_ACTIONS") == "true"
+            or os.getenv("TF_BUILD") == "True"
+            or not sys.stdout.isatty()
+        )
+        self._status = {task: "waiting" for task in self.tasks}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        self._drawn = 0
+        self._frames = itertools.cycle(["|", "/", "-", "\\"])
+
+    def update(self, task, status, done=0, total=0):
+        if done:
+            status = f"{status} {_format_bytes(done)}"
+            if total:
+                status += f"/{_format_bytes(total)} ({done * 100 // total}%)"
+        with self._lock:
+            changed_stage = self._status.get(task, "").split(" ")[0] != status.split(" ")[0]
+            self._status[task] = status
+        if self.is_ci and changed_stage:
+            Logger.get_logger().info(f"{task}: {status}")
+
+    def start(self):
+        if self.is_ci:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._render_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.is_ci:
+            return
+        self._running = False
+        if self._thread:
+            self._thread.join()
+        self._render(final=True)
+
+    def _render_loop(self):
+        while self._running:
+            self._render()
+            time.sleep(0.2)
+
+    def _render(self, final=False):
+        frame = " " if final else next(self._frames)
+        with self._lock:
+            lines = [f"{self.color}{frame} {task:<12} {self._status[task]}" for task in self.tasks]
+        if self._drawn:
+            sys.stdout.write(f"\x1b[{self._drawn}A")
+        for line in lines:
+            sys.stdout.write(f"\r\x1b[2K{line}\n")
+        sys.stdout.flush()
+        self._drawn = len(lines)
@@ -0,0 +1,112 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+GITLINK_MODE = "160000"
+SYMLINK_MODE = "120000"
+
+
+def staged_entries(cwd: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    (path, blob sha) of every added/copied/modified/renamed file in the index,
+    relative to the repository root. Submodules and symlinks are skipped.
+    """
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--raw", "-z", "--no-renames", "--diff-filter=ACM"],
+        capture_output=True,
+        cwd=cwd,
+        check=True,
+    )
+    fields = result.stdout.split(b"\0")
+    entries = []
+    # -z raw format: ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0"
+    for header, path in zip(fields[0::2], fields[1::2]):
+        parts = header.decode("ascii", errors="replace").lstrip(":").split()
+        if len(parts) < 5 or parts[1] in (GITLINK_MODE, SYMLINK_MODE):
+            continue
+        entries.append((os.fsdecode(path), parts[3]))
+    return entries
+
+
+def _read_blobs(shas: List[str], cwd: Optional[str]) -> Dict[str, bytes]:
+    """Read blobs with one `git cat-file --batch` process."""
+    if not shas:
+        return {}
+    result = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        input="".join(f"{sha}\n" for sha in shas).encode("ascii"),
+        capture_output=True,
+        cwd=cwd,
+        check=True,
+    )
+    out = result.stdout
+    blobs = {}
+    offset = 0
+    for sha in shas:
+        newline = out.index(b"\n", offset)
+        header = out[offset:newline].split()
+        offset = newline + 1
+        if len(header) < 3:  # "<sha> missing"
+            continue
+        size = int(header[2])
+        blobs[sha] = out[offset:offset + size]
+        offset += size + 1  # content is followed by a newline
+    return blobs
+
+
+class StagedSnapshot:
+    """
+    The staged content of a commit, materialized from the index into a
+    temporary directory that mirrors the repository layout. Scanners read
+    exactly what will be committed, not the (possibly different) working tree.
+
+        with StagedSnapshot() as snapshot:
+            scan(snapshot.root)           # snapshot.files: repo-relative paths
+    """
+
+    def __init__(self, cwd: Optional[str] = None, paths: Optional[List[str]] = None):
+        """
+        :param cwd: Directory inside the repository (default: current directory)
+        :param paths: Only materialize these repo-relative paths (e.g. the filenames
+                      pre-commit passes to a hook); default: every staged file
+        """
+        self.cwd = cwd
+        self.paths = {path.replace(os.sep, "/") for path in paths} if paths is not None else None
+        self.root: Optional[str] = None
+        self.files: List[str] = []
+
+    def __enter__(self) -> "StagedSnapshot":
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.cleanup()
+
+    def create(self) -> "StagedSnapshot":
+        entries = staged_entries(self.cwd)
+        if self.paths is not None:
+            entries = [(path, sha) for path, sha in entries if path in self.paths]
+        blobs = _read_blobs(sorted({sha for _, sha in entries}), self.cwd)
+        self.root = tempfile.mkdtemp(prefix="accuknox-staged-")
+        for path, sha in entries:
+            content = blobs.get(sha)
+            if content is None:
+                continue
+            target = os.path.join(self.root, *path.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as handle:
+                handle.write(content)
+            self.files.append(path)
+        return self
+
+    def repo_path(self, path: str, root: Optional[str] = None) -> str:
+        """Map a path reported by a scanner (under root, default the snapshot dir) back to a repo path."""
+        relative = os.path.relpath(path, root or self.root)
+        return relative.replace(os.sep, "/")
+
+    def cleanup(self) -> None:
+        if self.root:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = None
@@ -1,5 +1,7 @@
+import multiprocessing
 import os
 import subprocess
+import sys
 from typing import List, Optional
 
 DEFAULT_SCAN_TIMEOUT_SECONDS = 3600
@@ -31,3 +33,35 @@ def run_scan_subprocess(cmd: List[str], **kwargs):
         timeout=timeout,
         **kwargs,
     )
+
+
+def default_job_count() -> int:
+    """CPU budget for worker pools: the CPUs this process may run on (cgroup/affinity aware)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def system_exit_code(code) -> int:
+    """Process exit status for a SystemExit code, as the interpreter would report it."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit("message") prints the message and exits 1.
+    print(code, file=sys.stderr)
+    return 1
+
+
+def worker_process_context():
+    """
+    Multiprocessing context for in-process scan workers (serve, scan batch):
+    forkserver preloaded with the CLI, so workers start with every import warm
+    without forking a multi-threaded parent; spawn where forkserver is missing.
+    """
+    if sys.platform == "win32" or "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["aspm_cli.cli", "aspm_cli.commands"])
+    return context
@@ -0,0 +1,212 @@
+import os
+import secrets
+import subprocess
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from aspm_cli.utils.cache import cache_dir, read_json, write_json_atomic
+from aspm_cli.utils.docker_pull import docker_pull
+from aspm_cli.utils.logger import Logger
+
+# Long-lived ZAP container started by --zap-daemon and reused by later scans.
+DAEMON_CONTAINER = "accuknox-zap-daemon"
+DEFAULT_DAEMON_PORT = 8090
+DAEMON_START_TIMEOUT_SECONDS = 180
+POLL_INTERVAL_SECONDS = 2
+
+
+class ZapApiError(RuntimeError):
+    pass
+
+
+def _default_port(parsed) -> int:
+    return parsed.port or (443 if parsed.scheme == "https" else 80)
+
+
+def site_matches(site: Dict[str, Any], url: str) -> bool:
+    """Whether a site entry of a ZAP JSON report is the host and port of url."""
+    parsed = urlparse(url)
+    return (str(site.get("@host") or "").lower() == (parsed.hostname or "").lower()
+            and str(site.get("@port") or "") == str(_default_port(parsed)))
+
+
+def in_scope(uri: str, url: str) -> bool:
+    """Whether uri is url itself or lies below it (same origin, path prefix on a segment boundary)."""
+    parsed, target = urlparse(uri), urlparse(url)
+    if (parsed.scheme.lower(), (parsed.hostname or "").lower(), _default_port(parsed)) != (
+            target.scheme.lower(), (target.hostname or "").lower(), _default_port(target)):
+        return False
+    base = target.path.rstrip("/")
+    return not base or parsed.path == base or parsed.path.startswith(base + "/")
+
+
+def report_for_target(report: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """
+    The part of a ZAP JSON report that belongs to url: its site, with only the alert
+    instances at or below url (other targets on the same host share the site entry).
+    """
+    sites = []
+    for site in report.get("site") or []:
+        if not site_matches(site, url):
+            continue
+        alerts = []
+        for alert in site.get("alerts") or []:
+            instances = [instance for instance in alert.get("instances") or [] if in_scope(instance.get("uri") or "", url)]
+            if instances:
+                alerts.append({**alert, "instances": instances, "count": str(len(instances))})
+        sites.append({**site, "alerts": alerts})
+    return {**report, "site": sites}
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{(parsed.hostname or '').lower()}:{_default_port(parsed)}"
+
+
+class ZapApi:
+    """Minimal client for the ZAP REST API (JSON and OTHER endpoints)."""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: int = 60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers["X-ZAP-API-Key"] = api_key
+        # Scans of one origin share ZAP's site tree and alerts; they run one at a time.
+        self._origin_locks: Dict[str, threading.Lock] = {}
+        self._origin_locks_lock = threading.Lock()
+
+    def _origin_lock(self, url: str) -> threading.Lock:
+        with self._origin_locks_lock:
+            return self._origin_locks.setdefault(_origin(url), threading.Lock())
+
+    def _call(self, kind: str, component: str, call_type: str, name: str, **params) -> Any:
+        url = f"{self.base_url}/{kind}/{component}/{call_type}/{name}/"
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise ZapApiError(f"ZAP API {component}/{name} failed: {e}")
+        if response.status_code != 200:
+            raise ZapApiError(f"ZAP API {component}/{name} returned HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            return response.json()
+        except ValueError:
+            raise ZapApiError(f"ZAP API {component}/{name} returned invalid JSON")
+
+    def view(self, component: str, name: str, **params) -> Any:
+        return self._call("JSON", component, "view", name, **params)
+
+    def action(self, component: str, name: str, **params) -> Any:
+        return self._call("JSON", component, "action", name, **params)
+
+    def version(self) -> str:
+        return self.view("core", "version")["version"]
+
+    def is_ready(self) -> bool:
+        try:
+            self.version()
+            return True
+        except (ZapApiError, KeyError, TypeError):
+            return False
+
+    def json_report(self) -> Dict[str, Any]:
+        """The traditional JSON report (same format as the packaged scans' -J output)."""
+        return self._call("OTHER", "core", "other", "jsonreport")
+
+    def _wait(self, component: str, scan_id: str, deadline: float) -> bool:
+        """Wait for a spider/ascan run to reach 100%; False when the deadline passed first."""
+        while time.monotonic() < deadline:
+            if int(self.view(component, "status", scanId=scan_id)["status"]) >= 100:
+                return True
+            time.sleep(POLL_INTERVAL_SECONDS)
+        return False
+
+    def scan(self, url: str, active: bool, spider_minutes: float, timeout: float) -> Dict[str, Any]:
+        """
+        Spider url (for at most spider_minutes), optionally active-scan it, wait for the
+        passive scanner and return the report restricted to url and the paths below it.
+        Alerts left there by earlier scans are deleted first. Concurrent scans of the
+        same origin wait for each other.
+        """
+        with self._origin_lock(url):
+            self.action("alert", "deleteAlerts", baseurl=url)
+            deadline = time.monotonic() + timeout
+
+            spider_id = self.action("spider", "scan", url=url, recurse="true")["scan"]
+            if not self._wait("spider", spider_id, min(deadline, time.monotonic() + spider_minutes * 60)):
+                self.action("spider", "stop", scanId=spider_id)
+            if active:
+                scan_id = self.action("ascan", "scan", url=url, recurse="true")["scan"]
+                if not self._wait("ascan", scan_id, deadline):
+                    self.action("ascan", "stop", scanId=scan_id)
+                    raise ZapApiError(f"Active scan of {url} did not finish in {int(timeout)}s")
+            while int(self.view("pscan", "recordsToScan")["recordsToScan"]) > 0:
+                if time.monotonic() >= deadline:
+                    raise ZapApiError(f"Passive scan of {url} did not finish in {int(timeout)}s")
+                time.sleep(POLL_INTERVAL_SECONDS)
+
+            return report_for_target(self.json_report(), url)
+
+
+def _docker(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["docker", *args], capture_output=True, text=True)
+
+
+def connect_zap_daemon(image: str) -> ZapApi:
+    """
+    Client for a running ZAP daemon: ZAP_API_URL (with ZAP_API_KEY) when set, else the
+    accuknox-zap-daemon container, started (or restarted) on 127.0.0.1:ZAP_DAEMON_PORT if needed.
+    The container's API key is kept in the cache so later runs can attach to it.
+    """
+    api_url = os.getenv("ZAP_API_URL", "").strip()
+    if api_url:
+        api = ZapApi(api_url, os.getenv("ZAP_API_KEY"))
+        try:
+            version = api.version()
+        except (ZapApiError, KeyError, TypeError) as e:
+            raise ZapApiError(f"Cannot use the ZAP API at {api_url}: {e}")
+        Logger.get_logger().debug(f"Attached to ZAP {version} at {api_url}")
+        return api
+
+    state_file = cache_dir("dast") / "zap-daemon.json"
+    state = read_json(state_file, {}) or {}
+    running = _docker("inspect", "-f", "{{.State.Running}}", DAEMON_CONTAINER)
+    if running.returncode == 0 and state.get("url") and state.get("api_key"):
+        api = ZapApi(state["url"], state["api_key"])
+        if running.stdout.strip() != "true":
+            Logger.get_logger().info(f"Restarting ZAP daemon container {DAEMON_CONTAINER}...")
+            _docker("start", DAEMON_CONTAINER)
+        elif api.is_ready():
+            Logger.get_logger().debug(f"Reusing ZAP daemon {DAEMON_CONTAINER} at {state['url']}")
+            return api
+    else:
+        if running.returncode == 0:
+            # A container without a known API key cannot be driven; replace it.
+            _docker("rm", "-f", DAEMON_CONTAINER)
+        docker_pull(image)
+        port = int(os.getenv("ZAP_DAEMON_PORT", DEFAULT_DAEMON_PORT))
+        api_key = secrets.token_hex(16)
+        Logger.get_logger().info(f"Starting ZAP daemon container {DAEMON_CONTAINER} on port {port}...")
+        result = _docker(
+            "run", "-d", "--name", DAEMON_CONTAINER, "-p", f"127.0.0.1:{port}:8080", image,
+            "zap.sh", "-daemon", "-host", "0.0.0.0", "-port", "8080",
+            "-config", f"api.key={api_key}",
+            "-config", "api.addrs.addr.name=.*", "-config", "api.addrs.addr.regex=true",
+        )
+        if result.returncode != 0:
+            raise ZapApiError(f"Could not start the ZAP daemon container: {result.stderr.strip()}")
+        state = {"url": f"http://127.0.0.1:{port}", "api_key": api_key}
+        write_json_atomic(state_file, state)
+        api = ZapApi(state["url"], api_key)
+
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT_SECONDS
+    while not api.is_ready():
+        if time.monotonic() >= deadline:
+            raise ZapApiError(f"ZAP daemon did not become ready in {DAEMON_START_TIMEOUT_SECONDS}s")
+        time.sleep(POLL_INTERVAL_SECONDS)
+    Logger.get_logger().debug(f"ZAP daemon {api.version()} ready at {state['url']}")
+    return api
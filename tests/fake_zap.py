@@ -0,0 +1,141 @@
+"""
+A local fake of the ZAP REST API, for testing ZapApi and `dast --zap-daemon`
+without a ZAP daemon.
+
+Spider and active scans finish after a few status polls. Each spider scan
+raises a low-risk alert on the scanned URL, each active scan a high-risk one;
+the passive scanner reports one pending record before it drains. Calls are
+recorded in FakeZap.calls.
+
+Run standalone (e.g. with ZAP_API_URL=http://127.0.0.1:8090):
+
+    python tests/fake_zap.py 8090 [api-key]
+"""
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VERSION = "2.16.1"
+# Status polls before a spider/ascan run reports 100%.
+POLLS_TO_FINISH = 2
+
+
+class FakeZap:
+    def __init__(self, port=0, api_key=None):
+        self.api_key = api_key
+        self.calls = []
+        self.alerts = []
+        self.scans = {}
+        self.records_to_scan = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def calls_to(self, name):
+        return [params for call, params in self.calls if call == name]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                if fake.api_key and self.headers.get("X-ZAP-API-Key") != fake.api_key:
+                    self._send(403, {"code": "bad_api_key", "message": "Provided API key is invalid"})
+                    return
+                parts = parsed.path.strip("/").split("/")
+                if len(parts) != 4:
+                    self._send(404, {"code": "bad_view"})
+                    return
+                with fake.lock:
+                    fake.calls.append((f"{parts[1]}/{parts[3]}", params))
+                    status, body = fake._dispatch(parts[1], parts[3], params)
+                self._send(status, body)
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _dispatch(self, component, name, params):
+        if (component, name) == ("core", "version"):
+            return 200, {"version": VERSION}
+        if component in ("spider", "ascan") and name == "scan":
+            scan_id = str(len(self.scans))
+            self.scans[scan_id] = {"component": component, "url": params["url"], "polls": 0}
+            return 200, {"scan": scan_id}
+        if component in ("spider", "ascan") and name == "status":
+            scan = self.scans[params["scanId"]]
+            scan["polls"] += 1
+            if scan["polls"] < POLLS_TO_FINISH:
+                return 200, {"status": "50"}
+            if "done" not in scan:
+                scan["done"] = True
+                self._raise_alert(scan)
+            return 200, {"status": "100"}
+        if component in ("spider", "ascan") and name == "stop":
+            return 200, {"Result": "OK"}
+        if (component, name) == ("alert", "deleteAlerts"):
+            base = params.get("baseurl", "")
+            self.alerts = [alert for alert in self.alerts if not alert["uri"].startswith(base)]
+            return 200, {"Result": "OK"}
+        if (component, name) == ("pscan", "recordsToScan"):
+            pending, self.records_to_scan = self.records_to_scan, 0
+            return 200, {"recordsToScan": str(pending)}
+        if (component, name) == ("core", "jsonreport"):
+            return 200, self._report()
+        return 404, {"code": "bad_view"}
+
+    def _raise_alert(self, scan):
+        active = scan["component"] == "ascan"
+        self.alerts.append({
+            "uri": scan["url"],
+            "name": "Active finding" if active else "Passive finding",
+            "riskcode": "3" if active else "1",
+        })
+        self.records_to_scan = 1
+
+    def _report(self):
+        sites = {}
+        for alert in self.alerts:
+            parsed = urlparse(alert["uri"])
+            port = parsed.port or (443 if parsed.scheme == "https" else 80)
+            site = sites.setdefault((parsed.scheme, parsed.hostname, port), {
+                "@name": f"{parsed.scheme}://{parsed.netloc}",
+                "@host": parsed.hostname,
+                "@port": str(port),
+                "@ssl": str(parsed.scheme == "https").lower(),
+                "alerts": [],
+            })
+            site["alerts"].append({
+                "name": alert["name"],
+                "riskcode": alert["riskcode"],
+                "instances": [{"uri": alert["uri"], "method": "GET"}],
+                "count": "1",
+            })
+        return {"@version": VERSION, "site": list(sites.values())}
+
+
+if __name__ == "__main__":
+    fake = FakeZap(int(sys.argv[1]), sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Fake ZAP API listening on {fake.url}")
+    fake.server.serve_forever()
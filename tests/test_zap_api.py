@@ -0,0 +1,61 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_zap import FakeZap  # noqa: E402
+
+from aspm_cli.utils import zap_api  # noqa: E402
+from aspm_cli.utils.zap_api import ZapApi, ZapApiError  # noqa: E402
+
+
+@pytest.fixture
+def fake_zap(monkeypatch):
+    monkeypatch.setattr(zap_api, "POLL_INTERVAL_SECONDS", 0.01)
+    fake = FakeZap(api_key="secret").start()
+    yield fake
+    fake.stop()
+
+
+def _alerts(report):
+    return [(alert["name"], instance["uri"])
+            for site in report["site"] for alert in site["alerts"] for instance in alert["instances"]]
+
+
+def test_full_scan_runs_spider_ascan_and_pscan(fake_zap):
+    api = ZapApi(fake_zap.url, "secret")
+    report = api.scan("https://app.example.com/", active=True, spider_minutes=1, timeout=30)
+
+    calls = [call for call, _ in fake_zap.calls]
+    assert calls[0] == "alert/deleteAlerts"
+    assert calls.index("spider/scan") < calls.index("ascan/scan") < calls.index("pscan/recordsToScan")
+    assert calls[-1] == "core/jsonreport"
+    assert sorted(_alerts(report)) == [
+        ("Active finding", "https://app.example.com/"),
+        ("Passive finding", "https://app.example.com/"),
+    ]
+
+
+def test_baseline_scan_skips_active_scan(fake_zap):
+    report = ZapApi(fake_zap.url, "secret").scan("https://app.example.com/", active=False, spider_minutes=1, timeout=30)
+
+    assert not fake_zap.calls_to("ascan/scan")
+    assert _alerts(report) == [("Passive finding", "https://app.example.com/")]
+
+
+def test_report_is_restricted_to_target_path(fake_zap):
+    api = ZapApi(fake_zap.url, "secret")
+    targets = ["https://app.example.com/shop", "https://app.example.com/admin", "https://other.example.com/"]
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        reports = list(pool.map(lambda url: api.scan(url, active=False, spider_minutes=1, timeout=30), targets))
+
+    for url, report in zip(targets, reports):
+        assert _alerts(report) == [("Passive finding", url)]
+
+
+def test_wrong_api_key_is_reported(fake_zap):
+    with pytest.raises(ZapApiError, match="HTTP 403"):
+        ZapApi(fake_zap.url, "wrong").version()
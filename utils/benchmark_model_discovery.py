@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark ML model discovery (aspm_cli.utils.model_discovery) on a synthetic tree.
+
+The tree has TOP x SUB directories of FILES files each. By default each directory
+looks like a project directory: mostly source and data files, a few .bin/.dat
+files, dotfiles, well-known extensionless files (Makefile, LICENSE, ...) and a few
+other extensionless files. --generic-share P instead makes P of the files .bin or
+extensionless with random names, the worst case for header sniffing.
+
+Usage (from the repository root):
+
+    python utils/benchmark_model_discovery.py [--root DIR] [--top 50] [--sub 100] [--files 200]
+                                              [--generic-share 0.4] [--repeat 3] [--jobs N]
+
+The tree is created under --root (a temporary directory by default) and reused
+when it already holds a tree of the same shape.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aspm_cli.utils import model_discovery  # noqa: E402
+
+OLD_MODEL_EXTENSIONS = frozenset({".pb", ".h5", ".keras", ".pth", ".pt", ".ckpt", ".npy", ".pkl"})
+OLD_SKIP_DIR_NAMES = frozenset({".git", ".accuknox-modelscan", "node_modules", "__pycache__"})
+
+SOURCE_EXTENSIONS = (".py", ".js", ".ts", ".json", ".md", ".txt", ".yaml", ".go", ".java", ".csv", ".png", ".html")
+DOTFILES = (".env", ".editorconfig", ".npmrc")
+KNOWN_NAMES = ("Makefile", "LICENSE", "README", "Dockerfile")
+OTHER_EXTENSIONLESS = ("configure", "run_tests", "data")
+GENERIC_FILES = ("weights-{}.bin", "blob-{}.dat")
+# A few real models, so discovery has something to find.
+PICKLE_HEADER = b"\x80\x04\x95\x00\x00\x00\x00\x00\x00\x00\x00}\x94."
+
+
+def _directory_files(count, generic_share):
+    """File names for one directory."""
+    if generic_share is not None:
+        generic = int(count * generic_share)
+        names = [f"blob-{i}.bin" if i % 2 else f"blob{i}" for i in range(generic)]
+        names.extend(f"file-{i}{SOURCE_EXTENSIONS[i % len(SOURCE_EXTENSIONS)]}" for i in range(count - generic))
+        return names
+    names = [*DOTFILES, *KNOWN_NAMES, *OTHER_EXTENSIONLESS]
+    names.extend(pattern.format(i) for i in range(5) for pattern in GENERIC_FILES)
+    names.extend(f"file-{i}{SOURCE_EXTENSIONS[i % len(SOURCE_EXTENSIONS)]}" for i in range(count - len(names)))
+    return names[:count]
+
+
+def build_tree(root, top, sub, files, generic_share):
+    shape = {"top": top, "sub": sub, "files": files, "generic_share": generic_share}
+    marker = os.path.join(root, ".benchmark-shape.json")
+    try:
+        with open(marker, "r", encoding="utf-8") as handle:
+            if json.load(handle) == shape:
+                return
+    except (OSError, ValueError):
+        pass
+    shutil.rmtree(root, ignore_errors=True)
+    names = _directory_files(files, generic_share)
+    started = time.monotonic()
+    for t in range(top):
+        for s in range(sub):
+            directory = os.path.join(root, f"pkg{t}", f"mod{s}")
+            os.makedirs(directory)
+            for name in names:
+                with open(os.path.join(directory, name), "wb") as handle:
+                    handle.write(b"# not a model, just some text\n")
+            if s == 0:
+                with open(os.path.join(directory, "model.bin"), "wb") as handle:
+                    handle.write(PICKLE_HEADER)
+    with open(marker, "w", encoding="utf-8") as handle:
+        json.dump(shape, handle)
+    print(f"Created {top * sub * files:,} files in {time.monotonic() - started:.1f}s under {root}")
+
+
+def old_discover(path):
+    """Discovery before header sniffing: os.walk plus an extension check."""
+    discovered = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if d not in OLD_SKIP_DIR_NAMES and not d.startswith(".")]
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() in OLD_MODEL_EXTENSIONS:
+                discovered.append(os.path.join(dirpath, filename))
+    return sorted(discovered)
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", help="Directory for the synthetic tree (default: a temporary directory)")
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--sub", type=int, default=100)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--generic-share", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    root = args.root or os.path.join(tempfile.gettempdir(), "accuknox-model-discovery-bench")
+    build_tree(root, args.top, args.sub, args.files, args.generic_share)
+
+    sniff = model_discovery.sniff_model_format
+    reads = []
+
+    def counting_sniff(path):
+        reads.append(path)
+        return sniff(path)
+
+    def current():
+        reads.clear()
+        return model_discovery.discover_model_files(root, cwd=root, jobs=args.jobs)
+
+    old_time, old_found = best_of(args.repeat, lambda: old_discover(root))
+    model_discovery.sniff_model_format = lambda path: None
+    try:
+        walk_time, _ = best_of(args.repeat, current)
+    finally:
+        model_discovery.sniff_model_format = counting_sniff
+    try:
+        current_time, found = best_of(args.repeat, current)
+    finally:
+        model_discovery.sniff_model_format = sniff
+
+    print(f"Best of {args.repeat}, {os.cpu_count()} CPU(s):")
+    print(f"  os.walk + extension check (before)   {old_time:6.2f}s  {len(old_found):>7,} model(s)")
+    print(f"  scandir walk, no header reads        {walk_time:6.2f}s")
+    print(f"  scandir walk + header sniffing       {current_time:6.2f}s  {len(found):>7,} model(s), "
+          f"{len(reads):,} header read(s)")
+
+
+if __name__ == "__main__":
+    main()